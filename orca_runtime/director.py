@@ -1,15 +1,215 @@
 import os
+import io
 import json
 import uuid
 import hashlib
 import shutil
+import threading
+import time
+import queue
+import logging
+from abc import ABC, abstractmethod
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from datetime import datetime
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple
 from PIL import Image
 import pytesseract
 
+# tesserocr keeps the tesseract API and language data loaded in-process; pytesseract forks per call
+try:
+    import tesserocr
+    TESSEROCR_AVAILABLE = True
+except ImportError:
+    TESSEROCR_AVAILABLE = False
+from orca_runtime.event_log import EventLog
+from orca_runtime.event_index import EventIndex
+from orca_runtime.director_store import DirectorStore, QUEST_STATUSES
+
+logger = logging.getLogger(__name__)
+
+IMAGE_EXTS = ('.jpg', '.jpeg', '.png', '.bmp')
+
+def _link_or_copy(src: str, dest: str):
+    # Hardlinks share the bytes between bundles; copy where the filesystem can't link
+    os.makedirs(os.path.dirname(dest), exist_ok=True)
+    try:
+        os.link(src, dest)
+    except OSError:
+        shutil.copy2(src, dest)
+
+UPLOAD_CHUNK_BYTES = 1024 * 1024
+
+class InboxBusy(Exception):
+    """Raised by ingest_to_inbox when the derivation queue stays full past the wait budget."""
+
+class InboxTooLarge(Exception):
+    """Raised when an upload exceeds max_upload_bytes; nothing is kept."""
+
+OCR_TILE_PX = 2400       # Images taller than this are OCR'd as horizontal strips
+OCR_TILE_WORKERS = 2     # Concurrent strips per image (and API handles for tesserocr)
+OCR_TILE_OVERLAP_PX = 64 # Taller than a text line at scan resolutions, so every line is whole in some strip
+
+def _strips(img: "Image.Image", tile_px: int = OCR_TILE_PX, overlap_px: int = OCR_TILE_OVERLAP_PX) -> List[Tuple[int, "Image.Image"]]:
+    """Full-width (top, band) strips; neighbouring bands share overlap_px rows."""
+    if img.height <= tile_px:
+        return [(0, img)]
+    step = tile_px - overlap_px
+    return [(top, img.crop((0, top, img.width, min(img.height, top + tile_px))))
+            for top in range(0, img.height - overlap_px, step)]
+
+class OcrEngine(ABC):
+    """Recognizes text in a PIL image; large images are split into overlapping strips OCR'd in parallel."""
+    name = "none"
+
+    def __init__(self, tile_px: int = OCR_TILE_PX, tile_workers: int = OCR_TILE_WORKERS, overlap_px: int = OCR_TILE_OVERLAP_PX):
+        self.tile_px = tile_px
+        self.overlap_px = min(overlap_px, tile_px // 2)
+        self.tile_workers = max(1, tile_workers)
+        self.tile_pool = ThreadPoolExecutor(max_workers=self.tile_workers) if self.tile_workers > 1 else None
+
+    @abstractmethod
+    def _recognize(self, img: "Image.Image") -> str:
+        """Full text of an image that fits in one strip."""
+
+    @abstractmethod
+    def _recognize_lines(self, img: "Image.Image") -> List[Tuple[float, str]]:
+        """(vertical centre, text) per text line of a strip, in reading order."""
+
+    def _merge_strips(self, tiles: List[Tuple[int, "Image.Image"]], lines: List[List[Tuple[float, str]]]) -> str:
+        # A line belongs to the strip whose share of the image (split at the middle of each overlap)
+        # holds its centre. That strip saw the line whole; copies in the neighbour, complete or cut
+        # at the band edge, are dropped.
+        bounds = [(tiles[i + 1][0] + top + band.height) / 2 for i, (top, band) in enumerate(tiles[:-1])]
+        merged = []
+        for i, ((top, _), strip_lines) in enumerate(zip(tiles, lines)):
+            lo = bounds[i - 1] if i > 0 else float("-inf")
+            hi = bounds[i] if i < len(bounds) else float("inf")
+            merged.extend(text for centre, text in strip_lines if lo <= top + centre < hi)
+        return "\n".join(merged)
+
+    def recognize(self, img: "Image.Image") -> Dict:
+        started = time.perf_counter()
+        tiles = _strips(img, self.tile_px, self.overlap_px)
+        if len(tiles) == 1:
+            text = self._recognize(img)
+        else:
+            bands = [band for _, band in tiles]
+            lines = list(self.tile_pool.map(self._recognize_lines, bands)) if self.tile_pool else [self._recognize_lines(b) for b in bands]
+            text = self._merge_strips(tiles, lines)
+        return {
+            "text": text.rstrip("\n") + "\n",
+            "engine": self.name,
+            "tiles": len(tiles),
+            "ocr_ms": round((time.perf_counter() - started) * 1000, 1),
+        }
+
+class PytesseractEngine(OcrEngine):
+    name = "pytesseract"
+
+    def _recognize(self, img: "Image.Image") -> str:
+        return pytesseract.image_to_string(img)
+
+    def _recognize_lines(self, img: "Image.Image") -> List[Tuple[float, str]]:
+        data = pytesseract.image_to_data(img, output_type=pytesseract.Output.DICT)
+        lines: Dict[Tuple[int, int, int], List[Tuple[int, int, str]]] = {}
+        for i, word in enumerate(data["text"]):
+            if word.strip():
+                key = (data["block_num"][i], data["par_num"][i], data["line_num"][i])
+                lines.setdefault(key, []).append((data["top"][i], data["top"][i] + data["height"][i], word))
+        return [((min(w[0] for w in words) + max(w[1] for w in words)) / 2, " ".join(w[2] for w in words))
+                for words in lines.values()]
+
+class TesserocrEngine(OcrEngine):
+    """Holds one PyTessBaseAPI per tile worker for the life of the process."""
+    name = "tesserocr"
+
+    def __init__(self, lang: str = "eng", **kwargs):
+        super().__init__(**kwargs)
+        self.apis: "queue.Queue" = queue.Queue()
+        for _ in range(self.tile_workers):
+            self.apis.put(tesserocr.PyTessBaseAPI(lang=lang))
+
+    def _recognize(self, img: "Image.Image") -> str:
+        api = self.apis.get()
+        try:
+            api.SetImage(img)
+            return api.GetUTF8Text()
+        finally:
+            self.apis.put(api)
+
+    def _recognize_lines(self, img: "Image.Image") -> List[Tuple[float, str]]:
+        level = tesserocr.RIL.TEXTLINE
+        api = self.apis.get()
+        try:
+            api.SetImage(img)
+            api.Recognize()
+            lines = []
+            for line in tesserocr.iterate_level(api.GetIterator(), level):
+                text, box = line.GetUTF8Text(level), line.BoundingBox(level)
+                if text and text.strip() and box:
+                    lines.append(((box[1] + box[3]) / 2, text.strip()))
+            return lines
+        finally:
+            self.apis.put(api)
+
+def make_ocr_engine(lang: str = "eng") -> OcrEngine:
+    if TESSEROCR_AVAILABLE:
+        try:
+            return TesserocrEngine(lang=lang)
+        except Exception as e:
+            logger.warning(f"tesserocr unavailable, falling back to pytesseract: {e}")
+    return PytesseractEngine()
+
+# One engine per derivation worker process, created by the pool initializer
+_ocr_engine: Optional[OcrEngine] = None
+
+def _init_derive_worker():
+    global _ocr_engine
+    _ocr_engine = make_ocr_engine()
+
+def _derive_inbox_item(dest_file: str, derived_path: str) -> Dict:
+    # Runs in a worker process: preview + OCR for one original, decoded once from memory
+    global _ocr_engine
+    if _ocr_engine is None:
+        _ocr_engine = make_ocr_engine()
+    artifacts = {}
+    errors = []
+    timings = {}
+    with open(dest_file, "rb") as f:
+        data = f.read()
+
+    ocr_text = "(ocr unavailable)"
+    try:
+        with Image.open(io.BytesIO(data)) as img:
+            img.load()
+            started = time.perf_counter()
+            try:
+                preview = img.copy()
+                preview.thumbnail((800, 800))
+                if preview.mode not in ("RGB", "L"):
+                    preview = preview.convert("RGB")
+                preview.save(os.path.join(derived_path, "preview.jpg"), "JPEG")
+                artifacts["preview"] = "derived/preview.jpg"
+                timings["preview_ms"] = round((time.perf_counter() - started) * 1000, 1)
+            except Exception as e:
+                errors.append(f"preview: {e}")
+            try:
+                ocr = _ocr_engine.recognize(img)
+                ocr_text = ocr["text"]
+                timings.update({"ocr_ms": ocr["ocr_ms"], "ocr_engine": ocr["engine"], "ocr_tiles": ocr["tiles"]})
+            except Exception as e:
+                errors.append(f"ocr: {e}")
+    except Exception as e:
+        errors.append(f"decode: {e}")
+    with open(os.path.join(derived_path, "ocr.txt"), "w", encoding="utf-8") as f:
+        f.write(ocr_text)
+    artifacts["ocr"] = "derived/ocr.txt"
+    return {"artifacts": artifacts, "errors": errors, "timings": timings}
+
 class Director:
-    def __init__(self, workspace_root: str):
+    def __init__(self, workspace_root: str, event_durability: str = "flush",
+                 derive_workers: int = 2, derive_queue_max: int = 32, derive_wait_s: float = 5.0,
+                 max_upload_bytes: int = 256 * 1024 * 1024):
         self.workspace_root = workspace_root
         self.state_root = os.path.join(workspace_root, "runtime", "director_state")
         self.events_file = os.path.join(self.state_root, "events.jsonl")
@@ -20,40 +220,131 @@ class Director:
         self.inbox_dir = os.path.join(self.state_root, "inbox")
         self.artifacts_dir = os.path.join(self.state_root, "artifacts")
         self.capabilities_path = os.path.join(workspace_root, "orca", "capabilities", "catalog.json")
+        self.counters_file = os.path.join(self.state_root, "counters.json")
+        self.incoming_dir = os.path.join(self.state_root, "inbox_incoming")
+        self.max_upload_bytes = max_upload_bytes
         
         os.makedirs(self.runs_dir, exist_ok=True)
         os.makedirs(self.inbox_dir, exist_ok=True)
         os.makedirs(self.artifacts_dir, exist_ok=True)
+        # Partial uploads from a previous run are never resumed
+        shutil.rmtree(self.incoming_dir, ignore_errors=True)
+        os.makedirs(self.incoming_dir, exist_ok=True)
         
         self._ensure_files()
+        self.store = DirectorStore(os.path.join(self.state_root, "director.sqlite"))
+        self._migrate_json()
+        self.counters_lock = threading.Lock()
+        self.counters = self._reconcile_counters()
+        self.event_log = EventLog(self.events_file, durability=event_durability)
+        self.event_index = EventIndex(os.path.join(self.state_root, "events_index.sqlite"))
+        try:
+            self.event_index.catch_up(self.event_log)
+        except Exception as e:
+            print(f"Event index catch-up failed: {e}")
+        # The index follows the log batch by batch on the writer thread
+        self.event_log.add_listener(self.event_index.add_many)
         self.on_event_callback = None
 
+        # Preview/OCR derivation: a bounded queue in front of a lazily started process pool
+        self.derive_workers = max(1, derive_workers)
+        self.derive_wait_s = derive_wait_s
+        self.derive_slots = threading.BoundedSemaphore(max(1, derive_queue_max))
+        self.derive_pool: Optional[ProcessPoolExecutor] = None
+        self.derive_lock = threading.Lock()
+        self.derive_pending = 0
+        self.meta_lock = threading.Lock()
+        self.derive_aliases: Dict[str, List[str]] = {} # canonical inbox_id -> duplicates waiting on its derivation
+        self._backfill_inbox_hashes()
+        self._resume_derivations()
+
     def _ensure_files(self):
         if not os.path.exists(self.events_file):
-            with open(self.events_file, "w") as f:
+            with open(self.events_file, "w"):
                 pass
-        if not os.path.exists(self.quests_file):
-            with open(self.quests_file, "w") as f:
-                json.dump({"quests": [], "active": [], "next": [], "later": []}, f)
-        
-        if not os.path.exists(self.milestones_file):
-            initial_milestones = {
-                "milestones": [
-                    {"id": "q1", "title": "Q1: Director Foundation", "status": "done", "order": 1, "updated_ts": datetime.now().isoformat()},
-                    {"id": "q2", "title": "Q2: Director Inbox", "status": "done", "order": 2, "updated_ts": datetime.now().isoformat()},
-                    {"id": "q3", "title": "Q3: Quest Engine", "status": "done", "order": 3, "updated_ts": datetime.now().isoformat()},
-                    {"id": "q4", "title": "Q4: Doc Discipline", "status": "done", "order": 4, "updated_ts": datetime.now().isoformat()},
-                    {"id": "m11", "title": "M11: Director Flight Recorder", "status": "done", "order": 5, "updated_ts": datetime.now().isoformat()},
-                    {"id": "m12", "title": "M12: Capability Trails", "status": "done", "order": 6, "updated_ts": datetime.now().isoformat()},
-                    {"id": "m13", "title": "M13: Progress Dashboard", "status": "in_progress", "order": 7, "updated_ts": datetime.now().isoformat()}
-                ]
-            }
-            with open(self.milestones_file, "w") as f:
-                json.dump(initial_milestones, f, indent=2)
-                
-        if not os.path.exists(self.issues_file):
-            with open(self.issues_file, "w") as f:
-                json.dump({"issues": []}, f, indent=2)
+
+    def _initial_milestones(self) -> Dict:
+        return {
+            "milestones": [
+                {"id": "q1", "title": "Q1: Director Foundation", "status": "done", "order": 1, "updated_ts": datetime.now().isoformat()},
+                {"id": "q2", "title": "Q2: Director Inbox", "status": "done", "order": 2, "updated_ts": datetime.now().isoformat()},
+                {"id": "q3", "title": "Q3: Quest Engine", "status": "done", "order": 3, "updated_ts": datetime.now().isoformat()},
+                {"id": "q4", "title": "Q4: Doc Discipline", "status": "done", "order": 4, "updated_ts": datetime.now().isoformat()},
+                {"id": "m11", "title": "M11: Director Flight Recorder", "status": "done", "order": 5, "updated_ts": datetime.now().isoformat()},
+                {"id": "m12", "title": "M12: Capability Trails", "status": "done", "order": 6, "updated_ts": datetime.now().isoformat()},
+                {"id": "m13", "title": "M13: Progress Dashboard", "status": "in_progress", "order": 7, "updated_ts": datetime.now().isoformat()}
+            ]
+        }
+
+    def _migrate_json(self):
+        """One-shot import of the legacy quests/issues/milestones JSON files into the store."""
+        if self.store.is_migrated():
+            return
+        legacy = {}
+        for name, path in (("quests", self.quests_file), ("issues", self.issues_file), ("milestones", self.milestones_file)):
+            if os.path.exists(path):
+                with open(path, "r") as f:
+                    legacy[name] = json.load(f)
+        if "milestones" not in legacy:
+            legacy["milestones"] = self._initial_milestones()
+        self.store.migrate(legacy.get("quests"), legacy.get("issues"), legacy.get("milestones"),
+                           source=",".join(sorted(legacy)))
+        # Renamed rather than deleted so a rollback can still read them
+        for path in (self.quests_file, self.issues_file, self.milestones_file):
+            if os.path.exists(path):
+                os.replace(path, path + ".migrated")
+        print(f"Director store migrated from JSON: {sorted(legacy)}")
+
+    # --- Maintained counters ---
+
+    def _scan_counters(self) -> Dict:
+        counters = {
+            "inbox": len([n for n in os.listdir(self.inbox_dir) if os.path.isdir(os.path.join(self.inbox_dir, n))]),
+            "runs": len([n for n in os.listdir(self.runs_dir) if os.path.isfile(os.path.join(self.runs_dir, n))]),
+        }
+        counters.update(self._quest_counters())
+        return counters
+
+    def _quest_counters(self) -> Dict:
+        counts = self.store.quest_counts()
+        return {
+            "quests": counts["total"],
+            "quests_active": counts["active"],
+            "quests_next": counts["next"],
+            "quests_later": counts["later"],
+        }
+
+    def _reconcile_counters(self) -> Dict:
+        """Startup is the only time directories are scanned; afterwards mutations keep the counts."""
+        counters = self._scan_counters()
+        try:
+            with open(self.counters_file, "r") as f:
+                persisted = json.load(f)
+            drift = {k: (persisted.get(k), v) for k, v in counters.items() if persisted.get(k) != v}
+            if drift:
+                print(f"Director counters reconciled: {drift}")
+        except (OSError, ValueError):
+            pass
+        self._save_counters(counters)
+        return counters
+
+    def _save_counters(self, counters: Dict):
+        tmp = self.counters_file + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump(counters, f)
+        os.replace(tmp, self.counters_file)
+
+    def _update_counters(self, **changes):
+        # Values are deltas
+        with self.counters_lock:
+            for k, delta in changes.items():
+                self.counters[k] = self.counters.get(k, 0) + delta
+            self._save_counters(self.counters)
+
+    def _set_counters(self, values: Dict):
+        with self.counters_lock:
+            self.counters.update(values)
+            self._save_counters(self.counters)
 
     def set_on_event(self, callback):
         self.on_event_callback = callback
@@ -67,8 +358,8 @@ class Director:
             "payload": payload or {},
             "severity": severity
         }
-        with open(self.events_file, "a") as f:
-            f.write(json.dumps(event) + "\n")
+        # Queued for the group-commit writer; event["seq"] is assigned here
+        self.event_log.append(event)
         
         if self.on_event_callback:
             try:
@@ -77,74 +368,70 @@ class Director:
         return event
 
     def get_state(self) -> Dict:
-        # Calculate counts
-        inbox_count = len([n for n in os.listdir(self.inbox_dir) if os.path.isdir(os.path.join(self.inbox_dir, n))])
-        runs_count = len([n for n in os.listdir(self.runs_dir) if os.path.isfile(os.path.join(self.runs_dir, n))])
-        
-        try:
-            with open(self.quests_file, "r") as f:
-                quests_data = json.load(f)
-                quests_count = len(quests_data.get("quests", []))
-        except:
-            quests_count = 0
+        # Counts are maintained by the mutating calls; no directory scans here
+        with self.counters_lock:
+            counters = dict(self.counters)
         
         # Get last event ts
-        last_ts = None
-        try:
-            with open(self.events_file, "rb") as f:
-                f.seek(0, os.SEEK_END)
-                if f.tell() > 0:
-                    f.seek(-2, os.SEEK_END) # skip last newline
-                    while f.read(1) != b'\n':
-                        if f.tell() == 1:
-                            f.seek(0)
-                            break
-                        f.seek(-2, os.SEEK_CUR)
-                    last_line = f.readline().decode()
-                    last_ts = json.loads(last_line).get("timestamp")
-        except: pass
+        last_event = self.event_log.last_event
+        last_ts = last_event.get("timestamp") if last_event else None
 
         return {
             "status": "ready",
             "active_quest_id": None,
             "counts": {
-                "inbox": inbox_count,
-                "quests": quests_count,
-                "runs": runs_count
+                "inbox": counters["inbox"],
+                "quests": counters["quests"],
+                "runs": counters["runs"]
             },
             "last_event_ts": last_ts
         }
 
-    def list_events(self, limit: int = 50) -> List[Dict]:
-        events = []
+    def list_events(self, limit: int = 50, before_id: Optional[int] = None, after_id: Optional[int] = None) -> List[Dict]:
+        # Cursors are event seq numbers; pages come back oldest first like the tail
         try:
-            with open(self.events_file, "r") as f:
-                lines = f.readlines()
-                for line in lines[-limit:]:
-                    events.append(json.loads(line))
-        except: pass
-        return events
+            return self.event_log.read(limit, before=before_id, after=after_id)
+        except Exception as e:
+            print(f"Event read failed: {e}")
+            return []
+
+    def query_events(self, type_prefix: str = None, source: str = None, severity: str = None,
+                     since: str = None, until: str = None, payload: Dict = None, limit: int = 50,
+                     before_seq: int = None, after_seq: int = None, count_only: bool = False, group_by: str = None) -> Dict:
+        self.event_log.wait_delivered() # results include the caller's own events once indexed
+        if count_only:
+            return self.event_index.count(type_prefix, source, severity, since, until, payload, group_by)
+        return self.event_index.query(type_prefix, source, severity, since, until, payload, limit, before_seq, after_seq)
+
+    def close(self):
+        # Drain: queued derivations finish and record their events before the log closes
+        with self.derive_lock:
+            pool, self.derive_pool = self.derive_pool, None
+        if pool is not None:
+            pool.shutdown(wait=True)
+        self.event_log.close()
+        self.store.close()
 
     # --- Progress Dashboard (M13) ---
 
     def get_progress_snapshot(self) -> Dict:
-        with open(self.milestones_file, "r") as f:
-            milestones = json.load(f)
-        with open(self.issues_file, "r") as f:
-            issues = json.load(f)
+        milestones = self.store.export_milestones()
+        issues = self.store.export_issues()
         
-        quests = self.get_quests()
         capabilities = self.get_capability_catalog()
+        state = self.get_state()
+        with self.counters_lock:
+            counters = dict(self.counters)
         
         return {
-            "director_state": self.get_state(),
+            "director_state": state,
             "milestones": milestones["milestones"],
             "issues": issues["issues"],
             "quests_summary": {
-                "active": len(quests["active"]),
-                "next": len(quests["next"]),
-                "later": len(quests["later"]),
-                "total": len(quests["quests"])
+                "active": counters["quests_active"],
+                "next": counters["quests_next"],
+                "later": counters["quests_later"],
+                "total": counters["quests"]
             },
             "capabilities_summary": capabilities["counts"]
         }
@@ -162,61 +449,69 @@ class Director:
             "updated_ts": datetime.now().isoformat()
         }
         
-        with open(self.issues_file, "r") as f:
-            data = json.load(f)
-        data["issues"].append(issue)
-        with open(self.issues_file, "w") as f:
-            json.dump(data, f, indent=2)
+        self.store.add_issue(issue)
             
         self.append_event("issue.created", "director", {"issue_id": issue_id, "severity": severity})
         return issue
 
     def set_issue_status(self, issue_id: str, status: str) -> Dict:
-        with open(self.issues_file, "r") as f:
-            data = json.load(f)
-        
-        found = False
-        for issue in data["issues"]:
-            if issue["id"] == issue_id:
-                issue["status"] = status
-                issue["updated_ts"] = datetime.now().isoformat()
-                found = True
-                break
-        
-        if not found:
+        if not self.store.update_issue(issue_id, status=status, updated_ts=datetime.now().isoformat()):
             raise ValueError(f"Issue {issue_id} not found")
             
-        with open(self.issues_file, "w") as f:
-            json.dump(data, f, indent=2)
-            
         self.append_event("issue.status_changed", "director", {"issue_id": issue_id, "status": status})
         return {"success": True, "issue_id": issue_id, "status": status}
 
     def set_milestone_status(self, milestone_id: str, status: str) -> Dict:
-        with open(self.milestones_file, "r") as f:
-            data = json.load(f)
-        
-        found = False
-        for m in data["milestones"]:
-            if m["id"] == milestone_id:
-                m["status"] = status
-                m["updated_ts"] = datetime.now().isoformat()
-                found = True
-                break
-        
-        if not found:
+        if not self.store.update_milestone(milestone_id, status=status, updated_ts=datetime.now().isoformat()):
             raise ValueError(f"Milestone {milestone_id} not found")
             
-        with open(self.milestones_file, "w") as f:
-            json.dump(data, f, indent=2)
-            
         self.append_event("milestone.status_changed", "director", {"milestone_id": milestone_id, "status": status})
         return {"success": True, "milestone_id": milestone_id, "status": status}
 
     # --- Inbox Operations ---
 
     def ingest_to_inbox(self, filename: str, content: bytes) -> Dict:
+        return self.ingest_stream_to_inbox(filename, io.BytesIO(content))
+
+    def ingest_stream_to_inbox(self, filename: str, source, max_bytes: Optional[int] = None) -> Dict:
+        """
+        Copies a binary file-like source into the inbox one chunk at a time, hashing as it goes,
+        then returns; preview/OCR are derived in the background and meta.json moves from
+        "pending" to "ready" (or "failed"). Raises InboxTooLarge past max_bytes and InboxBusy
+        when the derivation queue stays full for derive_wait_s.
+        Content already in the inbox gets its own bundle aliasing the first one: the original
+        and derived artifacts are hardlinked instead of recomputed.
+        """
+        max_bytes = self.max_upload_bytes if max_bytes is None else max_bytes
+        ext = os.path.splitext(filename)[1].lower()
+        item_type = "image" if ext in IMAGE_EXTS else "unknown"
+
         inbox_id = str(uuid.uuid4())
+        incoming = os.path.join(self.incoming_dir, inbox_id + ".part")
+        digest = hashlib.sha256()
+        size = 0
+        try:
+            with open(incoming, "wb") as f:
+                while True:
+                    chunk = source.read(UPLOAD_CHUNK_BYTES)
+                    if not chunk:
+                        break
+                    size += len(chunk)
+                    if max_bytes and size > max_bytes:
+                        raise InboxTooLarge(f"Upload exceeds {max_bytes} bytes")
+                    digest.update(chunk)
+                    f.write(chunk)
+            file_hash = digest.hexdigest()
+            canonical = self._find_inbox_by_hash(file_hash)
+            needs_job = item_type == "image" and (canonical is None or canonical.get("status") == "failed")
+            # Take the queue slot before creating the bundle so a rejected upload leaves nothing behind
+            if needs_job and not self.derive_slots.acquire(timeout=self.derive_wait_s):
+                raise InboxBusy("Inbox derivation queue is full")
+        except BaseException:
+            if os.path.exists(incoming):
+                os.remove(incoming)
+            raise
+
         bundle_path = os.path.join(self.inbox_dir, inbox_id)
         original_path = os.path.join(bundle_path, "original")
         derived_path = os.path.join(bundle_path, "derived")
@@ -225,10 +520,12 @@ class Director:
         os.makedirs(derived_path, exist_ok=True)
         
         dest_file = os.path.join(original_path, filename)
-        with open(dest_file, "wb") as f:
-            f.write(content)
-            
-        file_hash = hashlib.sha256(content).hexdigest()
+        if canonical is not None:
+            _link_or_copy(os.path.join(self.inbox_dir, canonical["id"], "original", canonical["filenames"][0]), dest_file)
+            os.remove(incoming)
+        else:
+            os.replace(incoming, dest_file)
+        self._update_counters(inbox=1)
         
         # Manifest
         manifest = {
@@ -236,54 +533,182 @@ class Director:
             "files": [{
                 "name": filename,
                 "hash_sha256": file_hash,
-                "size_bytes": len(content)
+                "size_bytes": size
             }]
         }
         with open(os.path.join(bundle_path, "manifest.json"), "w") as f:
             json.dump(manifest, f, indent=2)
             
-        # Meta
-        ext = os.path.splitext(filename)[1].lower()
-        item_type = "image" if ext in ['.jpg', '.jpeg', '.png', '.bmp'] else "unknown"
-        
         meta = {
             "id": inbox_id,
             "type": item_type,
             "created_ts": datetime.now().isoformat(),
             "filenames": [filename],
-            "artifacts": {}
+            "artifacts": {},
+            "status": "pending" if item_type == "image" else "ready"
         }
+        if canonical is not None and not needs_job:
+            meta["alias_of"] = canonical["id"]
+        else:
+            # New content, or a re-derive after the canonical bundle failed: this bundle takes over
+            self.store.add_inbox_hash(file_hash, inbox_id)
+        self._write_meta(bundle_path, meta)
         
-        self.append_event("inbox.created", "director", {"inbox_id": inbox_id, "type": item_type})
+        self.append_event("inbox.created", "director", {"inbox_id": inbox_id, "type": item_type, "alias_of": meta.get("alias_of")})
         
-        # OCR / Derived
-        if item_type == "image":
-            # Preview
-            try:
-                with Image.open(dest_file) as img:
-                    img.thumbnail((800, 800))
-                    img.save(os.path.join(derived_path, "preview.jpg"), "JPEG")
-                    meta["artifacts"]["preview"] = "derived/preview.jpg"
-            except Exception as e:
-                print(f"Preview gen failed: {e}")
-                
-            # OCR
-            ocr_text = "(ocr unavailable)"
+        if needs_job:
+            self._submit_derivation(inbox_id, dest_file, derived_path)
+        elif item_type == "image":
+            with self.derive_lock:
+                # Still pending: the canonical job's completion fills this bundle in
+                pending = self._read_meta(canonical["id"]).get("status") == "pending"
+                if pending:
+                    self.derive_aliases.setdefault(canonical["id"], []).append(inbox_id)
+            if not pending:
+                meta = self._alias_derived(canonical["id"], inbox_id)
+        return meta
+
+    def _find_inbox_by_hash(self, file_hash: str) -> Optional[Dict]:
+        inbox_id = self.store.get_inbox_by_hash(file_hash)
+        if inbox_id is None:
+            return None
+        meta = self._read_meta(inbox_id)
+        if not meta.get("filenames"):
+            # Bundle removed by hand; the next upload becomes the new canonical copy
+            self.store.drop_inbox_hash(file_hash)
+            return None
+        return meta
+
+    def _read_meta(self, inbox_id: str) -> Dict:
+        try:
+            with open(os.path.join(self.inbox_dir, inbox_id, "meta.json"), "r") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _alias_derived(self, canonical_id: str, inbox_id: str) -> Dict:
+        """Hardlinks the canonical bundle's derived artifacts into a duplicate and marks it ready."""
+        source = self._read_meta(canonical_id)
+        bundle_path = os.path.join(self.inbox_dir, inbox_id)
+        with self.meta_lock:
+            meta = self._read_meta(inbox_id)
+            if source.get("status") == "ready":
+                for rel in source.get("artifacts", {}).values():
+                    _link_or_copy(os.path.join(self.inbox_dir, canonical_id, rel), os.path.join(bundle_path, rel))
+                meta["artifacts"] = dict(source.get("artifacts", {}))
+                meta["timings"] = source.get("timings", {})
+                meta["status"] = "ready"
+            else:
+                meta["status"] = "failed"
+                meta["derive_errors"] = source.get("derive_errors", [f"canonical bundle {canonical_id} not ready"])
+            meta["derived_ts"] = datetime.now().isoformat()
+            self._write_meta(bundle_path, meta)
+        if meta["status"] == "ready":
+            self.append_event("inbox.derived_written", "director", {"inbox_id": inbox_id, "artifacts": list(meta["artifacts"].keys()),
+                                                                   "alias_of": canonical_id})
+        return meta
+
+    def _backfill_inbox_hashes(self):
+        """Indexes bundles ingested before the hash index existed; runs once per state directory."""
+        if self.store.get_meta("inbox_hashes"):
+            return
+        for entry in sorted(os.listdir(self.inbox_dir)):
             try:
-                ocr_text = pytesseract.image_to_string(Image.open(dest_file))
-            except Exception as e:
-                print(f"OCR failed: {e}")
-                
-            with open(os.path.join(derived_path, "ocr.txt"), "w", encoding="utf-8") as f:
-                f.write(ocr_text)
-            meta["artifacts"]["ocr"] = "derived/ocr.txt"
-            
-            self.append_event("inbox.derived_written", "director", {"inbox_id": inbox_id, "artifacts": list(meta["artifacts"].keys())})
-            
-        with open(os.path.join(bundle_path, "meta.json"), "w") as f:
+                with open(os.path.join(self.inbox_dir, entry, "manifest.json"), "r") as f:
+                    manifest = json.load(f)
+                self.store.add_inbox_hash(manifest["files"][0]["hash_sha256"], manifest["inbox_id"])
+            except (OSError, ValueError, KeyError, IndexError):
+                continue
+        self.store.set_meta("inbox_hashes", "1")
+
+    def _write_meta(self, bundle_path: str, meta: Dict):
+        tmp = os.path.join(bundle_path, "meta.json.tmp")
+        with open(tmp, "w") as f:
             json.dump(meta, f, indent=2)
-            
-        return meta
+        os.replace(tmp, os.path.join(bundle_path, "meta.json"))
+
+    def _get_derive_pool(self) -> ProcessPoolExecutor:
+        with self.derive_lock:
+            if self.derive_pool is None:
+                self.derive_pool = ProcessPoolExecutor(max_workers=self.derive_workers, initializer=_init_derive_worker)
+            return self.derive_pool
+
+    def _submit_derivation(self, inbox_id: str, dest_file: str, derived_path: str):
+        """Caller holds a derive_slots permit; it is released when the job completes."""
+        with self.derive_lock:
+            self.derive_pending += 1
+        try:
+            future = self._get_derive_pool().submit(_derive_inbox_item, dest_file, derived_path)
+        except Exception as e:
+            self._finish_derivation(inbox_id, None, e)
+            return
+        future.add_done_callback(lambda fut: self._finish_derivation(inbox_id, fut, None))
+
+    def _finish_derivation(self, inbox_id: str, future, error: Optional[Exception]):
+        try:
+            result = None
+            if future is not None:
+                try:
+                    result = future.result()
+                except Exception as e:
+                    error = e
+            bundle_path = os.path.join(self.inbox_dir, inbox_id)
+            with self.meta_lock:
+                with open(os.path.join(bundle_path, "meta.json"), "r") as f:
+                    meta = json.load(f)
+                if result is not None:
+                    meta["artifacts"].update(result["artifacts"])
+                    meta["status"] = "ready"
+                    meta["timings"] = result.get("timings", {})
+                    if result["errors"]:
+                        meta["derive_errors"] = result["errors"]
+                else:
+                    meta["status"] = "failed"
+                    meta["derive_errors"] = [str(error)]
+                meta["derived_ts"] = datetime.now().isoformat()
+                self._write_meta(bundle_path, meta)
+            if result is not None:
+                self.append_event("inbox.derived_written", "director", {"inbox_id": inbox_id, "artifacts": list(meta["artifacts"].keys()),
+                                                                       "ocr_ms": meta["timings"].get("ocr_ms")})
+            else:
+                print(f"Inbox derivation failed for {inbox_id}: {error}")
+                self.append_event("inbox.derive_failed", "director", {"inbox_id": inbox_id, "error": str(error)}, severity="error")
+            with self.derive_lock:
+                aliases = self.derive_aliases.pop(inbox_id, [])
+            for alias_id in aliases:
+                self._alias_derived(inbox_id, alias_id)
+        except Exception as e:
+            print(f"Inbox derivation bookkeeping failed for {inbox_id}: {e}")
+        finally:
+            with self.derive_lock:
+                self.derive_pending -= 1
+            self.derive_slots.release()
+
+    def _resume_derivations(self):
+        """Requeues bundles left "pending" by a crash or shutdown; slots are not waited on here."""
+        for entry in os.listdir(self.inbox_dir):
+            bundle_path = os.path.join(self.inbox_dir, entry)
+            try:
+                with open(os.path.join(bundle_path, "meta.json"), "r") as f:
+                    meta = json.load(f)
+            except (OSError, ValueError):
+                continue
+            if meta.get("status") != "pending" or not meta.get("filenames"):
+                continue
+            if not self.derive_slots.acquire(blocking=False):
+                print("Inbox derivation queue full; remaining pending bundles resume on next start")
+                return
+            self._submit_derivation(meta["id"], os.path.join(bundle_path, "original", meta["filenames"][0]),
+                                    os.path.join(bundle_path, "derived"))
+
+    def wait_for_derivations(self, timeout: float = 30.0) -> bool:
+        deadline = time.time() + timeout
+        while time.time() < deadline:
+            with self.derive_lock:
+                if self.derive_pending == 0:
+                    return True
+            time.sleep(0.01)
+        return False
 
     def list_inbox(self) -> List[Dict]:
         items = []
@@ -317,9 +742,6 @@ class Director:
     # --- Quest Engine ---
 
     def create_quest_from_inbox(self, inbox_id: str, title: str = None, acceptance: str = None) -> Dict:
-        with open(self.quests_file, "r") as f:
-            quests_data = json.load(f)
-            
         quest_id = str(uuid.uuid4())
         quest = {
             "id": quest_id,
@@ -332,47 +754,42 @@ class Director:
             "runs": []
         }
         
-        quests_data["quests"].append(quest)
-        quests_data["later"].append(quest_id)
-        
-        with open(self.quests_file, "w") as f:
-            json.dump(quests_data, f, indent=2)
+        self.store.add_quest(quest)
+        self._set_counters(self._quest_counters())
             
         self.append_event("quest.created", "director", {"quest_id": quest_id, "source_inbox_id": inbox_id})
         return quest
 
     def set_quest_status(self, quest_id: str, status: str) -> Dict:
-        if status not in ["active", "next", "later"]:
+        if status not in QUEST_STATUSES:
             raise ValueError("Invalid quest status")
             
-        with open(self.quests_file, "r") as f:
-            quests_data = json.load(f)
-            
-        # Remove from old status lists
-        for s in ["active", "next", "later"]:
-            if quest_id in quests_data[s]:
-                quests_data[s].remove(quest_id)
-        
-        # Add to new status list
-        quests_data[status].append(quest_id)
-        
-        # Update quest object
-        for q in quests_data["quests"]:
-            if q["id"] == quest_id:
-                q["status"] = status
-                break
-                
-        with open(self.quests_file, "w") as f:
-            json.dump(quests_data, f, indent=2)
+        if not self.store.set_quest_status(quest_id, status):
+            raise ValueError(f"Quest {quest_id} not found")
+        self._set_counters(self._quest_counters())
             
         self.append_event("quest.status_changed", "director", {"quest_id": quest_id, "status": status})
         return {"success": True, "quest_id": quest_id, "status": status}
 
     def get_quests(self) -> Dict:
-        if not os.path.exists(self.quests_file):
-            return {"quests": [], "active": [], "next": [], "later": []}
-        with open(self.quests_file, "r") as f:
-            return json.load(f)
+        return self.store.export_quests()
+
+    def list_quests(self, status: Optional[str] = None, limit: int = 50, offset: int = 0) -> Dict:
+        return self.store.list_quests(status, limit, offset)
+
+    def list_issues(self, status: Optional[str] = None, severity: Optional[str] = None, limit: int = 50, offset: int = 0) -> Dict:
+        return self.store.list_issues(status, severity, limit, offset)
+
+    def list_milestones(self, status: Optional[str] = None, limit: int = 50, offset: int = 0) -> Dict:
+        return self.store.list_milestones(status, limit, offset)
+
+    def export_planning(self) -> Dict:
+        """The legacy quests.json / issues.json / milestones.json documents, rebuilt from the store."""
+        return {
+            "quests": self.store.export_quests(),
+            "issues": self.store.export_issues(),
+            "milestones": self.store.export_milestones(),
+        }
 
     # --- Capability Trails ---
 
@@ -493,8 +910,11 @@ class Director:
         receipt["timestamp"] = receipt.get("timestamp", datetime.now().isoformat())
         
         file_path = os.path.join(self.runs_dir, f"{run_id}.json")
+        is_new = not os.path.exists(file_path)
         with open(file_path, "w") as f:
             json.dump(receipt, f, indent=2)
+        if is_new:
+            self._update_counters(runs=1)
             
         self.append_event("run.complete", "director", {"run_id": run_id, "status": receipt.get("status")})
         return run_id
@@ -0,0 +1,220 @@
+import json
+import sqlite3
+import threading
+from typing import Dict, Any, Optional
+
+QUEST_STATUSES = ("active", "next", "later")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS quests (
+    id TEXT PRIMARY KEY,
+    status TEXT NOT NULL,
+    status_seq INTEGER NOT NULL, -- position within its active/next/later list
+    created_seq INTEGER NOT NULL,
+    body TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS quests_status ON quests(status, status_seq);
+CREATE INDEX IF NOT EXISTS quests_created ON quests(created_seq);
+CREATE TABLE IF NOT EXISTS issues (
+    id TEXT PRIMARY KEY,
+    status TEXT NOT NULL,
+    severity TEXT,
+    created_seq INTEGER NOT NULL,
+    body TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS issues_status ON issues(status, created_seq);
+CREATE INDEX IF NOT EXISTS issues_severity ON issues(severity, created_seq);
+CREATE TABLE IF NOT EXISTS milestones (
+    id TEXT PRIMARY KEY,
+    status TEXT NOT NULL,
+    ord INTEGER,
+    body TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS milestones_status ON milestones(status, ord);
+CREATE TABLE IF NOT EXISTS inbox_hashes (
+    sha256 TEXT PRIMARY KEY,
+    inbox_id TEXT NOT NULL -- bundle whose derived artifacts duplicates alias
+);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+class DirectorStore:
+    """
+    SQLite (WAL) store for quests, issues and milestones. Every mutation is a single
+    transaction touching one row; exports rebuild the JSON shapes the dashboard reads.
+    """
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(_SCHEMA)
+        self.conn.commit()
+
+    def _next(self, table: str, column: str) -> int:
+        row = self.conn.execute(f"SELECT COALESCE(MAX({column}), 0) + 1 FROM {table}").fetchone()
+        return row[0]
+
+    # --- Migration ---
+
+    def is_migrated(self) -> bool:
+        with self.lock:
+            return self.conn.execute("SELECT value FROM meta WHERE key = 'migrated'").fetchone() is not None
+
+    def migrate(self, quests_data: Optional[Dict], issues_data: Optional[Dict], milestones_data: Optional[Dict], source: str):
+        """One-shot import of the legacy JSON documents; all or nothing."""
+        with self.lock, self.conn:
+            quests_data = quests_data or {}
+            status_of = {}
+            for status in QUEST_STATUSES:
+                for qid in quests_data.get(status, []):
+                    status_of[qid] = status
+            positions = {qid: i for status in QUEST_STATUSES for i, qid in enumerate(quests_data.get(status, []))}
+            for i, q in enumerate(quests_data.get("quests", [])):
+                # The id lists are authoritative for placement; fall back to the object's own status
+                status = status_of.get(q["id"], q.get("status", "later"))
+                q["status"] = status
+                self.conn.execute("INSERT OR REPLACE INTO quests VALUES (?, ?, ?, ?, ?)",
+                                  (q["id"], status, positions.get(q["id"], len(positions) + i), i + 1, json.dumps(q)))
+            for i, issue in enumerate((issues_data or {}).get("issues", [])):
+                self.conn.execute("INSERT OR REPLACE INTO issues VALUES (?, ?, ?, ?, ?)",
+                                  (issue["id"], issue.get("status", "open"), issue.get("severity"), i + 1, json.dumps(issue)))
+            for m in (milestones_data or {}).get("milestones", []):
+                self.conn.execute("INSERT OR REPLACE INTO milestones VALUES (?, ?, ?, ?)",
+                                  (m["id"], m.get("status") or "", m.get("order"), json.dumps(m)))
+            self.conn.execute("INSERT OR REPLACE INTO meta VALUES ('migrated', ?)", (source,))
+
+    # --- Quests ---
+
+    def add_quest(self, quest: Dict[str, Any]):
+        with self.lock, self.conn:
+            self.conn.execute("INSERT INTO quests VALUES (?, ?, ?, ?, ?)",
+                              (quest["id"], quest["status"], self._next("quests", "status_seq"),
+                               self._next("quests", "created_seq"), json.dumps(quest)))
+
+    def set_quest_status(self, quest_id: str, status: str) -> bool:
+        with self.lock, self.conn:
+            row = self.conn.execute("SELECT body FROM quests WHERE id = ?", (quest_id,)).fetchone()
+            if row is None:
+                return False
+            quest = json.loads(row[0])
+            quest["status"] = status
+            # Moving to the end of the target list matches the old remove/append behaviour
+            self.conn.execute("UPDATE quests SET status = ?, status_seq = ?, body = ? WHERE id = ?",
+                              (status, self._next("quests", "status_seq"), json.dumps(quest), quest_id))
+            return True
+
+    def get_quest(self, quest_id: str) -> Optional[Dict[str, Any]]:
+        with self.lock:
+            row = self.conn.execute("SELECT body FROM quests WHERE id = ?", (quest_id,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def quest_counts(self) -> Dict[str, int]:
+        with self.lock:
+            rows = self.conn.execute("SELECT status, COUNT(*) FROM quests GROUP BY status").fetchall()
+        counts = {s: 0 for s in QUEST_STATUSES}
+        counts.update({s: n for s, n in rows})
+        counts["total"] = sum(n for _, n in rows)
+        return counts
+
+    def list_quests(self, status: Optional[str] = None, limit: int = 50, offset: int = 0) -> Dict[str, Any]:
+        return self._page("quests", {"status": status}, "status_seq" if status else "created_seq", limit, offset)
+
+    def export_quests(self) -> Dict[str, Any]:
+        with self.lock:
+            quests = [json.loads(r[0]) for r in self.conn.execute("SELECT body FROM quests ORDER BY created_seq")]
+            lists = {s: [] for s in QUEST_STATUSES}
+            for qid, status in self.conn.execute("SELECT id, status FROM quests ORDER BY status_seq"):
+                lists.setdefault(status, []).append(qid)
+        return {"quests": quests, **lists}
+
+    # --- Issues ---
+
+    def add_issue(self, issue: Dict[str, Any]):
+        with self.lock, self.conn:
+            self.conn.execute("INSERT INTO issues VALUES (?, ?, ?, ?, ?)",
+                              (issue["id"], issue["status"], issue.get("severity"),
+                               self._next("issues", "created_seq"), json.dumps(issue)))
+
+    def update_issue(self, issue_id: str, **fields) -> bool:
+        return self._update("issues", issue_id, fields)
+
+    def list_issues(self, status: Optional[str] = None, severity: Optional[str] = None, limit: int = 50, offset: int = 0) -> Dict[str, Any]:
+        return self._page("issues", {"status": status, "severity": severity}, "created_seq", limit, offset)
+
+    def export_issues(self) -> Dict[str, Any]:
+        with self.lock:
+            return {"issues": [json.loads(r[0]) for r in self.conn.execute("SELECT body FROM issues ORDER BY created_seq")]}
+
+    # --- Milestones ---
+
+    def update_milestone(self, milestone_id: str, **fields) -> bool:
+        return self._update("milestones", milestone_id, fields)
+
+    def list_milestones(self, status: Optional[str] = None, limit: int = 50, offset: int = 0) -> Dict[str, Any]:
+        return self._page("milestones", {"status": status}, "ord", limit, offset)
+
+    def export_milestones(self) -> Dict[str, Any]:
+        with self.lock:
+            return {"milestones": [json.loads(r[0]) for r in self.conn.execute("SELECT body FROM milestones ORDER BY ord, rowid")]}
+
+    # --- Inbox content index ---
+
+    def get_inbox_by_hash(self, sha256: str) -> Optional[str]:
+        with self.lock:
+            row = self.conn.execute("SELECT inbox_id FROM inbox_hashes WHERE sha256 = ?", (sha256,)).fetchone()
+        return row[0] if row else None
+
+    def add_inbox_hash(self, sha256: str, inbox_id: str):
+        with self.lock, self.conn:
+            self.conn.execute("INSERT OR REPLACE INTO inbox_hashes VALUES (?, ?)", (sha256, inbox_id))
+
+    def drop_inbox_hash(self, sha256: str):
+        with self.lock, self.conn:
+            self.conn.execute("DELETE FROM inbox_hashes WHERE sha256 = ?", (sha256,))
+
+    # --- Shared helpers ---
+
+    def get_meta(self, key: str) -> Optional[str]:
+        with self.lock:
+            row = self.conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def set_meta(self, key: str, value: str):
+        with self.lock, self.conn:
+            self.conn.execute("INSERT OR REPLACE INTO meta VALUES (?, ?)", (key, value))
+
+    def _update(self, table: str, row_id: str, fields: Dict[str, Any]) -> bool:
+        with self.lock, self.conn:
+            row = self.conn.execute(f"SELECT body FROM {table} WHERE id = ?", (row_id,)).fetchone()
+            if row is None:
+                return False
+            body = json.loads(row[0])
+            body.update(fields)
+            self.conn.execute(f"UPDATE {table} SET status = ?, body = ? WHERE id = ?", (body.get("status"), json.dumps(body), row_id))
+            return True
+
+    def _page(self, table: str, filters: Dict[str, Optional[str]], order: str, limit: int, offset: int) -> Dict[str, Any]:
+        clauses = [f"{k} = ?" for k, v in filters.items() if v is not None]
+        params = [v for v in filters.values() if v is not None]
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        limit = max(1, min(limit, 500))
+        offset = max(0, offset)
+        with self.lock:
+            total = self.conn.execute(f"SELECT COUNT(*) FROM {table} {where}", params).fetchone()[0]
+            rows = self.conn.execute(f"SELECT body FROM {table} {where} ORDER BY {order} LIMIT ? OFFSET ?",
+                                     params + [limit, offset]).fetchall()
+        items = [json.loads(r[0]) for r in rows]
+        return {
+            "items": items,
+            "total": total,
+            "next_offset": offset + len(items) if offset + len(items) < total else None,
+        }
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
@@ -0,0 +1,175 @@
+import json
+import sqlite3
+import threading
+from datetime import datetime
+from typing import Dict, Any, List, Optional
+
+# Scalar payload values are indexed under these types; nested objects/lists are not
+_SCALARS = (str, int, float, bool)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS events (
+    seq INTEGER PRIMARY KEY,
+    id TEXT,
+    ts TEXT,
+    ts_epoch REAL,
+    type TEXT,
+    source TEXT,
+    severity TEXT,
+    body TEXT
+);
+CREATE INDEX IF NOT EXISTS events_type ON events(type, seq);
+CREATE INDEX IF NOT EXISTS events_source ON events(source, seq);
+CREATE INDEX IF NOT EXISTS events_severity ON events(severity, seq);
+CREATE INDEX IF NOT EXISTS events_ts ON events(ts_epoch);
+CREATE TABLE IF NOT EXISTS event_keys (
+    seq INTEGER NOT NULL,
+    key TEXT NOT NULL,
+    value TEXT,
+    PRIMARY KEY (key, value, seq)
+) WITHOUT ROWID;
+"""
+
+GROUP_COLUMNS = ("type", "source", "severity")
+
+def _epoch(ts: Optional[str]) -> Optional[float]:
+    if not ts:
+        return None
+    try:
+        return datetime.fromisoformat(ts).timestamp()
+    except ValueError:
+        return None
+
+class EventIndex:
+    """
+    SQLite (WAL) secondary index over the director event log: one row per event keyed by seq,
+    plus an (key, value) table for top-level scalar payload fields such as run_id.
+    The log stays the source of truth; the index can be rebuilt from it at any time.
+    """
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(_SCHEMA)
+        self.conn.commit()
+
+    def last_seq(self) -> int:
+        with self.lock:
+            row = self.conn.execute("SELECT MAX(seq) FROM events").fetchone()
+        return row[0] or 0
+
+    def add_many(self, events: List[Dict[str, Any]]):
+        rows = []
+        keys = []
+        for e in events:
+            seq = e.get("seq")
+            if seq is None:
+                continue
+            rows.append((seq, e.get("id"), e.get("timestamp"), _epoch(e.get("timestamp")),
+                         e.get("type"), e.get("source"), e.get("severity"), json.dumps(e)))
+            payload = e.get("payload")
+            if isinstance(payload, dict):
+                for k, v in payload.items():
+                    if isinstance(v, _SCALARS):
+                        keys.append((seq, k, str(v)))
+        if not rows:
+            return
+        with self.lock:
+            with self.conn:
+                self.conn.executemany("INSERT OR REPLACE INTO events VALUES (?, ?, ?, ?, ?, ?, ?, ?)", rows)
+                self.conn.executemany("INSERT OR IGNORE INTO event_keys VALUES (?, ?, ?)", keys)
+
+    def add(self, event: Dict[str, Any]):
+        self.add_many([event])
+
+    def catch_up(self, event_log, batch: int = 2000) -> int:
+        """Indexes events the log has that the index does not (first run, or a crash between the two)."""
+        added = 0
+        after = self.last_seq()
+        while after < event_log.count:
+            events = event_log.read(batch, after=after)
+            if not events:
+                break
+            self.add_many(events)
+            added += len(events)
+            after = events[-1]["seq"]
+        return added
+
+    def _where(self, type_prefix: Optional[str], source: Optional[str], severity: Optional[str],
+               since: Optional[str], until: Optional[str], payload: Optional[Dict[str, str]]):
+        clauses = []
+        params: List[Any] = []
+        if type_prefix:
+            # Range scan instead of LIKE so the type index is used and "_"/"%" stay literal
+            clauses.append("type >= ? AND type < ?")
+            params += [type_prefix, type_prefix + "\U0010ffff"]
+        if source:
+            clauses.append("source = ?")
+            params.append(source)
+        if severity:
+            clauses.append("severity = ?")
+            params.append(severity)
+        for name, value, op in (("since", since, ">="), ("until", until, "<")):
+            if not value:
+                continue
+            epoch = _epoch(value)
+            if epoch is None:
+                # A NULL bound would silently match nothing
+                raise ValueError(f"{name} is not an ISO timestamp: {value}")
+            clauses.append(f"ts_epoch {op} ?")
+            params.append(epoch)
+        for k, v in (payload or {}).items():
+            clauses.append("seq IN (SELECT seq FROM event_keys WHERE key = ? AND value = ?)")
+            params += [k, str(v)]
+        return clauses, params
+
+    def query(self, type_prefix: Optional[str] = None, source: Optional[str] = None, severity: Optional[str] = None,
+              since: Optional[str] = None, until: Optional[str] = None, payload: Optional[Dict[str, str]] = None,
+              limit: int = 50, before_seq: Optional[int] = None, after_seq: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Matching events newest first (oldest first when paging forward with after_seq).
+        next_before_seq continues the listing backwards; None when there is nothing older.
+        """
+        clauses, params = self._where(type_prefix, source, severity, since, until, payload)
+        order = "DESC"
+        if before_seq is not None:
+            clauses.append("seq < ?")
+            params.append(before_seq)
+        if after_seq is not None:
+            clauses.append("seq > ?")
+            params.append(after_seq)
+            order = "ASC"
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        limit = max(1, min(limit, 1000))
+        sql = f"SELECT body FROM events {where} ORDER BY seq {order} LIMIT ?"
+        with self.lock:
+            rows = self.conn.execute(sql, params + [limit + 1]).fetchall()
+        events = [json.loads(r[0]) for r in rows[:limit]]
+        more = len(rows) > limit
+        result: Dict[str, Any] = {"events": events, "next_before_seq": None, "next_after_seq": None}
+        if events and order == "DESC" and more:
+            result["next_before_seq"] = events[-1]["seq"]
+        if events and order == "ASC" and more:
+            result["next_after_seq"] = events[-1]["seq"]
+        return result
+
+    def count(self, type_prefix: Optional[str] = None, source: Optional[str] = None, severity: Optional[str] = None,
+              since: Optional[str] = None, until: Optional[str] = None, payload: Optional[Dict[str, str]] = None,
+              group_by: Optional[str] = None) -> Dict[str, Any]:
+        clauses, params = self._where(type_prefix, source, severity, since, until, payload)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        with self.lock:
+            total = self.conn.execute(f"SELECT COUNT(*) FROM events {where}", params).fetchone()[0]
+            result: Dict[str, Any] = {"count": total}
+            if group_by in GROUP_COLUMNS:
+                rows = self.conn.execute(
+                    f"SELECT {group_by}, COUNT(*) FROM events {where} GROUP BY {group_by} ORDER BY COUNT(*) DESC", params
+                ).fetchall()
+                result["groups"] = {str(k): n for k, n in rows}
+        return result
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
@@ -0,0 +1,585 @@
+import os
+import re
+import gzip
+import json
+import time
+import atexit
+import bisect
+import threading
+from datetime import datetime
+from typing import Dict, Any, List, Optional, Tuple
+
+READ_CHUNK = 64 * 1024
+SEGMENT_MAX_BYTES = 8 * 1024**2
+SEGMENT_MAX_AGE_S = 24 * 3600
+DURABILITY_POLICIES = ("none", "flush", "fsync")
+BUFFER_BYTES = 256 * 1024 # userspace write buffer under durability="none"
+_SEGMENT_RE = re.compile(r"^(events\.(\d+)\.jsonl)(\.gz)?$")
+
+def _ts_epoch(ts: Optional[str]) -> Optional[float]:
+    try:
+        return datetime.fromisoformat(ts).timestamp()
+    except (TypeError, ValueError):
+        return None
+
+class EventLog:
+    """
+    Append-only JSONL event log split into segments. The hot segment is the file at path, with a
+    sparse offset index next to it (events.idx). Once it exceeds max_segment_bytes or
+    max_segment_age_s it is sealed into event_segments/ and gzip-compressed in the background,
+    one gzip member per index block so cold reads can still seek. event_segments/manifest.json
+    lists every sealed segment's seq range, time range, event count and block offsets.
+
+    Every event gets a monotonic seq (its line number across all segments), so tail reads and
+    cursor pages cost O(limit + index_every) regardless of how large the log grows.
+
+    append() only assigns the seq and queues the line; a writer thread group-commits the queue
+    every flush_interval_s (or sooner once batch_events are waiting) with one write per batch.
+    durability: "none" keeps batches in a userspace buffer that reaches the OS when it fills, when
+    the log has been idle for idle_flush_s, on seal and on close, and never fsyncs; "flush" hands
+    every batch to the OS (survives a process crash) and fsyncs on seal and close; "fsync" also
+    fsyncs after every batch.
+    Reads never write. They see events that have reached the OS; under "flush"/"fsync" a read
+    first waits up to read_wait_s for the writer to catch up with appends made before it.
+    """
+    def __init__(self, path: str, index_every: int = 256,
+                 max_segment_bytes: int = SEGMENT_MAX_BYTES, max_segment_age_s: float = SEGMENT_MAX_AGE_S,
+                 durability: str = "flush", flush_interval_s: float = 0.01, batch_events: int = 2048,
+                 read_wait_s: float = 0.25, idle_flush_s: float = 1.0):
+        if durability not in DURABILITY_POLICIES:
+            raise ValueError(f"durability must be one of {DURABILITY_POLICIES}")
+        self.path = path
+        self.index_path = os.path.splitext(path)[0] + ".idx"
+        self.segment_dir = os.path.join(os.path.dirname(path), "event_segments")
+        self.manifest_path = os.path.join(self.segment_dir, "manifest.json")
+        self.index_every = index_every
+        self.max_segment_bytes = max_segment_bytes
+        self.max_segment_age_s = max_segment_age_s
+        self.durability = durability
+        self.flush_interval_s = flush_interval_s
+        self.batch_events = batch_events
+        self.read_wait_s = read_wait_s
+        self.idle_flush_s = idle_flush_s
+        self.lock = threading.Lock()
+        self.cond = threading.Condition(self.lock)
+        self.write_lock = threading.Lock() # serializes file writes; taken before self.lock, never after
+
+        self.segments: List[Dict[str, Any]] = [] # sealed, oldest first
+        self.base = 0 # last seq stored in sealed segments
+        self.marks: List[Tuple[int, int]] = [] # hot segment: (seq, byte offset of that event's line)
+        self.count = 0 # last seq handed out
+        self.written = 0 # last seq handed to the file object
+        self.size = 0
+        self.visible = 0 # last seq readable through other file handles
+        self.visible_size = 0
+        self.delivered = 0 # last seq passed to listeners
+        self.hot_first_ts: Optional[str] = None
+        self.hot_started: Optional[float] = None
+        self.last_event: Optional[Dict[str, Any]] = None
+        self.written_last_ts: Optional[str] = None
+        self.compressors: List[threading.Thread] = []
+        self.listeners: List[Any] = []
+
+        self.pending: List[Dict[str, Any]] = []
+        self.batches = 0
+        self.closed = False
+        self._load()
+        self.handle = self._open_hot()
+        self.writer = threading.Thread(target=self._run_writer, daemon=True, name="event-log-writer")
+        self.writer.start()
+        atexit.register(self.close)
+
+    # --- Index maintenance ---
+
+    def _scan(self, path: str, seq: int, offset: int, marks: List[Tuple[int, int]], first_seq: int,
+              compressed: bool = False) -> Tuple[int, int, Optional[bytes], Optional[bytes]]:
+        """Reads forward from offset, extending marks. Returns (last seq, end offset, first line read, last line read)."""
+        first_line = None
+        last_line = None
+        with (gzip.open(path, "rb") if compressed else open(path, "rb")) as f:
+            f.seek(offset)
+            while True:
+                line = f.readline()
+                if not line: break
+                seq += 1
+                if (seq - first_seq) % self.index_every == 0 and (not marks or seq > marks[-1][0]):
+                    marks.append((seq, offset))
+                offset += len(line)
+                if first_line is None: first_line = line
+                last_line = line
+        return seq, offset, first_line, last_line
+
+    def _load(self):
+        os.makedirs(self.segment_dir, exist_ok=True)
+        self._load_segments()
+        self.base = self.segments[-1]["last_seq"] if self.segments else 0
+        first_seq = self.base + 1
+
+        if not os.path.exists(self.path):
+            open(self.path, "ab").close()
+        file_size = os.path.getsize(self.path)
+
+        if os.path.exists(self.index_path):
+            with open(self.index_path, "r") as f:
+                for line in f:
+                    parts = line.split()
+                    if len(parts) != 2: continue
+                    seq, offset = int(parts[0]), int(parts[1])
+                    # Entries past the end (log truncated or replaced) are stale
+                    if offset >= file_size or (self.marks and seq <= self.marks[-1][0]):
+                        break
+                    self.marks.append((seq, offset))
+        # Index entries must land on the expected seq grid; otherwise rebuild from scratch
+        if not self.marks or self.marks[0] != (first_seq, 0) or any((seq - first_seq) % self.index_every for seq, _ in self.marks):
+            self.marks = [(first_seq, 0)]
+
+        # Catch up from the last indexed point; covers events written before the index existed
+        seq, offset = self.marks[-1]
+        seq, offset, _, last_line = self._scan(self.path, seq - 1, offset, self.marks, first_seq)
+        if last_line is not None and not last_line.endswith(b"\n"):
+            # Torn final write: terminate it so the next append starts on its own line
+            with open(self.path, "ab") as f:
+                f.write(b"\n")
+            offset += 1
+        self.count = seq
+        self.written = self.visible = self.delivered = seq
+        self.size = self.visible_size = offset
+        self._write_index()
+
+        if last_line is not None:
+            self.last_event = self._parse(last_line, seq)
+        elif self.segments:
+            tail = self._read_range(self.base, self.base + 1, self.segments, [])
+            self.last_event = tail[0] if tail else None
+        self.written_last_ts = self.last_event.get("timestamp") if self.last_event else None
+        if self.size > 0:
+            with open(self.path, "rb") as f:
+                first = self._parse(f.readline(), first_seq)
+            self.hot_first_ts = first.get("timestamp") if first else None
+            self.hot_started = _ts_epoch(self.hot_first_ts) or time.time()
+
+        # Finish compressions interrupted by a restart
+        for entry in self.segments:
+            if not entry["compressed"]:
+                self._start_compress(entry)
+
+    def _load_segments(self):
+        manifest = {"segments": []}
+        if os.path.exists(self.manifest_path):
+            try:
+                with open(self.manifest_path, "r") as f:
+                    manifest = json.load(f)
+            except ValueError:
+                pass
+        known = set()
+        for entry in manifest.get("segments", []):
+            path = os.path.join(self.segment_dir, entry["file"])
+            raw = os.path.join(self.segment_dir, entry["raw_file"])
+            if entry["compressed"] and not os.path.exists(path) and os.path.exists(raw):
+                entry.update({"compressed": False, "file": entry["raw_file"]}) # gz lost, raw still there
+            elif not os.path.exists(path):
+                continue
+            entry["blocks"] = [tuple(b) for b in entry["blocks"]]
+            self.segments.append(entry)
+            known.add(entry["raw_file"])
+
+        # A crash between sealing the hot file and writing the manifest (or a lost manifest) leaves
+        # unlisted segments; adopt them, preferring the raw file when both forms exist
+        names = sorted(os.listdir(self.segment_dir), key=lambda n: n.endswith(".gz"))
+        for name in names:
+            m = _SEGMENT_RE.match(name)
+            if not m or m.group(1) in known:
+                continue
+            raw_file, first_seq, compressed = m.group(1), int(m.group(2)), bool(m.group(3))
+            path = os.path.join(self.segment_dir, name)
+            blocks: List[Tuple[int, int]] = []
+            last_seq, size, first_line, last_line = self._scan(path, first_seq - 1, 0, blocks, first_seq, compressed)
+            first = self._parse(first_line, first_seq) if first_line else None
+            last = self._parse(last_line, last_seq) if last_line else None
+            entry = self._segment_entry(raw_file, first_seq, last_seq, blocks, size,
+                                        first.get("timestamp") if first else None,
+                                        last.get("timestamp") if last else None)
+            if compressed:
+                # Member boundaries are unknown, so the whole segment is one block
+                entry.update({"compressed": True, "file": name, "blocks": [(first_seq, 0)], "bytes": os.path.getsize(path)})
+            self.segments.append(entry)
+            known.add(raw_file)
+        self.segments.sort(key=lambda e: e["first_seq"])
+        self._save_manifest()
+
+    def _segment_entry(self, raw_file: str, first_seq: int, last_seq: int, blocks: List[Tuple[int, int]],
+                       raw_bytes: int, first_ts: Optional[str], last_ts: Optional[str]) -> Dict[str, Any]:
+        return {
+            "file": raw_file,
+            "raw_file": raw_file,
+            "compressed": False,
+            "first_seq": first_seq,
+            "last_seq": last_seq,
+            "count": last_seq - first_seq + 1,
+            "first_ts": first_ts,
+            "last_ts": last_ts,
+            "raw_bytes": raw_bytes,
+            "bytes": raw_bytes,
+            "blocks": blocks,
+        }
+
+    def _save_manifest(self):
+        tmp = self.manifest_path + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump({"segments": self.segments}, f, indent=2)
+        os.replace(tmp, self.manifest_path)
+
+    def _write_index(self):
+        tmp = self.index_path + ".tmp"
+        with open(tmp, "w") as f:
+            for seq, offset in self.marks:
+                f.write(f"{seq} {offset}\n")
+        os.replace(tmp, self.index_path)
+
+    def _open_hot(self):
+        return open(self.path, "ab", buffering=BUFFER_BYTES if self.durability == "none" else 0)
+
+    # --- Segment rotation ---
+
+    def _should_seal(self, size: int) -> bool:
+        if size == 0:
+            return False
+        if size >= self.max_segment_bytes:
+            return True
+        return self.hot_started is not None and time.time() - self.hot_started >= self.max_segment_age_s
+
+    def _seal(self):
+        """Moves the hot file into event_segments/ and starts a fresh one. Caller holds write_lock."""
+        self.handle.flush()
+        if self.durability != "none":
+            os.fsync(self.handle.fileno())
+        self.handle.close()
+        first_seq = self.base + 1
+        raw_file = f"events.{first_seq:012d}.jsonl"
+        os.replace(self.path, os.path.join(self.segment_dir, raw_file))
+        with self.lock:
+            entry = self._segment_entry(raw_file, first_seq, self.written, list(self.marks), self.size,
+                                        self.hot_first_ts, self.written_last_ts)
+            self.segments.append(entry)
+            self._save_manifest()
+            self.base = self.visible = self.written
+            self.marks = [(self.written + 1, 0)]
+            self.size = self.visible_size = 0
+            self.hot_first_ts = None
+            self.hot_started = None
+            self.cond.notify_all()
+        self.handle = self._open_hot()
+        self._write_index()
+        self._start_compress(entry)
+
+    def _start_compress(self, entry: Dict[str, Any]):
+        t = threading.Thread(target=self._compress, args=(entry,), daemon=True)
+        self.compressors = [c for c in self.compressors if c.is_alive()] + [t]
+        t.start()
+
+    def _compress(self, entry: Dict[str, Any]):
+        raw_path = os.path.join(self.segment_dir, entry["raw_file"])
+        gz_file = entry["raw_file"] + ".gz"
+        gz_path = os.path.join(self.segment_dir, gz_file)
+        tmp = gz_path + ".tmp"
+        try:
+            blocks = []
+            bounds = [offset for _, offset in entry["blocks"]] + [entry["raw_bytes"]]
+            with open(raw_path, "rb") as src, open(tmp, "wb") as out:
+                # One gzip member per index block keeps every block independently seekable
+                for (seq, offset), end in zip(entry["blocks"], bounds[1:]):
+                    src.seek(offset)
+                    blocks.append((seq, out.tell()))
+                    out.write(gzip.compress(src.read(end - offset), compresslevel=6))
+                size = out.tell()
+            os.replace(tmp, gz_path)
+            with self.lock:
+                entry.update({"compressed": True, "file": gz_file, "blocks": blocks, "bytes": size})
+                self._save_manifest()
+            os.remove(raw_path)
+        except Exception as e:
+            print(f"Event segment compression failed for {entry['raw_file']}: {e}")
+            try:
+                os.remove(tmp)
+            except OSError:
+                pass
+
+    def join_compression(self, timeout: Optional[float] = None):
+        for t in list(self.compressors):
+            t.join(timeout)
+
+    # --- Writes ---
+
+    def append(self, event: Dict[str, Any]) -> Dict[str, Any]:
+        """Assigns the next seq and queues the event for the writer; returns immediately."""
+        with self.lock:
+            seq = self.count + 1
+            event["seq"] = seq
+            self.pending.append(event) # serialized by the writer, off the caller's path
+            self.count = seq
+            self.last_event = event
+            if len(self.pending) == 1 or len(self.pending) >= self.batch_events:
+                self.cond.notify_all() # readers wait on the same condition
+        return event
+
+    def add_listener(self, callback):
+        """callback(events) runs on the writer thread after each batch reaches the file."""
+        self.listeners.append(callback)
+
+    def _run_writer(self):
+        while True:
+            idle_flush = False
+            with self.cond:
+                while not self.pending and not self.closed:
+                    if self.visible < self.written:
+                        # Buffered lines ("none") reach the OS once the log goes quiet
+                        if not self.cond.wait(self.idle_flush_s) and not self.pending:
+                            idle_flush = True
+                            break
+                    else:
+                        self.cond.wait()
+                if not self.pending and not idle_flush:
+                    return
+                # Group commit window: let a burst accumulate unless the batch is already full
+                if not idle_flush and len(self.pending) < self.batch_events and not self.closed:
+                    self.cond.wait(self.flush_interval_s)
+            try:
+                if idle_flush:
+                    with self.write_lock:
+                        self._flush_buffer()
+                else:
+                    self._write_batch()
+            except Exception as e:
+                print(f"Event log write failed: {e}")
+                time.sleep(self.flush_interval_s)
+
+    def _write_chunk(self, chunk: List[bytes], new_marks: List[Tuple[int, int]], last_seq: int, last_ts: Optional[str]):
+        if not chunk:
+            return
+        data = b"".join(chunk)
+        self.handle.write(data) # unbuffered except under "none"
+        if self.durability == "fsync":
+            os.fsync(self.handle.fileno())
+        if new_marks:
+            with open(self.index_path, "a") as f:
+                f.write("".join(f"{seq} {offset}\n" for seq, offset in new_marks))
+        with self.lock:
+            self.size += len(data)
+            self.marks.extend(new_marks)
+            self.written = last_seq
+            self.written_last_ts = last_ts
+            if self.durability != "none":
+                self.visible, self.visible_size = self.written, self.size
+                self.cond.notify_all()
+
+    def _flush_buffer(self):
+        """Hands buffered lines to the OS. Caller holds write_lock."""
+        if self.handle.closed:
+            return
+        self.handle.flush()
+        with self.lock:
+            self.visible, self.visible_size = self.written, self.size
+            self.cond.notify_all()
+
+    def flush(self):
+        """Writes everything queued so far and hands it to the OS, on the caller's thread."""
+        self._write_batch()
+        with self.write_lock:
+            self._flush_buffer()
+
+    def _write_batch(self):
+        """Writes everything queued so far as one batch (split only where a segment is sealed)."""
+        with self.write_lock:
+            with self.lock:
+                batch, self.pending = self.pending, []
+            if not batch or self.handle.closed:
+                return
+            size = self.size
+            chunk: List[bytes] = []
+            new_marks: List[Tuple[int, int]] = []
+            last_seq, last_ts = self.written, self.written_last_ts
+            for event in batch:
+                data = (json.dumps(event) + "\n").encode("utf-8")
+                if self._should_seal(size):
+                    self._write_chunk(chunk, new_marks, last_seq, last_ts)
+                    chunk, new_marks = [], []
+                    self._seal()
+                    size = 0
+                if size == 0:
+                    self.hot_first_ts = event.get("timestamp")
+                    self.hot_started = time.time()
+                seq = event["seq"]
+                if (seq - self.base - 1) % self.index_every == 0 and seq > (new_marks or self.marks)[-1][0]:
+                    new_marks.append((seq, size))
+                chunk.append(data)
+                size += len(data)
+                last_seq, last_ts = seq, event.get("timestamp")
+            self._write_chunk(chunk, new_marks, last_seq, last_ts)
+            self.batches += 1
+            for callback in self.listeners:
+                try:
+                    callback(batch)
+                except Exception as e:
+                    print(f"Event log listener failed: {e}")
+            with self.lock:
+                self.delivered = last_seq
+                self.cond.notify_all()
+
+    def wait_delivered(self, timeout: Optional[float] = None) -> bool:
+        """Blocks until listeners have seen every event appended before the call (or timeout)."""
+        with self.cond:
+            target = self.count
+            return self.cond.wait_for(lambda: self.delivered >= target or self.closed,
+                                      self.read_wait_s if timeout is None else timeout)
+
+    def close(self):
+        with self.cond:
+            if self.closed:
+                return
+            self.closed = True
+            self.cond.notify_all()
+        self.writer.join(timeout=5)
+        self.flush()
+        with self.write_lock:
+            if not self.handle.closed:
+                if self.durability != "none":
+                    os.fsync(self.handle.fileno())
+                self.handle.close()
+
+    # --- Reads ---
+
+    def _parse(self, line: bytes, seq: int) -> Optional[Dict[str, Any]]:
+        try:
+            event = json.loads(line)
+        except ValueError:
+            return None
+        if not isinstance(event, dict):
+            return None
+        event.setdefault("seq", seq)
+        return event
+
+    def _tail_lines(self, limit: int, size: int) -> List[bytes]:
+        """The last limit lines of the hot file before byte size, read backwards in chunks."""
+        buf = b""
+        pos = size
+        with open(self.path, "rb") as f:
+            # limit + 1 newlines guarantee limit complete lines (size always ends on a newline)
+            while pos > 0 and buf.count(b"\n") <= limit:
+                step = min(READ_CHUNK, pos)
+                pos -= step
+                f.seek(pos)
+                buf = f.read(step) + buf
+        lines = buf.split(b"\n")[:-1]
+        if pos > 0:
+            lines = lines[1:] # first piece may be a partial line
+        return lines[-limit:]
+
+    def _read_file(self, path: str, compressed: bool, marks: List[Tuple[int, int]], start: int, end: int) -> List[Dict[str, Any]]:
+        i = bisect.bisect_right(marks, (start, float("inf"))) - 1
+        seq, offset = marks[max(i, 0)]
+        events = []
+        with open(path, "rb") as f:
+            f.seek(offset)
+            stream = gzip.GzipFile(fileobj=f) if compressed else f
+            while seq < end:
+                line = stream.readline()
+                if not line: break
+                if seq >= start and line.strip():
+                    event = self._parse(line, seq)
+                    if event is not None:
+                        events.append(event)
+                seq += 1
+        return events
+
+    def _read_range(self, start: int, end: int, segments: List[Dict[str, Any]], hot_marks: List[Tuple[int, int]]) -> List[Dict[str, Any]]:
+        """Events with start <= seq < end across sealed segments and the hot file, oldest first."""
+        events = []
+        if start >= end:
+            return events
+        for entry in segments:
+            if entry["last_seq"] < start or entry["first_seq"] >= end:
+                continue
+            path = os.path.join(self.segment_dir, entry["file"])
+            events.extend(self._read_file(path, entry["compressed"], entry["blocks"], start, end))
+        if hot_marks and end > hot_marks[0][0]:
+            events.extend(self._read_file(self.path, False, hot_marks, start, end))
+        return events
+
+    def _snapshot(self, wait: bool = True):
+        with self.cond:
+            if wait and self.durability != "none":
+                # Read-your-writes without writing here: the writer catches up within a flush interval
+                target = self.count
+                self.cond.wait_for(lambda: self.visible >= target or self.closed, self.read_wait_s)
+            return self.visible, self.visible_size, self.base, [dict(e) for e in self.segments], list(self.marks)
+
+    def read(self, limit: int = 50, before: Optional[int] = None, after: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Up to limit events, oldest first: the newest ones by default, those with seq < before,
+        or those with seq > after.
+        """
+        # Reads run without write_lock, so the writer may seal the hot file (os.replace) after the
+        # snapshot: the path then names a fresh file the snapshot's offsets don't describe. base
+        # moves on every seal, so a read whose base is stale is discarded and retried.
+        for _ in range(3):
+            try:
+                events, base = self._read(limit, before, after)
+            except FileNotFoundError:
+                continue # a segment finished compressing and its raw file was removed mid-read
+            with self.lock:
+                if self.base == base:
+                    return events
+        # Still racing rotation: read with the writer paused (compression can still swap files)
+        with self.write_lock:
+            try:
+                return self._read(limit, before, after, wait=False)[0]
+            except FileNotFoundError:
+                return self._read(limit, before, after, wait=False)[0]
+
+    def _read(self, limit: int, before: Optional[int], after: Optional[int],
+              wait: bool = True) -> Tuple[List[Dict[str, Any]], int]:
+        count, size, base, segments, hot_marks = self._snapshot(wait)
+        return self._read_snapshot(limit, before, after, count, size, base, segments, hot_marks), base
+
+    def _read_snapshot(self, limit: int, before: Optional[int], after: Optional[int], count: int, size: int,
+                       base: int, segments: List[Dict[str, Any]], hot_marks: List[Tuple[int, int]]) -> List[Dict[str, Any]]:
+        if limit <= 0 or count == 0:
+            return []
+        if after is not None:
+            start = max(after + 1, 1)
+            return self._read_range(start, min(start + limit, count + 1), segments, hot_marks)
+        if before is not None:
+            end = min(before, count + 1)
+            return self._read_range(max(1, end - limit), end, segments, hot_marks)
+
+        start = max(1, count - limit + 1)
+        if start <= base:
+            return self._read_range(start, count + 1, segments, hot_marks)
+
+        lines = self._tail_lines(limit, size)
+        events = []
+        seq = count - len(lines) + 1
+        for line in lines:
+            event = self._parse(line, seq) if line.strip() else None
+            if event is not None:
+                events.append(event)
+            seq += 1
+        return events
+
+    def stats(self) -> Dict[str, Any]:
+        with self.lock:
+            return {
+                "events": self.count,
+                "written": self.written,
+                "visible": self.visible,
+                "pending": len(self.pending),
+                "batches": self.batches,
+                "durability": self.durability,
+                "hot_events": self.written - self.base,
+                "hot_bytes": self.size,
+                "index_entries": len(self.marks),
+                "index_every": self.index_every,
+                "segments": len(self.segments),
+                "cold_bytes": sum(e["bytes"] for e in self.segments),
+                "cold_raw_bytes": sum(e["raw_bytes"] for e in self.segments),
+            }
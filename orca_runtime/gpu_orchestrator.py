@@ -3,8 +3,11 @@ import logging
 import asyncio
 import httpx
 import time
-from enum import Enum
-from typing import Dict, Any, Optional, List
+import itertools
+from collections import deque
+from contextlib import asynccontextmanager
+from enum import Enum, IntEnum
+from typing import Dict, Any, Optional, List, AsyncIterator, Callable
 
 # Try to import pynvml for real telemetry
 try:
@@ -33,8 +36,143 @@ class ModelType(str, Enum):
     TTS = "TTS"
     FSPU = "FSPU"
 
+class Priority(IntEnum):
+    # Lower value is served first
+    INTERACTIVE = 0 # chat
+    TTS = 1
+    BATCH = 2       # IFC extraction, sweeps
+
+# Concurrent GPU jobs allowed per tier: overall and per model type.
+# LOW never overlaps an LLM and a TTS job, which is what thrashes 8 GB cards.
+# MID runs two requests against the loaded LLM (the provider batches them) next to one TTS job.
+TIER_LIMITS: Dict[GPUTier, Dict[str, int]] = {
+    GPUTier.LOW:  {"total": 1, ModelType.LLM.value: 1, ModelType.TTS.value: 1, ModelType.FSPU.value: 1},
+    GPUTier.MID:  {"total": 3, ModelType.LLM.value: 2, ModelType.TTS.value: 1, ModelType.FSPU.value: 1},
+    GPUTier.HIGH: {"total": 6, ModelType.LLM.value: 4, ModelType.TTS.value: 2, ModelType.FSPU.value: 2},
+}
+
+class _StreamError:
+    __slots__ = ("error",)
+
+    def __init__(self, error: Exception):
+        self.error = error
+
+class _Waiter:
+    __slots__ = ("priority", "seq", "model_type", "model_name", "future", "enqueued_at")
+
+    def __init__(self, priority: Priority, seq: int, model_type: ModelType, model_name: str, future: asyncio.Future):
+        self.priority = priority
+        self.seq = seq
+        self.model_type = model_type
+        self.model_name = model_name
+        self.future = future
+        self.enqueued_at = time.time()
+
+class GPUScheduler:
+    """
+    Admission control for GPU work. Requests queue per model type and are granted by
+    priority class, then model affinity (keep draining the loaded model before swapping),
+    then arrival order. max_affinity_streak bounds how long affinity can starve others.
+    """
+    def __init__(self, tier: GPUTier, max_affinity_streak: int = 8, wait_samples: int = 200):
+        self.limits: Dict[str, int] = dict(TIER_LIMITS[tier])
+        self.max_affinity_streak = max_affinity_streak
+        self.queues: Dict[str, List[_Waiter]] = {t.value: [] for t in ModelType}
+        self.running: Dict[str, int] = {t.value: 0 for t in ModelType}
+        self.running_total = 0
+        self.current_model: Optional[str] = None
+        self.affinity_streak = 0
+        self.swaps = 0
+        self.granted = 0
+        self.waits: Dict[str, deque] = {t.value: deque(maxlen=wait_samples) for t in ModelType}
+        self._seq = itertools.count()
+
+    def set_tier(self, tier: GPUTier):
+        self.limits = dict(TIER_LIMITS[tier])
+        self._dispatch()
+
+    def _eligible(self, model_type: str) -> bool:
+        return self.running_total < self.limits["total"] and self.running[model_type] < self.limits.get(model_type, 1)
+
+    def _rank(self, w: _Waiter):
+        same_model = w.model_name == self.current_model and self.affinity_streak < self.max_affinity_streak
+        return (w.priority, 0 if same_model else 1, w.seq)
+
+    def _dispatch(self):
+        while True:
+            best = None
+            for model_type, queue in self.queues.items():
+                if not queue or not self._eligible(model_type):
+                    continue
+                cand = min(queue, key=self._rank)
+                if best is None or self._rank(cand) < self._rank(best):
+                    best = cand
+            if best is None:
+                return
+            self.queues[best.model_type.value].remove(best)
+            self._grant(best)
+
+    def _grant(self, w: _Waiter):
+        self.running[w.model_type.value] += 1
+        self.running_total += 1
+        self.granted += 1
+        if w.model_name == self.current_model:
+            self.affinity_streak += 1
+        else:
+            if self.current_model is not None:
+                self.swaps += 1
+            self.current_model = w.model_name
+            self.affinity_streak = 0
+        self.waits[w.model_type.value].append((time.time() - w.enqueued_at) * 1000)
+        w.future.set_result(True)
+
+    def _release(self, model_type: ModelType):
+        self.running[model_type.value] -= 1
+        self.running_total -= 1
+        self._dispatch()
+
+    @asynccontextmanager
+    async def slot(self, model_type: ModelType, model_name: str, priority: Priority = Priority.INTERACTIVE):
+        w = _Waiter(priority, next(self._seq), model_type, model_name, asyncio.get_running_loop().create_future())
+        self.queues[model_type.value].append(w)
+        self._dispatch()
+        try:
+            await w.future
+        except asyncio.CancelledError:
+            if w in self.queues[model_type.value]:
+                self.queues[model_type.value].remove(w)
+            elif w.future.done() and not w.future.cancelled():
+                self._release(model_type) # granted just as we were cancelled
+            raise
+        try:
+            yield
+        finally:
+            self._release(model_type)
+
+    def stats(self) -> Dict[str, Any]:
+        wait_ms = {}
+        for model_type, samples in self.waits.items():
+            ordered = sorted(samples)
+            wait_ms[model_type] = {
+                "avg": round(sum(ordered) / len(ordered), 1) if ordered else 0.0,
+                "p95": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))], 1) if ordered else 0.0,
+                "max": round(ordered[-1], 1) if ordered else 0.0
+            }
+        now = time.time()
+        return {
+            "limits": self.limits,
+            "running": dict(self.running),
+            "queue_depth": {t: len(q) for t, q in self.queues.items()},
+            "oldest_wait_ms": {t: round((now - min(w.enqueued_at for w in q)) * 1000, 1) if q else 0.0 for t, q in self.queues.items()},
+            "wait_ms": wait_ms,
+            "current_model": self.current_model,
+            "swaps": self.swaps,
+            "granted": self.granted
+        }
+
 class GPUOrchestrator:
-    def __init__(self, ollama_url: str = OLLAMA_BASE_URL, orpheus_url: str = ORPHEUS_BASE_URL):
+    def __init__(self, ollama_url: str = OLLAMA_BASE_URL, orpheus_url: str = ORPHEUS_BASE_URL,
+                 fallback_tier: str = GPUTier.MID.value):
         self.logger = logging.getLogger("GPUOrchestrator")
         # Setup logging if not configured
         if not self.logger.handlers:
@@ -47,11 +185,19 @@ class GPUOrchestrator:
         self.device_index = 0
         self.tier = GPUTier.LOW
         self.total_memory_mb = 0
+        # Tier assumed when VRAM cannot be read (no NVML: CPU-only hosts, many laptops). Not LOW, which
+        # would serialize every LLM and TTS call in the process to protect a GPU that may not exist.
+        try:
+            self.fallback_tier = GPUTier(str(fallback_tier).upper())
+        except ValueError:
+            self.logger.warning(f"Unknown fallback GPU tier {fallback_tier!r}; using MID")
+            self.fallback_tier = GPUTier.MID
         
         # Telemetry State
         self.last_update = 0
         self.cached_status = {}
 
+        self.scheduler = GPUScheduler(self.tier)
         self._init_gpu()
 
     def _init_gpu(self):
@@ -64,10 +210,10 @@ class GPUOrchestrator:
                 self.logger.info(f"NVML Initialized. Total VRAM: {self.total_memory_mb} MB")
             except Exception as e:
                 self.logger.error(f"NVML Init Failed: {e}")
-                self.total_memory_mb = 8192 # Fallback
+                self.total_memory_mb = 0 # Unknown: fallback tier
         else:
-            self.logger.warning("pynvml not found. Assumed 8GB VRAM (LOW tier).")
-            self.total_memory_mb = 8192 # Fallback default
+            self.logger.warning(f"pynvml not found. VRAM unknown, assuming {self.fallback_tier.value} tier.")
+            self.total_memory_mb = 0
 
         self._determine_tier()
 
@@ -77,13 +223,16 @@ class GPUOrchestrator:
         # ORCA definitions: 
         # LOW (8GB), MID (16GB), HIGH (24-32GB)
         
-        if self.total_memory_mb <= 12500: # Covers 8GB, 10GB, 11GB, 12GB cards under "LOW/Entry" logic roughly
+        if self.total_memory_mb <= 0:
+            self.tier = self.fallback_tier
+        elif self.total_memory_mb <= 12500: # Covers 8GB, 10GB, 11GB, 12GB cards under "LOW/Entry" logic roughly
             self.tier = GPUTier.LOW
         elif self.total_memory_mb <= 20000: # Covers 16GB cards
             self.tier = GPUTier.MID
         else:
             self.tier = GPUTier.HIGH
         
+        self.scheduler.set_tier(self.tier)
         self.logger.info(f"GPU Tier set to: {self.tier.value} based on {self.total_memory_mb} MB")
 
     def get_status(self) -> Dict[str, Any]:
@@ -93,7 +242,7 @@ class GPUOrchestrator:
         now = time.time()
         # Rate limit hardware polling to 1s
         if now - self.last_update < 1.0 and self.cached_status:
-           return self.cached_status
+           return {**self.cached_status, "scheduler": self.scheduler.stats()}
 
         usage = {"used": 0, "free": 0, "percent": 0.0}
         gpu_name = "Unknown"
@@ -125,6 +274,7 @@ class GPUOrchestrator:
             "usage": usage,
             "ram": ram,
             "active_models": self.models_active,
+            "scheduler": self.scheduler.stats(),
             "timestamp": now
         }
         self.cached_status = status
@@ -212,6 +362,53 @@ class GPUOrchestrator:
         
         return directives
 
+    def slot(self, model_type: ModelType, model_name: str, priority: Priority = Priority.INTERACTIVE):
+        """Async context manager that holds a GPU slot for the duration of an upstream call."""
+        return self.scheduler.slot(model_type, model_name, priority)
+
+    async def run(self, model_type: ModelType, model_name: str, priority: Priority, fn):
+        async with self.slot(model_type, model_name, priority):
+            return await fn()
+
+    async def stream(self, model_type: ModelType, model_name: str, priority: Priority,
+                     open_stream: Callable[[], AsyncIterator[Any]]) -> AsyncIterator[Any]:
+        """
+        Yields open_stream()'s items, holding a slot only while the upstream generates: a pump task
+        drains the upstream into a buffer and releases the slot when it finishes, so a slow WS/SSE
+        reader cannot hold up other GPU work. The cost is buffering the rest of a response the client
+        has not read yet. Closing this generator early cancels the pump and the upstream stream.
+        """
+        buffer: asyncio.Queue = asyncio.Queue()
+        end = object()
+
+        async def pump():
+            try:
+                async with self.slot(model_type, model_name, priority):
+                    items = open_stream()
+                    try:
+                        async for item in items:
+                            buffer.put_nowait(item)
+                    finally:
+                        await items.aclose()
+            except Exception as e:
+                buffer.put_nowait(_StreamError(e))
+            else:
+                buffer.put_nowait(end)
+
+        task = asyncio.ensure_future(pump())
+        try:
+            while True:
+                item = await buffer.get()
+                if item is end:
+                    return
+                if isinstance(item, _StreamError):
+                    raise item.error
+                yield item
+        finally:
+            if not task.done():
+                task.cancel()
+                await asyncio.gather(task, return_exceptions=True)
+
     async def _unload_ollama_all(self):
         """Unload all Ollama models."""
         # Simple hack: load a non-existent model or send keep_alive=0 to running ones?
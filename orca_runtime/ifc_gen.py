@@ -2,6 +2,92 @@ import ifcopenshell
 import ifcopenshell.api
 import time
 import json
+import hashlib
+import asyncio
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Optional, Tuple
+
+# Dedicated worker processes: ifcopenshell.api is CPU-bound Python and would otherwise hold
+# the GIL against the event loop. Results are cached on the normalized spec.
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_workers = 2
+_cache: "OrderedDict[str, str]" = OrderedDict()
+CACHE_MAX_ENTRIES = 64
+cache_stats = {"hits": 0, "misses": 0, "inline_fallbacks": 0}
+
+def _warm_worker():
+    # Pay the schema load once per worker instead of on the first request
+    ifcopenshell.file(schema="IFC4")
+
+def _ping() -> bool:
+    return True
+
+def start_pool(workers: int = 2):
+    global _pool, _pool_workers
+    _pool_workers = max(1, workers)
+    if _pool is None:
+        _pool = ProcessPoolExecutor(max_workers=_pool_workers, initializer=_warm_worker)
+        for _ in range(_pool_workers):
+            _pool.submit(_ping)
+
+def shutdown_pool():
+    global _pool
+    if _pool is not None:
+        _pool.shutdown(wait=False, cancel_futures=True)
+        _pool = None
+
+def normalize_spec(json_spec):
+    """Canonical form of an extracted spec: sorted keys, trimmed strings, no timestamp fields."""
+    if isinstance(json_spec, dict):
+        return {k: normalize_spec(v) for k, v in sorted(json_spec.items()) if k.lower() not in ("timestamp", "ts")}
+    if isinstance(json_spec, list):
+        return [normalize_spec(v) for v in json_spec]
+    if isinstance(json_spec, str):
+        return json_spec.strip()
+    return json_spec
+
+def spec_key(text_description: str, json_spec: dict) -> str:
+    # The (truncated) source text is written into the ORCA_Manifest, so it is part of the key
+    ident = {"spec": normalize_spec(json_spec), "source": _safe_text(text_description)}
+    return hashlib.sha256(json.dumps(ident, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+async def generate_ifc_cached(text_description: str, json_spec: dict) -> Tuple[str, bool]:
+    """
+    Returns (ifc_string, cache_hit). Misses run generate_ifc_content in the worker pool, or inline
+    on a thread if the pool is broken so the request still succeeds.
+    """
+    global _pool
+    key = spec_key(text_description, json_spec)
+    if key in _cache:
+        _cache.move_to_end(key)
+        cache_stats["hits"] += 1
+        return _cache[key], True
+    cache_stats["misses"] += 1
+
+    if _pool is None:
+        start_pool(_pool_workers)
+    loop = asyncio.get_running_loop()
+    try:
+        ifc_str = await loop.run_in_executor(_pool, generate_ifc_content, text_description, json_spec)
+    except BrokenProcessPool:
+        # A worker died (e.g. native crash); rebuild the pool for the next request
+        shutdown_pool()
+        cache_stats["inline_fallbacks"] += 1
+        ifc_str = await asyncio.to_thread(generate_ifc_content, text_description, json_spec)
+
+    _cache[key] = ifc_str
+    while len(_cache) > CACHE_MAX_ENTRIES:
+        _cache.popitem(last=False)
+    return ifc_str, False
+
+def get_cache_stats() -> dict:
+    return {**cache_stats, "entries": len(_cache), "max_entries": CACHE_MAX_ENTRIES, "workers": _pool_workers if _pool else 0}
+
+def _safe_text(text_description: str) -> str:
+    # Truncate text to avoid 255 char limit issues in some IFC viewers if property is simple string
+    return (text_description[:250] + '...') if len(text_description) > 250 else text_description
 
 def generate_ifc_content(text_description: str, json_spec: dict) -> str:
 
@@ -57,8 +143,7 @@ def generate_ifc_content(text_description: str, json_spec: dict) -> str:
     manifest = ifcopenshell.api.run("pset.add_pset", model, product=project, name="ORCA_Manifest")
     
     # Prepare manifest props
-    # Truncate text to avoid 255 char limit issues in some IFC viewers if property is simple string
-    safe_text = (text_description[:250] + '...') if len(text_description) > 250 else text_description
+    safe_text = _safe_text(text_description)
     
     props = {
         "SourceText": safe_text,
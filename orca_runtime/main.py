@@ -1,11 +1,19 @@
 import asyncio
 import os
+import time
+import threading
+import struct
+import hashlib
+import copy
+from collections import OrderedDict, deque
+from datetime import datetime
 import uvicorn
 import httpx
-from typing import Dict, List, Optional, Any
-from fastapi import FastAPI, HTTPException, Body, UploadFile, File
-from fastapi.responses import Response, JSONResponse
+from typing import Dict, List, Optional, Any, AsyncIterator, Tuple
+from fastapi import FastAPI, HTTPException, Body, Query, Request
+from fastapi.responses import Response, JSONResponse, StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
+from starlette.background import BackgroundTask
 from pydantic import BaseModel
 
 app = FastAPI(title="ORCA Runtime", version="M1")
@@ -20,28 +28,154 @@ app.add_middleware(
 
 import orca_runtime.ifc_gen as ifc_gen
 import json
-from orca_runtime.gpu_orchestrator import GPUOrchestrator, ModelType
-from orca_runtime.providers import ProviderRegistry
+from orca_runtime.gpu_orchestrator import GPUOrchestrator, ModelType, Priority
+from orca_runtime.providers import ProviderRegistry, HealthMonitor, pools
+from orca_runtime.tts_cache import TTSCache, cache_key
 from fastapi import WebSocket, WebSocketDisconnect
 
 registry = ProviderRegistry()
 
+# Process-wide services are built on first use (and eagerly in the startup hook), never at import:
+# spawned worker processes (IFC generation, inbox derivation) re-import this module as __mp_main__,
+# and must not open a second Director, wipe the inbox or start GPU/health machinery of their own.
+_services: Dict[str, Any] = {}
+_services_lock = threading.Lock()
+
+def _service(name: str, build):
+    svc = _services.get(name)
+    if svc is None:
+        with _services_lock:
+            svc = _services.get(name)
+            if svc is None:
+                svc = _services[name] = build()
+    return svc
+
+_SNAPSHOT = object() # queue marker: send a coalesced state snapshot instead of the dropped events
+
+class _Subscriber:
+    def __init__(self, websocket: WebSocket, max_queue: int):
+        self.websocket = websocket
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=max_queue)
+        self.writer: Optional[asyncio.Task] = None
+        self.dropped = 0
+        self.degrades = 0 # consecutive overflows without catching up
+
 class ConnectionManager:
-    def __init__(self):
-        self.active_connections: List[WebSocket] = []
+    """
+    Director WebSocket fan-out. Each subscriber has a bounded queue drained by its own writer
+    task, so one slow client cannot stall the others. On overflow a client's backlog is replaced
+    by a single snapshot; clients that keep overflowing (or stall a send) are disconnected.
+    """
+    def __init__(self, max_queue: int = 256, max_degrades: int = 3, send_timeout: float = 5.0):
+        self.max_queue = max_queue
+        self.max_degrades = max_degrades
+        self.send_timeout = send_timeout
+        self.subscribers: Dict[WebSocket, _Subscriber] = {}
+        self.snapshot_fn = None
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self.latencies: deque = deque(maxlen=500)
+        self.counters = {"published": 0, "sent": 0, "dropped": 0, "snapshots": 0, "slow_disconnects": 0}
+
+    @property
+    def active_connections(self) -> List[WebSocket]:
+        return list(self.subscribers)
 
     async def connect(self, websocket: WebSocket):
         await websocket.accept()
-        self.active_connections.append(websocket)
+        self.loop = asyncio.get_running_loop()
+        sub = _Subscriber(websocket, self.max_queue)
+        sub.writer = asyncio.create_task(self._writer(sub))
+        self.subscribers[websocket] = sub
 
     def disconnect(self, websocket: WebSocket):
-        self.active_connections.remove(websocket)
+        sub = self.subscribers.pop(websocket, None)
+        if sub and sub.writer and not sub.writer.done():
+            sub.writer.cancel()
 
-    async def broadcast(self, message: str):
-        for connection in self.active_connections:
+    async def _snapshot_message(self) -> str:
+        # snapshot_fn reads the director state/log; keep that blocking I/O off the event loop
+        snap = await asyncio.to_thread(self.snapshot_fn) if self.snapshot_fn else {}
+        return json.dumps({"type": "director.snapshot", "snapshot": snap})
+
+    async def _writer(self, sub: _Subscriber):
+        try:
+            while True:
+                item = await sub.queue.get()
+                if item is _SNAPSHOT:
+                    message, enqueued_at = await self._snapshot_message(), None
+                else:
+                    enqueued_at, message = item
+                await asyncio.wait_for(sub.websocket.send_text(message), timeout=self.send_timeout)
+                self.counters["sent"] += 1
+                if enqueued_at is not None:
+                    self.latencies.append((time.perf_counter() - enqueued_at) * 1000)
+                if sub.queue.empty():
+                    sub.degrades = 0
+        except asyncio.CancelledError:
+            pass
+        except Exception:
+            # Send failed or timed out: treat as a dead/slow client
+            if self.subscribers.get(sub.websocket) is sub:
+                self.counters["slow_disconnects"] += 1
+            self.disconnect(sub.websocket)
+
+    def _degrade(self, sub: _Subscriber):
+        sub.degrades += 1
+        if sub.degrades > self.max_degrades:
+            self.counters["slow_disconnects"] += 1
+            self.disconnect(sub.websocket)
+            asyncio.ensure_future(self._close_quietly(sub.websocket))
+            return
+        while not sub.queue.empty():
+            if sub.queue.get_nowait() is not _SNAPSHOT:
+                sub.dropped += 1
+                self.counters["dropped"] += 1
+        sub.queue.put_nowait(_SNAPSHOT)
+        self.counters["snapshots"] += 1
+
+    async def _close_quietly(self, websocket: WebSocket):
+        try:
+            await websocket.close(code=1013) # try again later
+        except Exception:
+            pass
+
+    def _fanout(self, message: str, enqueued_at: float):
+        self.counters["published"] += 1
+        for sub in list(self.subscribers.values()):
             try:
-                await connection.send_text(message)
-            except: pass
+                sub.queue.put_nowait((enqueued_at, message))
+            except asyncio.QueueFull:
+                self._degrade(sub)
+
+    def publish(self, message: str):
+        """Non-blocking; safe to call from the event loop or from worker threads."""
+        if self.loop is None or not self.subscribers:
+            return
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is self.loop:
+            self._fanout(message, time.perf_counter())
+        else:
+            self.loop.call_soon_threadsafe(self._fanout, message, time.perf_counter())
+
+    async def broadcast(self, message: str):
+        self.publish(message)
+
+    def stats(self) -> Dict[str, Any]:
+        ordered = sorted(self.latencies)
+        depths = [sub.queue.qsize() for sub in self.subscribers.values()]
+        return {
+            **self.counters,
+            "subscribers": len(self.subscribers),
+            "queue_depth": {"max": max(depths) if depths else 0, "total": sum(depths), "limit": self.max_queue},
+            "fanout_latency_ms": {
+                "avg": round(sum(ordered) / len(ordered), 2) if ordered else 0.0,
+                "p95": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))], 2) if ordered else 0.0,
+                "max": round(ordered[-1], 2) if ordered else 0.0
+            }
+        }
 
 manager = ConnectionManager()
 
@@ -58,6 +192,17 @@ class Config(BaseModel):
     llm_model: str = "llama3:latest" # Added for sticky settings
     tts_provider: str = "lm_studio"   # Ecosystem provider host for TTS model selection
     tts_model: str = "default" # Model for TTS (if applicable)
+    pools: Dict[str, Dict[str, Any]] = {} # Per-upstream HTTP pool overrides (applied at startup)
+    tts_cache_mb: int = 512      # On-disk TTS audio cache bound (applied at startup)
+    tts_cache_hot_mb: int = 32   # In-memory hot tier for repeated lines
+    health_interval_s: float = 5.0 # Background provider probe interval
+    ifc_workers: int = 2         # Warm IFC generation worker processes (applied at startup)
+    batch_concurrency: Dict[str, int] = {"ollama": 4, "lm_studio": 4} # Max concurrent batch chat calls per provider
+    event_durability: str = "flush" # Director event log: none, flush (fsync on rotate/close) or fsync (every batch)
+    gpu_fallback_tier: str = "MID" # GPU tier assumed when VRAM cannot be read (no NVML); applied at startup
+    inbox_workers: int = 2       # Preview/OCR worker processes for inbox uploads (applied at startup)
+    inbox_queue_max: int = 32    # Uploads waiting on derivation before new ones get 503
+    inbox_max_upload_mb: int = 256 # Larger inbox uploads are rejected with 413
 
 def load_config():
     if os.path.exists(CONFIG_FILE):
@@ -77,7 +222,41 @@ def save_config(cfg: Config):
         json.dump(cfg.dict(), f, indent=2)
 
 runtime_config = load_config()
-gpu_mgr = GPUOrchestrator()
+
+def get_gpu_mgr() -> GPUOrchestrator:
+    return _service("gpu_mgr", lambda: GPUOrchestrator(fallback_tier=runtime_config.gpu_fallback_tier))
+
+def get_tts_cache() -> TTSCache:
+    return _service("tts_cache", lambda: TTSCache(
+        os.path.join(os.getcwd(), "runtime", "tts_cache"),
+        max_bytes=runtime_config.tts_cache_mb * 1024**2,
+        hot_max_bytes=runtime_config.tts_cache_hot_mb * 1024**2,
+    ))
+
+def get_health_monitor() -> HealthMonitor:
+    return _service("health_monitor", lambda: HealthMonitor(registry, interval=runtime_config.health_interval_s))
+
+@app.on_event("startup")
+async def start_pools():
+    # Build the services up front so the first request does not pay for them
+    get_gpu_mgr()
+    get_tts_cache()
+    get_persona_runtime()
+    get_director()
+    # One keep-alive client per upstream instead of a fresh AsyncClient per call
+    pools.configure(runtime_config.pools)
+    await pools.start()
+    get_health_monitor().start()
+    ifc_gen.start_pool(runtime_config.ifc_workers)
+
+@app.on_event("shutdown")
+async def stop_pools():
+    await get_health_monitor().stop()
+    await pools.aclose()
+    ifc_gen.shutdown_pool()
+    director = _services.get("director")
+    if director is not None:
+        director.close()
 
 # --- Adapters ---
 
@@ -89,9 +268,83 @@ LM_STUDIO_BASE_URL = "http://127.0.0.1:1234/v1"
 ORPHEUS_URL = "http://127.0.0.1:5005/v1/audio/speech"
 ORPHEUS_VOICES_URL = "http://127.0.0.1:5005/voices"
 ORPHEUS_HEALTH_URL = "http://127.0.0.1:5005/health"
+ORPHEUS_SAMPLE_RATE = 24000 # Orpheus emits 24 kHz mono 16-bit PCM
+
+class SingleFlight:
+    """
+    Concurrent calls with the same key share one upstream call and all receive its result.
+    The shared call runs as its own task, so a caller disconnecting does not cancel it for the others.
+    """
+    def __init__(self):
+        self.inflight: Dict[str, asyncio.Future] = {}
+        self.counters = {"calls": 0, "upstream": 0, "coalesced": 0}
+
+    @staticmethod
+    def key(*parts: Any) -> str:
+        return hashlib.sha256(json.dumps(parts, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+    async def do(self, key: str, fn):
+        self.counters["calls"] += 1
+        task = self.inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(fn())
+            self.inflight[key] = task
+            task.add_done_callback(lambda _t, k=key: self.inflight.pop(k, None))
+            self.counters["upstream"] += 1
+        else:
+            self.counters["coalesced"] += 1
+        return await asyncio.shield(task)
+
+    def stats(self) -> Dict[str, Any]:
+        return {**self.counters, "in_flight": len(self.inflight)}
+
+llm_flights = SingleFlight()
+tts_flights = SingleFlight()
+
+def chat_provider_id() -> str:
+    # Anything that is not Ollama is served by the LM Studio adapter
+    return "ollama" if runtime_config.llm_provider == "ollama" else "lm_studio"
+
+def check_circuit(pid: str, label: str):
+    """Fail fast while the health monitor's breaker for pid is open."""
+    if not get_health_monitor().allow(pid):
+        raise HTTPException(status_code=503, detail=f"{label} Unavailable: circuit open")
+
+def record_upstream(pid: str, error: Optional[Exception] = None):
+    # Only connection/timeout failures count against the breaker, not HTTP status errors
+    if error is None:
+        get_health_monitor().record_result(pid, True)
+    elif isinstance(error, httpx.TransportError):
+        get_health_monitor().record_result(pid, False)
+
+FALLBACK_IFC_SPEC = {"project_name": "Fallback Project", "levels": [{"name": "Ground", "elevation": 0.0}]}
+LLM_JSON_CACHE_MAX = 256
+llm_json_cache: "OrderedDict[str, Dict]" = OrderedDict()
+llm_json_cache_stats = {"hits": 0, "misses": 0}
 
 async def call_llm_json(text: str):
+    key = SingleFlight.key("llm_json", chat_provider_id(), text)
+    # Extraction is deterministic enough per text to reuse; fallbacks are never cached
+    cached = llm_json_cache.get(key)
+    if cached is not None:
+        llm_json_cache.move_to_end(key)
+        llm_json_cache_stats["hits"] += 1
+        return copy.deepcopy(cached)
+    llm_json_cache_stats["misses"] += 1
+
+    spec = await llm_flights.do(key, lambda: get_gpu_mgr().run(ModelType.LLM, runtime_config.llm_model, Priority.BATCH, lambda: _call_llm_json(text)))
+    if spec != FALLBACK_IFC_SPEC:
+        llm_json_cache[key] = copy.deepcopy(spec)
+        while len(llm_json_cache) > LLM_JSON_CACHE_MAX:
+            llm_json_cache.popitem(last=False)
+    return spec
+
+async def _call_llm_json(text: str):
     provider = runtime_config.llm_provider
+    fallback = copy.deepcopy(FALLBACK_IFC_SPEC)
+    if not get_health_monitor().allow(chat_provider_id()):
+        print("LLM JSON skipped: circuit open")
+        return fallback
     
     # CASE A: OLLAMA (Native JSON mode)
     if provider == "ollama":
@@ -111,14 +364,15 @@ async def call_llm_json(text: str):
             "stream": False,
             "format": "json"
         }
-        async with httpx.AsyncClient(timeout=60.0) as client:
-            try:
-                r = await client.post(f"{OLLAMA_BASE_URL}/chat", json=payload)
-                r.raise_for_status()
-                content = r.json().get("message", {}).get("content", "{}")
-                return json.loads(content)
-            except Exception as e:
-                print(f"Ollama JSON fail: {e}")
+        try:
+            r = await pools.client("ollama").post(f"{OLLAMA_BASE_URL}/chat", json=payload)
+            r.raise_for_status()
+            record_upstream("ollama")
+            content = r.json().get("message", {}).get("content", "{}")
+            return json.loads(content)
+        except Exception as e:
+            record_upstream("ollama", e)
+            print(f"Ollama JSON fail: {e}")
                 
     # CASE B: LM STUDIO (OpenAI Mode)
     else:
@@ -131,24 +385,31 @@ async def call_llm_json(text: str):
             "messages": messages, 
             "temperature": 0.2
         }
-        async with httpx.AsyncClient(timeout=60.0) as client:
-            try:
-                r = await client.post(f"{LM_STUDIO_BASE_URL}/chat/completions", json=payload)
-                r.raise_for_status()
-                content = r.json().get("choices", [{}])[0].get("message", {}).get("content", "{}")
-                if "```json" in content: content = content.split("```json")[1].split("```")[0]
-                return json.loads(content)
-            except Exception as e:
-                print(f"LM Studio JSON fail: {e}")
-
-    return {"project_name": "Fallback Project", "levels": [{"name": "Ground", "elevation": 0.0}]}
-
-async def call_llm(messages: List[Dict], model: Optional[str] = None):
+        try:
+            r = await pools.client("lm_studio").post(f"{LM_STUDIO_BASE_URL}/chat/completions", json=payload)
+            r.raise_for_status()
+            record_upstream("lm_studio")
+            content = r.json().get("choices", [{}])[0].get("message", {}).get("content", "{}")
+            if "```json" in content: content = content.split("```json")[1].split("```")[0]
+            return json.loads(content)
+        except Exception as e:
+            record_upstream("lm_studio", e)
+            print(f"LM Studio JSON fail: {e}")
+
+    return fallback
+
+async def call_llm(messages: List[Dict], model: Optional[str] = None, priority: Priority = Priority.INTERACTIVE):
+    # Priority is part of the key: an interactive call must not wait behind a BATCH-priority flight
+    key = SingleFlight.key("chat", chat_provider_id(), model, priority, messages)
+    return await llm_flights.do(key, lambda: get_gpu_mgr().run(ModelType.LLM, model or runtime_config.llm_model, priority, lambda: _call_llm(messages, model)))
+
+async def _call_llm(messages: List[Dict], model: Optional[str] = None):
     provider = runtime_config.llm_provider
     model_name = model or "local-model"
     
     # CASE A: OLLAMA
     if provider == "ollama":
+         check_circuit("ollama", "Ollama")
          # Fallback for model name if "local-model" generic string was passed
          if model_name == "local-model": model_name = "llama3:latest"
          
@@ -158,30 +419,89 @@ async def call_llm(messages: List[Dict], model: Optional[str] = None):
             "stream": False,
             "keep_alive": "5m"
          }
-         async with httpx.AsyncClient(timeout=60.0) as client:
-            try:
-                r = await client.post(f"{OLLAMA_BASE_URL}/chat", json=payload)
-                r.raise_for_status()
-                return {"role": "assistant", "content": r.json().get("message", {}).get("content", "")}
-            except httpx.HTTPError as e:
-                raise HTTPException(status_code=503, detail=f"Ollama Unavailable: {e}")
+         try:
+            r = await pools.client("ollama").post(f"{OLLAMA_BASE_URL}/chat", json=payload)
+            r.raise_for_status()
+            record_upstream("ollama")
+            return {"role": "assistant", "content": r.json().get("message", {}).get("content", "")}
+         except httpx.HTTPError as e:
+            record_upstream("ollama", e)
+            raise HTTPException(status_code=503, detail=f"Ollama Unavailable: {e}")
 
     # CASE B: LM STUDIO
     else:
+        check_circuit("lm_studio", "LM Studio")
         payload = {
             "model": model_name,
             "messages": messages,
             "stream": False
         }
-        async with httpx.AsyncClient(timeout=60.0) as client:
-            try:
-                r = await client.post(f"{LM_STUDIO_BASE_URL}/chat/completions", json=payload)
+        try:
+            r = await pools.client("lm_studio").post(f"{LM_STUDIO_BASE_URL}/chat/completions", json=payload)
+            r.raise_for_status()
+            record_upstream("lm_studio")
+            return {"role": "assistant", "content": r.json().get("choices", [{}])[0].get("message", {}).get("content", "")}
+        except httpx.HTTPError as e:
+            record_upstream("lm_studio", e)
+            raise HTTPException(status_code=503, detail=f"LM Studio Unavailable: {e}")
+
+def stream_llm(messages: List[Dict], model: Optional[str] = None) -> AsyncIterator[str]:
+    """Yields content deltas as they arrive (Ollama NDJSON / LM Studio SSE); the GPU slot is held while the model generates."""
+    return get_gpu_mgr().stream(ModelType.LLM, model or runtime_config.llm_model, Priority.INTERACTIVE,
+                                lambda: _stream_llm(messages, model))
+
+async def _stream_llm(messages: List[Dict], model: Optional[str] = None) -> AsyncIterator[str]:
+    provider = runtime_config.llm_provider
+    model_name = model or "local-model"
+
+    # CASE A: OLLAMA (one JSON object per line)
+    if provider == "ollama":
+        check_circuit("ollama", "Ollama")
+        if model_name == "local-model": model_name = "llama3:latest"
+        payload = {
+            "model": model_name,
+            "messages": messages,
+            "stream": True,
+            "keep_alive": "5m"
+        }
+        try:
+            async with pools.client("ollama").stream("POST", f"{OLLAMA_BASE_URL}/chat", json=payload) as r:
                 r.raise_for_status()
-                return {"role": "assistant", "content": r.json().get("choices", [{}])[0].get("message", {}).get("content", "")}
-            except httpx.HTTPError as e:
-                raise HTTPException(status_code=503, detail=f"LM Studio Unavailable: {e}")
+                record_upstream("ollama")
+                async for line in r.aiter_lines():
+                    if not line.strip(): continue
+                    chunk = json.loads(line)
+                    delta = chunk.get("message", {}).get("content", "")
+                    if delta: yield delta
+                    if chunk.get("done"): break
+        except httpx.HTTPError as e:
+            record_upstream("ollama", e)
+            raise HTTPException(status_code=503, detail=f"Ollama Unavailable: {e}")
 
-async def call_orpheus_tts(text: str, voice: str, model: Optional[str] = None, response_format: str = "wav", speed: Optional[float] = None):
+    # CASE B: LM STUDIO (OpenAI-style "data: {...}" events)
+    else:
+        check_circuit("lm_studio", "LM Studio")
+        payload = {
+            "model": model_name,
+            "messages": messages,
+            "stream": True
+        }
+        try:
+            async with pools.client("lm_studio").stream("POST", f"{LM_STUDIO_BASE_URL}/chat/completions", json=payload) as r:
+                r.raise_for_status()
+                record_upstream("lm_studio")
+                async for line in r.aiter_lines():
+                    if not line.startswith("data:"): continue
+                    data = line[5:].strip()
+                    if data == "[DONE]": break
+                    choices = json.loads(data).get("choices") or [{}]
+                    delta = choices[0].get("delta", {}).get("content")
+                    if delta: yield delta
+        except httpx.HTTPError as e:
+            record_upstream("lm_studio", e)
+            raise HTTPException(status_code=503, detail=f"LM Studio Unavailable: {e}")
+
+def _orpheus_payload(text: str, voice: str, model: Optional[str], response_format: str, speed: Optional[float]) -> Dict:
     payload = {
         "input": text,
         "voice": voice,
@@ -195,57 +515,132 @@ async def call_orpheus_tts(text: str, voice: str, model: Optional[str] = None, r
 
     if speed is not None:
         payload["speed"] = speed
+    return payload
+
+async def call_orpheus_tts(text: str, voice: str, model: Optional[str] = None, response_format: str = "wav", speed: Optional[float] = None):
+    payload = _orpheus_payload(text, voice, model, response_format, speed)
+    key = SingleFlight.key("tts", "orpheus", payload)
+    tts_model = payload.get("model", "orpheus")
+    return await tts_flights.do(key, lambda: get_gpu_mgr().run(ModelType.TTS, tts_model, Priority.TTS, lambda: _call_orpheus_tts(payload, model)))
+
+async def _call_orpheus_tts(payload: Dict, model: Optional[str]):
+    check_circuit("orpheus", "Orpheus TTS")
+    try:
+        r = await pools.client("orpheus").post(ORPHEUS_URL, json=payload)
+        r.raise_for_status()
+        record_upstream("orpheus")
+        content = r.content # WAV bytes
         
-    async with httpx.AsyncClient(timeout=120.0) as client:
-        try:
-            r = await client.post(ORPHEUS_URL, json=payload)
-            r.raise_for_status()
-            content = r.content # WAV bytes
-            
-            # Guard: 44-byte check
-            if len(content) <= 44:
-                print(f"Orpheus returned empty audio ({len(content)} bytes). Model might be invalid: {model}")
+        # Guard: 44-byte check
+        if len(content) <= 44:
+            print(f"Orpheus returned empty audio ({len(content)} bytes). Model might be invalid: {model}")
+            raise HTTPException(status_code=502, detail="TTS Engine returned empty audio (invalid model?)")
+        
+        return content
+    except httpx.HTTPStatusError as e:
+        # Server responded with error
+        raise HTTPException(status_code=503, detail=f"Orpheus TTS Error: {e.response.status_code} {e.response.text}")
+    except httpx.HTTPError as e:
+        # Connection/Timeout error
+        record_upstream("orpheus", e)
+        raise HTTPException(status_code=503, detail=f"Orpheus TTS Unavailable: {repr(e)}")
+
+def _wav_stream_header(sample_rate: int = ORPHEUS_SAMPLE_RATE, channels: int = 1, bits: int = 16) -> bytes:
+    # RIFF and data sizes of 0xFFFFFFFF mean "unknown length" to streaming players
+    block_align = channels * bits // 8
+    fmt = struct.pack("<IHHIIHH", 16, 1, channels, sample_rate, sample_rate * block_align, block_align, bits)
+    return b"RIFF" + b"\xff\xff\xff\xff" + b"WAVE" + b"fmt " + fmt + b"data" + b"\xff\xff\xff\xff"
+
+def _wav_data_offset(head: bytes) -> Optional[int]:
+    """Offset of the first audio byte, 0 for headerless PCM, None if more bytes are needed."""
+    if len(head) < 12:
+        return None
+    if head[:4] != b"RIFF" or head[8:12] != b"WAVE":
+        return 0
+    pos = 12
+    while pos + 8 <= len(head):
+        chunk_id = head[pos:pos + 4]
+        size = int.from_bytes(head[pos + 4:pos + 8], "little")
+        if chunk_id == b"data":
+            return pos + 8
+        pos += 8 + size + (size & 1)
+    return None
+
+def _finalize_wav(data: bytes) -> bytes:
+    """Restore real RIFF/data sizes on a fully received streamed WAV."""
+    offset = _wav_data_offset(data)
+    if not offset or data[:4] != b"RIFF":
+        return data
+    buf = bytearray(data)
+    buf[4:8] = struct.pack("<I", min(len(buf) - 8, 0xFFFFFFFF))
+    buf[offset - 4:offset] = struct.pack("<I", min(len(buf) - offset, 0xFFFFFFFF))
+    return bytes(buf)
+
+def _streaming_wav_head(head: bytes, data_offset: int) -> bytes:
+    if data_offset == 0:
+        return _wav_stream_header() + head
+    buf = bytearray(head)
+    buf[4:8] = b"\xff\xff\xff\xff"
+    buf[data_offset - 4:data_offset] = b"\xff\xff\xff\xff"
+    return bytes(buf)
+
+def stream_orpheus_tts(text: str, voice: str, model: Optional[str] = None, response_format: str = "wav", speed: Optional[float] = None) -> AsyncIterator[bytes]:
+    """Yields WAV bytes as Orpheus renders them; the first chunk carries a streaming header."""
+    payload = _orpheus_payload(text, voice, model, response_format, speed)
+    return get_gpu_mgr().stream(ModelType.TTS, payload.get("model", "orpheus"), Priority.TTS,
+                                lambda: _stream_orpheus_tts(payload, model))
+
+async def _stream_orpheus_tts(payload: Dict, model: Optional[str]) -> AsyncIterator[bytes]:
+    check_circuit("orpheus", "Orpheus TTS")
+    try:
+        async with pools.client("orpheus").stream("POST", ORPHEUS_URL, json=payload) as r:
+            if r.status_code >= 400:
+                await r.aread()
+                raise HTTPException(status_code=503, detail=f"Orpheus TTS Error: {r.status_code} {r.text}")
+            record_upstream("orpheus")
+
+            # Guard: early-chunk check (header plus at least one sample byte) instead of buffering everything
+            chunks = r.aiter_bytes()
+            head = b""
+            offset = None
+            async for chunk in chunks:
+                head += chunk
+                offset = _wav_data_offset(head)
+                if offset is not None and len(head) > offset:
+                    break
+            if offset is None or len(head) <= offset:
+                print(f"Orpheus returned empty audio ({len(head)} bytes). Model might be invalid: {model}")
                 raise HTTPException(status_code=502, detail="TTS Engine returned empty audio (invalid model?)")
-            
-            return content
-        except httpx.HTTPStatusError as e:
-            # Server responded with error
-            raise HTTPException(status_code=503, detail=f"Orpheus TTS Error: {e.response.status_code} {e.response.text}")
-        except httpx.HTTPError as e:
-            # Connection/Timeout error
-            raise HTTPException(status_code=503, detail=f"Orpheus TTS Unavailable: {repr(e)}")
+
+            yield _streaming_wav_head(head, offset)
+            async for chunk in chunks:
+                yield chunk
+    except httpx.HTTPError as e:
+        record_upstream("orpheus", e)
+        raise HTTPException(status_code=503, detail=f"Orpheus TTS Unavailable: {repr(e)}")
 
 async def get_orpheus_voices():
-    async with httpx.AsyncClient(timeout=5.0) as client:
-        try:
-            r = await client.get(ORPHEUS_VOICES_URL)
-            if r.status_code == 200:
-                data = r.json()
-                return data.get("voices", [])
-        except: pass
+    try:
+        r = await pools.client("orpheus").get(ORPHEUS_VOICES_URL, timeout=5.0)
+        if r.status_code == 200:
+            data = r.json()
+            return data.get("voices", [])
+    except: pass
     return ["tara"] # Fallback
 
 # --- Endpoints ---
 
 @app.get("/runtime/status")
 async def get_status():
+    # Served from the background health monitor; no provider round-trips on the poll path
     # 1. Chat Provider Status
-    chat_prov = registry.get(runtime_config.llm_provider)
-    chat_status = {"ok": False, "detail": "unknown", "latency_ms": 0}
-    if chat_prov:
-        chat_status = await chat_prov.health()
+    chat_status = await get_health_monitor().get(runtime_config.llm_provider)
     
     # 2. TTS Host Provider Status (ecosystem model host)
-    tts_host_prov = registry.get(runtime_config.tts_provider)
-    tts_host_status = {"ok": False, "detail": "unknown", "latency_ms": 0}
-    if tts_host_prov:
-        tts_host_status = await tts_host_prov.health()
+    tts_host_status = await get_health_monitor().get(runtime_config.tts_provider)
 
     # 3. TTS Engine Status (Orpheus service)
-    tts_engine_prov = registry.get("orpheus")
-    tts_engine_status = {"ok": False, "detail": "unknown", "latency_ms": 0}
-    if tts_engine_prov:
-        tts_engine_status = await tts_engine_prov.health()
+    tts_engine_status = await get_health_monitor().get("orpheus")
 
     tts_ready = tts_host_status["ok"] and tts_engine_status["ok"]
     tts_detail = f"host={tts_host_status['detail']}, engine={tts_engine_status['detail']}"
@@ -268,13 +663,17 @@ async def get_status():
                 "latency_ms": max(tts_host_status["latency_ms"], tts_engine_status["latency_ms"])
             }
         },
-        "gpu": gpu_mgr.get_status()
+        "gpu": get_gpu_mgr().get_status()
     }
 
 @app.get("/runtime/providers")
 async def list_providers():
     return registry.list_all()
 
+@app.get("/runtime/providers/health")
+async def providers_health():
+    return get_health_monitor().snapshot()
+
 @app.get("/runtime/providers/{pid}/models")
 async def list_provider_models(pid: str):
     prov = registry.get(pid)
@@ -288,15 +687,24 @@ async def check_provider_health(pid: str):
     prov = registry.get(pid)
     if not prov:
         raise HTTPException(status_code=404, detail="Provider not found")
-    return await prov.health()
+    # Explicit check: probe live and feed the monitor
+    return await get_health_monitor().probe(pid)
+
+@app.get("/runtime/pools")
+async def get_pool_stats():
+    return pools.stats()
+
+@app.get("/runtime/coalescing")
+async def get_coalescing_stats():
+    return {"llm": llm_flights.stats(), "tts": tts_flights.stats()}
 
 @app.get("/runtime/gpu/status")
 async def get_gpu_status():
-    return gpu_mgr.get_status()
+    return get_gpu_mgr().get_status()
 
 @app.get("/runtime/device/advise")
 async def advise_device(model: str, provider: str):
-    return gpu_mgr.advise_device(model, provider)
+    return get_gpu_mgr().advise_device(model, provider)
 
 @app.get("/runtime/settings")
 async def get_settings():
@@ -317,13 +725,14 @@ class ChatInput(BaseModel):
 async def chat(
     req: ChatInput
 ):
-    messages = req.messages
-    model = req.model
+    return await run_chat(req.messages, req.model)
+
+async def run_chat(messages: List[Dict], model: Optional[str], priority: Priority = Priority.INTERACTIVE):
     mode = runtime_config.chat_mode
     if mode == "offline" or mode == "hybrid":
         # Try local first
         try:
-            return await call_llm(messages, model)
+            return await call_llm(messages, model, priority)
         except HTTPException as e:
             if mode == "hybrid":
                 # Fallback to cloud
@@ -335,32 +744,258 @@ async def chat(
         
     raise HTTPException(status_code=400, detail="Invalid Chat Mode")
 
+class ChatBatchInput(BaseModel):
+    items: List[List[Dict]]  # one message list per completion
+    model: Optional[str] = None
+    concurrency: Optional[int] = None # per-request cap, never above the provider's batch_concurrency
+
+batch_semaphores: Dict[str, Tuple[int, asyncio.Semaphore]] = {} # pid -> (limit it was built with, semaphore)
+
+def batch_semaphore(pid: str) -> asyncio.Semaphore:
+    # Shared across batch requests so two sweeps cannot double the load on one provider
+    limit = max(1, runtime_config.batch_concurrency.get(pid, 4))
+    entry = batch_semaphores.get(pid)
+    if entry is None or entry[0] != limit:
+        # /runtime/settings changed the limit: new items use it, items already running finish on the old one
+        entry = batch_semaphores[pid] = (limit, asyncio.Semaphore(limit))
+    return entry[1]
+
+def _batch_tasks(req: ChatBatchInput) -> List[asyncio.Task]:
+    pid = chat_provider_id()
+    provider_sem = batch_semaphore(pid)
+    limit = runtime_config.batch_concurrency.get(pid, 4)
+    request_sem = asyncio.Semaphore(max(1, min(req.concurrency or limit, limit)))
+
+    async def run_item(index: int, messages: List[Dict]) -> Dict:
+        async with request_sem, provider_sem:
+            start = time.perf_counter()
+            try:
+                message = await run_chat(messages, req.model, Priority.BATCH)
+                result = {"index": index, "ok": True, "message": message}
+            except HTTPException as e:
+                result = {"index": index, "ok": False, "status": e.status_code, "error": e.detail}
+            except Exception as e:
+                result = {"index": index, "ok": False, "status": 500, "error": str(e)}
+            result["latency_ms"] = round((time.perf_counter() - start) * 1000, 1)
+            return result
+
+    return [asyncio.ensure_future(run_item(i, m)) for i, m in enumerate(req.items)]
+
+@app.post("/runtime/chat/batch")
+async def chat_batch(req: ChatBatchInput):
+    start = time.perf_counter()
+    results = await asyncio.gather(*_batch_tasks(req))
+    return {
+        "results": results,
+        "count": len(results),
+        "errors": sum(1 for r in results if not r["ok"]),
+        "total_ms": round((time.perf_counter() - start) * 1000, 1)
+    }
+
+@app.post("/runtime/chat/batch/stream")
+async def chat_batch_stream(req: ChatBatchInput):
+    tasks = _batch_tasks(req)
+
+    async def ndjson():
+        start = time.perf_counter()
+        errors = 0
+        try:
+            # One line per item as it finishes; "index" maps it back to the request order
+            for next_done in asyncio.as_completed(tasks):
+                result = await next_done
+                errors += 0 if result["ok"] else 1
+                yield json.dumps(result) + "\n"
+            yield json.dumps({"done": True, "count": len(tasks), "errors": errors, "total_ms": round((time.perf_counter() - start) * 1000, 1)}) + "\n"
+        finally:
+            for t in tasks:
+                t.cancel()
+
+    return StreamingResponse(ndjson(), media_type="application/x-ndjson")
+
+async def _static_chat_frames(content: str) -> AsyncIterator[Dict]:
+    yield {"type": "token", "content": content}
+    yield {"type": "done", "content": content, "tokens": 1, "ttft_ms": 0, "tokens_per_sec": 0, "total_ms": 0}
+
+class ChatFrames:
+    """
+    Frames from open_chat_stream. aclose() releases the upstream token stream (and its GPU slot)
+    even when iteration never started, which closing the frame generator alone would not do.
+    """
+    def __init__(self, frames: AsyncIterator[Dict], tokens: Optional[AsyncIterator[str]] = None):
+        self.frames = frames
+        self.tokens = tokens
+
+    def __aiter__(self):
+        return self.frames.__aiter__()
+
+    async def aclose(self):
+        await self.frames.aclose()
+        if self.tokens is not None:
+            await self.tokens.aclose()
+
+async def _metered_chat_frames(first: Optional[str], tokens: AsyncIterator[str], start: float, ttft_ms: float) -> AsyncIterator[Dict]:
+    parts: List[str] = []
+    try:
+        if first is not None:
+            parts.append(first)
+            yield {"type": "token", "content": first}
+            async for delta in tokens:
+                parts.append(delta)
+                yield {"type": "token", "content": delta}
+    except HTTPException as e:
+        yield {"type": "error", "detail": e.detail}
+    except Exception as e:
+        yield {"type": "error", "detail": str(e)}
+    finally:
+        # Release the upstream connection if the client went away mid-stream
+        await tokens.aclose()
+    total_ms = (time.perf_counter() - start) * 1000
+    gen_s = (total_ms - ttft_ms) / 1000
+    yield {
+        "type": "done",
+        "content": "".join(parts),
+        "tokens": len(parts),
+        "ttft_ms": round(ttft_ms, 1),
+        "tokens_per_sec": round((len(parts) - 1) / gen_s, 2) if len(parts) > 1 and gen_s > 0 else 0,
+        "total_ms": round(total_ms, 1)
+    }
+
+async def open_chat_stream(messages: List[Dict], model: Optional[str]) -> ChatFrames:
+    """
+    Same mode semantics as /runtime/chat. The first token is awaited before returning,
+    so an unavailable provider still surfaces as an HTTP error (or the hybrid fallback).
+    """
+    mode = runtime_config.chat_mode
+    if mode == "cloud":
+        return ChatFrames(_static_chat_frames("[Cloud Chat: Not Configured]"))
+    if mode not in ["offline", "hybrid"]:
+        raise HTTPException(status_code=400, detail="Invalid Chat Mode")
+
+    start = time.perf_counter()
+    tokens = stream_llm(messages, model)
+    try:
+        first = await tokens.__anext__()
+    except StopAsyncIteration:
+        first = None
+    except HTTPException:
+        if mode == "hybrid":
+            return ChatFrames(_static_chat_frames("[Cloud Fallback: Not Configured]"))
+        raise
+    ttft_ms = (time.perf_counter() - start) * 1000
+    return ChatFrames(_metered_chat_frames(first, tokens, start, ttft_ms), tokens)
+
+@app.post("/runtime/chat/stream")
+async def chat_stream(req: ChatInput):
+    frames = await open_chat_stream(req.messages, req.model)
+
+    async def sse():
+        try:
+            async for frame in frames:
+                yield f"data: {json.dumps(frame)}\n\n"
+        finally:
+            await frames.aclose()
+
+    # The background task covers a response that is dropped before the body is iterated
+    return StreamingResponse(sse(), media_type="text/event-stream", headers={"Cache-Control": "no-cache"},
+                             background=BackgroundTask(frames.aclose))
+
+@app.websocket("/runtime/chat/ws")
+async def chat_ws(websocket: WebSocket):
+    # Client sends ChatInput JSON per turn; server replies with token frames and a final "done" frame.
+    await websocket.accept()
+    try:
+        while True:
+            data = await websocket.receive_json()
+            try:
+                req = ChatInput(**data)
+                frames = await open_chat_stream(req.messages, req.model)
+            except HTTPException as e:
+                await websocket.send_json({"type": "error", "status": e.status_code, "detail": e.detail})
+                continue
+            except Exception as e:
+                await websocket.send_json({"type": "error", "status": 400, "detail": str(e)})
+                continue
+            try:
+                async for frame in frames:
+                    await websocket.send_json(frame)
+            finally:
+                # A client leaving mid-stream must not keep the GPU slot until garbage collection
+                await frames.aclose()
+    except WebSocketDisconnect:
+        pass
+
 
 class TTSInput(BaseModel):
     text: str
     voice: Optional[str] = None
     model: Optional[str] = None
     speed: Optional[float] = None
+    stream: bool = False # Forward audio chunks as Orpheus renders them
 
 @app.post("/runtime/tts_json")
 async def tts_json(req: TTSInput):
     # Wrapper to reuse logic
-    return await process_tts(req.text, req.voice, req.model, req.speed)
+    return await process_tts(req.text, req.voice, req.model, req.speed, req.stream)
+
+def tts_cache_key(text: str, voice: str, model: Optional[str], speed: Optional[float]) -> str:
+    # Key on what Orpheus actually receives, so sentinel model names share entries
+    payload = _orpheus_payload(text, voice, model, "wav", speed)
+    return cache_key(text, voice, payload.get("model"), speed, payload["response_format"])
 
-async def process_tts(text: str, voice: Optional[str], model: Optional[str], speed: Optional[float]):
+async def _open_tts_stream(text: str, voice: str, model: Optional[str], speed: Optional[float], key: Optional[str] = None) -> StreamingResponse:
+    start = time.perf_counter()
+    audio = stream_orpheus_tts(text, voice, model=model, speed=speed)
+    try:
+        first = await audio.__anext__()
+    except StopAsyncIteration:
+        raise HTTPException(status_code=500, detail="TTS produced no audio")
+    ttfa_ms = round((time.perf_counter() - start) * 1000, 1)
+
+    async def body():
+        parts = [first]
+        try:
+            yield first
+            async for chunk in audio:
+                parts.append(chunk)
+                yield chunk
+            if key:
+                await asyncio.to_thread(get_tts_cache().put, key, _finalize_wav(b"".join(parts)))
+        except HTTPException as e:
+            # Headers are already sent; all we can do is cut the stream short
+            print(f"TTS stream aborted: {e.detail}")
+        finally:
+            await audio.aclose()
+
+    async def release():
+        # Releases the GPU slot and upstream stream even if the body is never iterated. (Wrapped because
+        # BackgroundTask would run the builtin audio.aclose in a thread pool and never await it.)
+        await audio.aclose()
+
+    return StreamingResponse(body(), media_type="audio/wav", headers={"X-TTS-TTFA-Ms": str(ttfa_ms), "X-TTS-Cache": "miss"},
+                             background=BackgroundTask(release))
+
+async def process_tts(text: str, voice: Optional[str], model: Optional[str], speed: Optional[float], stream: bool = False):
     mode = runtime_config.tts_mode
     target_voice = voice or runtime_config.voice_local
     target_model = model or runtime_config.tts_model
     
-    # Notify orchestrator (TTS usually persistent or handled by external service loop, but we track request)
-    await gpu_mgr.prepare_for_model(ModelType.TTS, target_voice)
-    
     if mode == "offline" or mode == "hybrid":
+        # Repeated greetings/prompts are served from the audio cache without touching the GPU
+        key = tts_cache_key(text, target_voice, target_model, speed)
+        cached = await asyncio.to_thread(get_tts_cache().get, key)
+        if cached:
+            return Response(content=cached, media_type="audio/wav", headers={"X-TTS-Cache": "hit"})
+
+        # Notify orchestrator (TTS usually persistent or handled by external service loop, but we track request)
+        await get_gpu_mgr().prepare_for_model(ModelType.TTS, target_voice)
         try:
+            if stream:
+                return await _open_tts_stream(text, target_voice, target_model, speed, key)
             wav_bytes = await call_orpheus_tts(text, target_voice, model=target_model, speed=speed)
             if not wav_bytes or not isinstance(wav_bytes, bytes):
                 raise HTTPException(status_code=500, detail="TTS produced no audio")
-            return Response(content=wav_bytes, media_type="audio/wav")
+            await asyncio.to_thread(get_tts_cache().put, key, wav_bytes)
+            return Response(content=wav_bytes, media_type="audio/wav", headers={"X-TTS-Cache": "miss"})
         except HTTPException as e:
              if mode == "hybrid":
                 # Fallback cloud?
@@ -375,7 +1010,37 @@ async def process_tts(text: str, voice: Optional[str], model: Optional[str], spe
 # Redefine /runtime/tts to use Pydantic model
 @app.post("/runtime/tts")
 async def tts_endpoint_main(req: TTSInput):
-    return await process_tts(req.text, req.voice, req.model, req.speed)
+    return await process_tts(req.text, req.voice, req.model, req.speed, req.stream)
+
+@app.get("/runtime/tts/cache/stats")
+async def tts_cache_stats():
+    return get_tts_cache().stats()
+
+class TTSPrewarmInput(BaseModel):
+    phrases: List[str]
+    voice: Optional[str] = None
+    model: Optional[str] = None
+    speed: Optional[float] = None
+
+@app.post("/runtime/tts/cache/prewarm")
+async def tts_cache_prewarm(req: TTSPrewarmInput):
+    # Sequential on purpose: pre-warming should not monopolise the GPU
+    voice = req.voice or runtime_config.voice_local
+    model = req.model or runtime_config.tts_model
+    warmed, skipped, failed = 0, 0, []
+    for phrase in req.phrases:
+        if not phrase.strip(): continue
+        key = tts_cache_key(phrase, voice, model, req.speed)
+        if get_tts_cache().contains(key):
+            skipped += 1
+            continue
+        try:
+            wav_bytes = await call_orpheus_tts(phrase, voice, model=model, speed=req.speed)
+            await asyncio.to_thread(get_tts_cache().put, key, wav_bytes)
+            warmed += 1
+        except HTTPException as e:
+            failed.append({"text": phrase, "detail": e.detail})
+    return {"warmed": warmed, "already_cached": skipped, "failed": failed, "stats": get_tts_cache().stats()}
 
 
 @app.post("/runtime/generate/ifc")
@@ -385,13 +1050,18 @@ async def generate_ifc_endpoint(req: dict = Body(...)):
     # 1. LLM Parse
     spec = await call_llm_json(text)
     
-    # 2. Generate IFC
-    import asyncio
-    loop = asyncio.get_running_loop()
-    ifc_str = await loop.run_in_executor(None, ifc_gen.generate_ifc_content, text, spec)
+    # 2. Generate IFC (warm process pool, cached per normalized spec)
+    ifc_str, hit = await ifc_gen.generate_ifc_cached(text, spec)
     
     # 3. Return File
-    return Response(content=ifc_str, media_type="application/x-step", headers={"Content-Disposition": "attachment; filename=model.ifc"})
+    return Response(content=ifc_str, media_type="application/x-step", headers={"Content-Disposition": "attachment; filename=model.ifc", "X-IFC-Cache": "hit" if hit else "miss"})
+
+@app.get("/runtime/generate/ifc/cache")
+async def ifc_cache_stats():
+    return {
+        "ifc": ifc_gen.get_cache_stats(),
+        "llm_json": {**llm_json_cache_stats, "entries": len(llm_json_cache), "max_entries": LLM_JSON_CACHE_MAX}
+    }
 
 def should_use_orpheus_voices(provider: Optional[str], model: Optional[str]) -> bool:
     # Voice inventory always comes from Orpheus runtime for local/hybrid TTS.
@@ -411,7 +1081,9 @@ async def list_voices(provider: Optional[str] = None, model: Optional[str] = Non
 from orca_runtime.persona_runtime import PersonaRuntime
 
 WORKSPACE_ROOT = os.getcwd() # Assumes we run from the project root
-persona_runtime = PersonaRuntime(WORKSPACE_ROOT)
+
+def get_persona_runtime() -> PersonaRuntime:
+    return _service("persona_runtime", lambda: PersonaRuntime(WORKSPACE_ROOT))
 STATE_FILE = os.path.join(WORKSPACE_ROOT, "orca_runtime", "state", "active_persona.json")
 
 def get_active_persona_id() -> str:
@@ -435,19 +1107,16 @@ def get_caps_for_profile(profile: str) -> List[str]:
 @app.get("/runtime/persona/list")
 async def list_personas_api(cap_profile: str = "retail"):
     caps = get_caps_for_profile(cap_profile)
-    persona_ids = persona_runtime.list_installed_personas()
+    persona_ids = get_persona_runtime().list_installed_personas()
     results = []
     
     for pid in persona_ids:
-        pack = persona_runtime.load_persona(pid)
+        pack = get_persona_runtime().load_persona(pid)
         if not pack: continue
         
-        status_info = persona_runtime.switch_persona(pid, caps)
-        
-        # Determine available modules for this persona with these caps
-        reg = persona_runtime.get_module_registry()
-        layout = pack.get("layout", {"modules": []})
-        filtered = persona_runtime.filter_layout_by_registry(layout, caps)
+        # switch_persona already filters the layout for these caps; packs come from the persona cache
+        status_info = get_persona_runtime().switch_persona(pid, caps)
+        filtered = status_info["layout"]
         
         results.append({
             "id": pid,
@@ -464,7 +1133,7 @@ async def list_personas_api(cap_profile: str = "retail"):
 async def get_active_persona_api(cap_profile: str = "retail"):
     active_id = get_active_persona_id()
     caps = get_caps_for_profile(cap_profile)
-    return persona_runtime.switch_persona(active_id, caps)
+    return get_persona_runtime().switch_persona(active_id, caps)
 
 class SwitchInput(BaseModel):
     persona_id: str
@@ -474,20 +1143,20 @@ async def switch_persona_api(req: SwitchInput, cap_profile: str = "retail"):
     # Note: We allow switching even to "locked" personas, they just render in LOCKED_PREVIEW status
     set_active_persona_id(req.persona_id)
     caps = get_caps_for_profile(cap_profile)
-    return persona_runtime.switch_persona(req.persona_id, caps)
+    return get_persona_runtime().switch_persona(req.persona_id, caps)
 
 @app.get("/runtime/persona/preview")
 async def preview_persona_api(persona_id: str, cap_profile: str = "retail"):
     caps = get_caps_for_profile(cap_profile)
-    return persona_runtime.switch_persona(persona_id, caps)
+    return get_persona_runtime().switch_persona(persona_id, caps)
 
 @app.get("/runtime/persona/catalog")
 async def get_catalog_api():
-    return persona_runtime.get_catalog()
+    return get_persona_runtime().get_catalog()
 
 @app.get("/runtime/persona/installed")
 async def get_installed_personas_api():
-    return persona_runtime.installer.get_installed()
+    return get_persona_runtime().installer.get_installed()
 
 class InstallInput(BaseModel):
     source_path: Optional[str] = None
@@ -496,15 +1165,15 @@ class InstallInput(BaseModel):
 @app.post("/runtime/persona/install")
 async def install_persona_api(req: InstallInput):
     if req.source_path:
-        return persona_runtime.installer.install(req.source_path)
+        return get_persona_runtime().installer.install(req.source_path)
     if req.zip_path:
-        return persona_runtime.installer.import_zip(req.zip_path)
+        return get_persona_runtime().installer.import_zip(req.zip_path)
     raise HTTPException(status_code=400, detail="Source path or Zip path required.")
 
 @app.post("/runtime/persona/import")
 async def import_persona_api(req: InstallInput):
     if req.zip_path:
-        return persona_runtime.installer.import_zip(req.zip_path)
+        return get_persona_runtime().installer.import_zip(req.zip_path)
     raise HTTPException(status_code=400, detail="Zip path required.")
 
 class RollbackInput(BaseModel):
@@ -513,7 +1182,7 @@ class RollbackInput(BaseModel):
 
 @app.post("/runtime/persona/rollback")
 async def rollback_persona_api(req: RollbackInput):
-    return persona_runtime.installer.rollback(req.persona_id, req.version)
+    return get_persona_runtime().installer.rollback(req.persona_id, req.version)
 
 class ActivateInput(BaseModel):
     sku: Optional[str] = None
@@ -523,43 +1192,88 @@ class ActivateInput(BaseModel):
 async def activate_persona_api(req: ActivateInput):
     sku = req.sku
     if not sku and req.persona_id:
-        pack = persona_runtime.load_persona(req.persona_id)
+        pack = get_persona_runtime().load_persona(req.persona_id)
         if pack:
             sku = pack.get("entitlement", {}).get("sku")
     
     if not sku:
         raise HTTPException(status_code=400, detail="Missing SKU or Persona ID")
     
-    success = persona_runtime.add_grant(sku)
-    return {"success": success, "sku": sku, "grants": persona_runtime.get_user_grants()}
+    success = get_persona_runtime().add_grant(sku)
+    return {"success": success, "sku": sku, "grants": get_persona_runtime().get_user_grants()}
 
 # --- Director API (Flight Recorder) ---
-from orca_runtime.director import Director
-
-director_ctrl = Director(WORKSPACE_ROOT)
+from orca_runtime.director import Director, InboxBusy, InboxTooLarge
+from orca_runtime.upload_stream import MultipartFileStream
 
 def handle_director_event(event: Dict):
-    # This runs in the same process, we need to broadcast to WS clients
-    # Note: Flask/FastAPI async context might be tricky, but we'll try basic broadcast
-    asyncio.create_task(manager.broadcast(json.dumps(event)))
+    # Enqueue only; per-client writer tasks do the sending
+    manager.publish(json.dumps(event))
+
+def _build_director() -> Director:
+    director = Director(WORKSPACE_ROOT, event_durability=runtime_config.event_durability,
+                        derive_workers=runtime_config.inbox_workers, derive_queue_max=runtime_config.inbox_queue_max,
+                        max_upload_bytes=runtime_config.inbox_max_upload_mb * 1024 * 1024)
+    director.set_on_event(handle_director_event)
+    return director
+
+def get_director() -> Director:
+    return _service("director", _build_director)
+
+manager.snapshot_fn = lambda: {"state": get_director().get_state(), "events": get_director().list_events(20)}
 
-director_ctrl.set_on_event(handle_director_event)
+@app.get("/api/director/ws/stats")
+async def director_ws_stats():
+    return manager.stats()
 
 @app.get("/api/director/state")
 async def director_state():
-    return director_ctrl.get_state()
+    return get_director().get_state()
 
 @app.get("/api/director/events")
-async def director_events(limit: int = 50):
-    return director_ctrl.list_events(limit)
+async def director_events(limit: int = 50, before_id: Optional[int] = None, after_id: Optional[int] = None):
+    # Reads may briefly wait for the log writer; keep that off the event loop
+    return await asyncio.to_thread(get_director().list_events, limit, before_id, after_id)
+
+@app.get("/api/director/events/query")
+async def director_events_query(type: Optional[str] = None, source: Optional[str] = None, severity: Optional[str] = None,
+                                since: Optional[str] = None, until: Optional[str] = None, run_id: Optional[str] = None,
+                                payload: List[str] = Query([]), limit: int = 50,
+                                before_seq: Optional[int] = None, after_seq: Optional[int] = None,
+                                count_only: bool = False, group_by: Optional[str] = None):
+    # type matches as a prefix ("capability." covers every capability event); payload filters are key:value
+    for name, value in (("since", since), ("until", until)):
+        if not value:
+            continue
+        try:
+            parsed = datetime.fromisoformat(value)
+        except ValueError:
+            raise HTTPException(status_code=400, detail=f"{name} must be an ISO 8601 timestamp, got {value}")
+        if parsed.tzinfo is not None:
+            # Event timestamps are naive local time; an offset would be compared as if it were local
+            raise HTTPException(status_code=400, detail=f"{name} must not carry a timezone (event times are local), got {value}")
+    filters = {}
+    for item in payload:
+        key, sep, value = item.partition(":")
+        if not sep:
+            raise HTTPException(status_code=400, detail=f"payload filter must be key:value, got {item}")
+        filters[key] = value
+    if run_id:
+        filters["run_id"] = run_id
+    return await asyncio.to_thread(get_director().query_events, type, source, severity, since, until, filters, limit,
+                                   before_seq, after_seq, count_only, group_by)
+
+@app.get("/api/director/events/stats")
+async def director_events_stats():
+    return get_director().event_log.stats()
 
 @app.get("/api/director/runs")
 async def director_runs():
-    return director_ctrl.list_runs()
+    return get_director().list_runs()
 
 @app.post("/api/director/events/test")
 async def director_test_event():
-    return director_ctrl.append_event("test.manual", "director", {"msg": "Manual test event triggered"})
+    return get_director().append_event("test.manual", "director", {"msg": "Manual test event triggered"})
 
 @app.websocket("/api/director/ws")
 async def director_ws_endpoint(websocket: WebSocket):
@@ -569,32 +1283,53 @@ async def director_ws_endpoint(websocket: WebSocket):
             # Keep connection alive
             await websocket.receive_text()
     except WebSocketDisconnect:
+        pass
+    finally:
         manager.disconnect(websocket)
 
 @app.post("/api/director/session/start")
 async def director_start_session(persona_id: str = "persona.home@0.1"):
     # Bridge to new run receipt logic if needed, or keep as is
-    event = director_ctrl.append_event("session.start", "director", {"persona_id": persona_id})
+    event = get_director().append_event("session.start", "director", {"persona_id": persona_id})
     return event
 
 @app.post("/api/director/session/stop")
 async def director_stop_session(session_id: str):
-    event = director_ctrl.append_event("session.stop", "director", {"session_id": session_id})
+    event = get_director().append_event("session.stop", "director", {"session_id": session_id})
     return event
 
+UPLOAD_FORM_OVERHEAD = 64 * 1024 # multipart boundaries and part headers on top of the file itself
+
 @app.post("/api/director/inbox/upload")
-async def director_inbox_upload(file: UploadFile = File(...)):
-    content = await file.read()
-    item = director_ctrl.ingest_to_inbox(file.filename, content)
-    return item
+async def director_inbox_upload(request: Request):
+    """
+    Multipart upload with a "file" field. The body is parsed as it arrives and the file goes straight
+    into the inbox (no temp-file spool), so the size limit is enforced during receipt: up front from
+    Content-Length when the client sends one, otherwise as soon as the running byte count passes it.
+    """
+    director = get_director()
+    length = request.headers.get("content-length", "")
+    if length.isdigit() and int(length) > director.max_upload_bytes + UPLOAD_FORM_OVERHEAD:
+        raise HTTPException(status_code=413, detail=f"Upload exceeds {director.max_upload_bytes} bytes")
+    try:
+        upload = MultipartFileStream(request, "file")
+        await upload.open()
+        # Off the event loop: chunked copy from the request body plus a possible wait for a queue slot
+        return await asyncio.to_thread(director.ingest_stream_to_inbox, upload.filename, upload)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except InboxTooLarge as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    except InboxBusy as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "5"})
 
 @app.get("/api/director/inbox/list")
 async def director_inbox_list():
-    return director_ctrl.list_inbox()
+    return get_director().list_inbox()
 
 @app.get("/api/director/inbox/{inbox_id}/artifacts/{path:path}")
 async def director_inbox_artifact(inbox_id: str, path: str):
-    content = director_ctrl.get_inbox_artifact(inbox_id, path)
+    content = get_director().get_inbox_artifact(inbox_id, path)
     if not content:
         raise HTTPException(status_code=404, detail="Artifact not found")
     media_type = "image/jpeg" if path.endswith(".jpg") else "text/plain"
@@ -602,7 +1337,7 @@ async def director_inbox_artifact(inbox_id: str, path: str):
 
 @app.get("/api/director/inbox/{inbox_id}/original/{filename}")
 async def director_inbox_original(inbox_id: str, filename: str):
-    content = director_ctrl.get_inbox_original(inbox_id, filename)
+    content = get_director().get_inbox_original(inbox_id, filename)
     if not content:
         raise HTTPException(status_code=404, detail="Original file not found")
     return Response(content=content, media_type="application/octet-stream")
@@ -616,7 +1351,7 @@ class QuestFromInboxReq(BaseModel):
 
 @app.post("/api/director/quests/from_inbox")
 async def director_quests_from_inbox(req: QuestFromInboxReq):
-    return director_ctrl.create_quest_from_inbox(req.inbox_id, req.title, req.acceptance)
+    return get_director().create_quest_from_inbox(req.inbox_id, req.title, req.acceptance)
 
 class QuestStatusReq(BaseModel):
     quest_id: str
@@ -625,23 +1360,26 @@ class QuestStatusReq(BaseModel):
 @app.post("/api/director/quests/set_status")
 async def director_quests_set_status(req: QuestStatusReq):
     try:
-        return director_ctrl.set_quest_status(req.quest_id, req.status)
+        return get_director().set_quest_status(req.quest_id, req.status)
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
 
 @app.get("/api/director/quests")
-async def director_get_quests():
-    return director_ctrl.get_quests()
+async def director_get_quests(status: Optional[str] = None, limit: Optional[int] = None, offset: int = 0):
+    # Without paging params the full legacy document is returned for the dashboard
+    if status is None and limit is None and not offset:
+        return get_director().get_quests()
+    return get_director().list_quests(status, limit or 50, offset)
 
 # --- Capability Trails API (M12) ---
 
 @app.get("/api/director/capabilities")
 async def director_list_capabilities():
-    return director_ctrl.get_capability_catalog()
+    return get_director().get_capability_catalog()
 
 @app.get("/api/director/capabilities/actions")
 async def director_list_capability_actions():
-    return director_ctrl.get_capability_actions()
+    return get_director().get_capability_actions()
 
 class RunCapabilityReq(BaseModel):
     capability_id: str
@@ -651,7 +1389,7 @@ class RunCapabilityReq(BaseModel):
 @app.post("/api/director/capabilities/run")
 async def director_run_capability(req: RunCapabilityReq):
     try:
-        return director_ctrl.run_capability(req.capability_id, req.action_id, req.params)
+        return get_director().run_capability(req.capability_id, req.action_id, req.params)
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
@@ -660,17 +1398,29 @@ class CapabilityReceiptReq(BaseModel):
 
 @app.post("/api/director/capabilities/emit_test_receipt")
 async def director_capability_test_receipt(req: CapabilityReceiptReq):
-    return director_ctrl.emit_capability_test_receipt(req.capability_id)
+    return get_director().emit_capability_test_receipt(req.capability_id)
 
 @app.post("/api/director/runs/record")
 async def director_record_run(receipt: Dict):
-    return director_ctrl.record_run_receipt(receipt)
+    return get_director().record_run_receipt(receipt)
 
 # --- Progress Dashboard API (M13) ---
 
 @app.get("/api/director/progress")
 async def director_get_progress():
-    return director_ctrl.get_progress_snapshot()
+    return get_director().get_progress_snapshot()
+
+@app.get("/api/director/issues")
+async def director_list_issues(status: Optional[str] = None, severity: Optional[str] = None, limit: int = 50, offset: int = 0):
+    return get_director().list_issues(status, severity, limit, offset)
+
+@app.get("/api/director/milestones")
+async def director_list_milestones(status: Optional[str] = None, limit: int = 50, offset: int = 0):
+    return get_director().list_milestones(status, limit, offset)
+
+@app.get("/api/director/export")
+async def director_export():
+    return get_director().export_planning()
 
 class IssueCreateReq(BaseModel):
     title: str
@@ -680,7 +1430,7 @@ class IssueCreateReq(BaseModel):
 
 @app.post("/api/director/issues/create")
 async def director_create_issue(req: IssueCreateReq):
-    return director_ctrl.create_issue(req.title, req.severity, req.area, req.links)
+    return get_director().create_issue(req.title, req.severity, req.area, req.links)
 
 class StatusUpdateReq(BaseModel):
     id: str
@@ -688,11 +1438,11 @@ class StatusUpdateReq(BaseModel):
 
 @app.post("/api/director/issues/set_status")
 async def director_set_issue_status(req: StatusUpdateReq):
-    return director_ctrl.set_issue_status(req.id, req.status)
+    return get_director().set_issue_status(req.id, req.status)
 
 @app.post("/api/director/milestones/set_status")
 async def director_set_milestone_status(req: StatusUpdateReq):
-    return director_ctrl.set_milestone_status(req.id, req.status)
+    return get_director().set_milestone_status(req.id, req.status)
 
 if __name__ == "__main__":
     uvicorn.run(app, host="127.0.0.1", port=7010)
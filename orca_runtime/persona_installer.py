@@ -1,10 +1,58 @@
 import os
 import json
+import stat
 import shutil
 import zipfile
 import datetime
-from typing import Dict, List, Optional, Any
-from jsonschema import validate, ValidationError
+import hashlib
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Any, Tuple
+from jsonschema import SchemaError, FormatChecker
+from jsonschema.exceptions import best_match
+from jsonschema.validators import validator_for
+
+PACK_SCHEMA = "orca.ui.persona.pack@0.1.schema.json"
+# Component key in persona.pack.json -> schema its file must satisfy
+COMPONENT_SCHEMAS = {
+    "layout": "orca.ui.layout@0.1.schema.json",
+    "theme": "orca.ui.theme@0.1.schema.json",
+}
+
+# Import limits; archives exceeding them are rejected before anything is written
+MAX_ZIP_ENTRIES = 512
+MAX_ZIP_MEMBER_BYTES = 16 * 1024**2
+MAX_ZIP_TOTAL_BYTES = 64 * 1024**2
+MAX_JSON_MEMBER_BYTES = 2 * 1024**2
+# Stage directories older than this are assumed abandoned by a crashed import
+STAGE_MAX_AGE_S = 3600
+# Blobs are shared by every version linking them; read-only so an in-place edit fails loudly
+BLOB_MODE = stat.S_IRUSR | stat.S_IRGRP | stat.S_IROTH
+
+def _force_remove(func, path, exc_info):
+    # Windows refuses to unlink read-only files; clear the bit and retry
+    try:
+        os.chmod(path, stat.S_IWRITE | stat.S_IREAD)
+        func(path)
+    except OSError:
+        pass
+
+def _rmtree(path: str):
+    shutil.rmtree(path, onerror=_force_remove)
+
+# Compiled validators shared by every installer in the process: schema path -> ((mtime_ns, size), validator)
+_validators: Dict[str, Tuple[Tuple[int, int], Any]] = {}
+_validators_lock = threading.Lock()
+
+_worker_installer = None
+
+def _validate_pack_worker(workspace_root: str, source_path: str) -> Tuple[str, List[str]]:
+    # Runs inside validate_many's process pool; validators stay compiled for the worker's lifetime
+    global _worker_installer
+    if _worker_installer is None or _worker_installer.root != workspace_root:
+        _worker_installer = PersonaInstaller(workspace_root)
+    return source_path, _worker_installer.validate_pack(source_path)
 
 class PersonaInstaller:
     def __init__(self, workspace_root: str):
@@ -13,8 +61,22 @@ class PersonaInstaller:
         self.schema_dir = os.path.join(workspace_root, "orca", "engine", "schemas")
         self.index_path = os.path.join(self.installed_dir, "index.json")
         self.tmp_dir = os.path.join(workspace_root, "orca_runtime", "state", "tmp_import")
+        # Staging lives next to installed/ so finished packs move into place with a rename
+        self.stage_dir = os.path.join(self.installed_dir, ".staging")
+        # Content-addressed file store; version directories hold hardlinks into it
+        self.blob_dir = os.path.join(self.installed_dir, ".blobs")
         os.makedirs(self.installed_dir, exist_ok=True)
-        os.makedirs(self.tmp_dir, exist_ok=True)
+        os.makedirs(self.stage_dir, exist_ok=True)
+        self.on_change_callback = None
+
+    def set_on_change(self, callback):
+        self.on_change_callback = callback
+
+    def _notify(self, event: str):
+        if self.on_change_callback:
+            try:
+                self.on_change_callback(event)
+            except: pass
 
     def load_index(self) -> Dict[str, Any]:
         if os.path.exists(self.index_path):
@@ -40,6 +102,27 @@ class PersonaInstaller:
     def save_index(self, index: Dict[str, Any]):
         with open(self.index_path, "w") as f:
             json.dump(index, f, indent=2)
+        self._notify("index.saved")
+
+    def _get_validator(self, schema_filename: str):
+        """Compiled validator for a schema file, rebuilt only when the file changes."""
+        schema_path = os.path.join(self.schema_dir, schema_filename)
+        st = os.stat(schema_path)
+        stamp = (st.st_mtime_ns, st.st_size)
+        with _validators_lock:
+            cached = _validators.get(schema_path)
+            if cached and cached[0] == stamp:
+                return cached[1]
+
+        with open(schema_path, "r") as f:
+            schema = json.load(f)
+        cls = validator_for(schema)
+        cls.check_schema(schema)
+        format_checker = getattr(cls, "FORMAT_CHECKER", None) or FormatChecker()
+        validator = cls(schema, format_checker=format_checker)
+        with _validators_lock:
+            _validators[schema_path] = (stamp, validator)
+        return validator
 
     def _validate_json(self, data: Any, schema_filename: str) -> Optional[str]:
         schema_path = os.path.join(self.schema_dir, schema_filename)
@@ -47,59 +130,247 @@ class PersonaInstaller:
             return f"Schema {schema_filename} not found."
         
         try:
-            with open(schema_path, "r") as f:
-                schema = json.load(f)
-            validate(instance=data, schema=schema)
+            error = best_match(self._get_validator(schema_filename).iter_errors(data))
+            if error is not None:
+                return f"Validation error in {schema_filename}: {error.message}"
             return None
-        except ValidationError as e:
-            return f"Validation error in {schema_filename}: {e.message}"
+        except SchemaError as e:
+            return f"Error validating {schema_filename}: {e.message}"
         except Exception as e:
             return f"Error validating {schema_filename}: {str(e)}"
 
-    def validate_pack(self, source_path: str) -> List[str]:
+    def _validate_component(self, read_json, key: str, filename: str) -> Optional[str]:
+        try:
+            data = read_json(filename)
+        except FileNotFoundError:
+            return f"{key.capitalize()} component file {filename} not found."
+        except json.JSONDecodeError as e:
+            return f"Invalid JSON: {str(e)}"
+        return self._validate_json(data, COMPONENT_SCHEMAS[key])
+
+    def _validate_pack_data(self, pack: Any, read_json) -> List[str]:
+        """Validates a parsed pack and its components; read_json(filename) loads a component or raises FileNotFoundError."""
         errors = []
+        comp = pack.get("components", {}) if isinstance(pack, dict) else {}
+        if not isinstance(comp, dict):
+            comp = {}
+
+        # Inline on purpose: jsonschema is pure Python and holds the GIL, so threads would only add
+        # hand-offs. Parallelism across packs comes from validate_many's process pool.
+        err = self._validate_json(pack, PACK_SCHEMA)
+        if err: errors.append(err)
+        for key in COMPONENT_SCHEMAS:
+            if comp.get(key):
+                err = self._validate_component(read_json, key, comp[key])
+                if err: errors.append(err)
+        return errors
+
+    def validate_pack(self, source_path: str) -> List[str]:
         pack_path = os.path.join(source_path, "persona.pack.json")
         if not os.path.exists(pack_path):
             return ["Missing persona.pack.json"]
-        
-        try:
-            with open(pack_path, "r") as f:
-                pack = json.load(f)
-            err = self._validate_json(pack, "orca.ui.persona.pack@0.1.schema.json")
-            if err: errors.append(err)
-            
-            comp = pack.get("components", {})
-            
-            # Layout
-            layout_file = comp.get("layout")
-            if layout_file:
-                lpath = os.path.join(source_path, layout_file)
-                if os.path.exists(lpath):
-                    with open(lpath, "r") as f:
-                        layout_data = json.load(f)
-                    err = self._validate_json(layout_data, "orca.ui.layout@0.1.schema.json")
-                    if err: errors.append(err)
-                else:
-                    errors.append(f"Layout component file {layout_file} not found.")
-
-            # Theme
-            theme_file = comp.get("theme")
-            if theme_file:
-                tpath = os.path.join(source_path, theme_file)
-                if os.path.exists(tpath):
-                    with open(tpath, "r") as f:
-                        theme_data = json.load(f)
-                    err = self._validate_json(theme_data, "orca.ui.theme@0.1.schema.json")
-                    if err: errors.append(err)
-                else:
-                    errors.append(f"Theme component file {theme_file} not found.")
 
+        def read_json(filename: str) -> Any:
+            path = os.path.join(source_path, filename)
+            if not os.path.exists(path):
+                raise FileNotFoundError(filename)
+            with open(path, "r") as f:
+                return json.load(f)
+
+        try:
+            return self._validate_pack_data(read_json("persona.pack.json"), read_json)
         except json.JSONDecodeError as e:
-            errors.append(f"Invalid JSON: {str(e)}")
+            return [f"Invalid JSON: {str(e)}"]
         except Exception as e:
-            errors.append(f"Unexpected validation error: {str(e)}")
-            
-        return errors
+            return [f"Unexpected validation error: {str(e)}"]
+
+    def validate_many(self, directory: str, workers: Optional[int] = None) -> Dict[str, List[str]]:
+        """
+        Validates every pack directory (one containing persona.pack.json) directly under directory.
+        Returns {dirname: errors}; an empty list means the pack is valid.
+        """
+        directory = os.path.abspath(directory)
+        packs = sorted(d for d in os.listdir(directory)
+                       if os.path.isfile(os.path.join(directory, d, "persona.pack.json")))
+        if not packs:
+            return {}
+
+        workers = workers or min(len(packs), os.cpu_count() or 1)
+        results: Dict[str, List[str]] = {}
+        if workers <= 1 or len(packs) == 1:
+            for d in packs:
+                results[d] = self.validate_pack(os.path.join(directory, d))
+            return results
+
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(_validate_pack_worker, self.root, os.path.join(directory, d)) for d in packs]
+            for fut in futures:
+                path, errs = fut.result()
+                results[os.path.basename(path)] = errs
+        return results
+
+    def _register(self, base_id: str, version: str, auto_switch: bool) -> Dict[str, Any]:
+        index = self.load_index()
+        if base_id not in index:
+            index[base_id] = {"active_version": version, "versions": []}
+        
+        if version not in index[base_id]["versions"]:
+            index[base_id]["versions"].append(version)
+        
+        if auto_switch:
+            index[base_id]["active_version"] = version
+        
+        self.save_index(index)
+        return {"success": True, "persona_id": base_id, "version": version, "active_version": index[base_id]["active_version"]}
+
+    def _new_stage(self) -> str:
+        self.gc_stages() # only walks the blob store when it actually removed an abandoned stage
+        ts = datetime.datetime.now().strftime("%Y%m%d_%H%M%S_%f")
+        path = os.path.join(self.stage_dir, f"{ts}_{threading.get_ident()}")
+        os.makedirs(path)
+        return path
+
+    def _publish(self, stage_path: str, base_id: str, version: str) -> Optional[str]:
+        """Moves a fully written stage into installed/ with a single rename. Returns an error or None."""
+        target_path = os.path.join(self.installed_dir, f"{base_id}@{version}")
+        # Requirements say "Never overwrite existing persona version directories"
+        if os.path.exists(target_path):
+            return f"Version {version} of {base_id} already exists."
+        try:
+            os.rename(stage_path, target_path)
+        except OSError:
+            if os.path.exists(target_path):
+                return f"Version {version} of {base_id} already exists."
+            raise
+        return None
+
+    def _blob_path(self, digest: str) -> str:
+        return os.path.join(self.blob_dir, digest[:2], digest)
+
+    def _ingest(self, src, dest: str, limit: Optional[int] = None) -> int:
+        """
+        Streams src into dest while hashing it, then makes dest a hardlink to the blob with that
+        sha256, storing it first if it is new. Returns the number of bytes read.
+        """
+        os.makedirs(os.path.dirname(dest), exist_ok=True)
+        h = hashlib.sha256()
+        size = 0
+        with open(dest, "wb") as out:
+            while True:
+                chunk = src.read(64 * 1024)
+                if not chunk: break
+                size += len(chunk)
+                if limit is not None and size > limit:
+                    raise ValueError(f"pack expands past {limit} bytes")
+                h.update(chunk)
+                out.write(chunk)
+        self._link_blob(dest, h.hexdigest())
+        return size
+
+    def _link_blob(self, path: str, digest: str):
+        blob = self._blob_path(digest)
+        os.makedirs(os.path.dirname(blob), exist_ok=True)
+        try:
+            if not os.path.exists(blob):
+                try:
+                    os.link(path, blob)
+                    os.chmod(blob, BLOB_MODE)
+                    return
+                except FileExistsError:
+                    pass
+            tmp = f"{path}.link"
+            os.link(blob, tmp)
+            os.replace(tmp, path)
+        except OSError:
+            # No hardlink support here (e.g. FAT or cross-device); keep the plain copy
+            pass
+
+    def dedupe_installed(self) -> Dict[str, Any]:
+        """Folds version directories installed before the blob store existed into it."""
+        files = 0
+        for d in os.listdir(self.installed_dir):
+            vdir = os.path.join(self.installed_dir, d)
+            if "@" not in d or not os.path.isdir(vdir):
+                continue
+            for root, _, names in os.walk(vdir):
+                for name in names:
+                    path = os.path.join(root, name)
+                    h = hashlib.sha256()
+                    with open(path, "rb") as f:
+                        for chunk in iter(lambda: f.read(64 * 1024), b""):
+                            h.update(chunk)
+                    self._link_blob(path, h.hexdigest())
+                    files += 1
+        return {"files": files, **self.storage_stats()}
+
+    def storage_stats(self) -> Dict[str, Any]:
+        blobs = 0
+        blob_bytes = 0
+        links = 0
+        if os.path.isdir(self.blob_dir):
+            for root, _, names in os.walk(self.blob_dir):
+                for name in names:
+                    st = os.stat(os.path.join(root, name))
+                    blobs += 1
+                    blob_bytes += st.st_size
+                    links += st.st_nlink - 1
+        return {"blobs": blobs, "blob_bytes": blob_bytes, "version_files": links}
+
+    def gc_blobs(self) -> int:
+        """
+        Drops blobs no version directory links to any more and re-protects any left writable.
+        Walks the whole blob store: run after removing linked files, or as maintenance.
+        Returns how many were removed.
+        """
+        removed = 0
+        if not os.path.isdir(self.blob_dir):
+            return 0
+        for root, _, names in os.walk(self.blob_dir):
+            for name in names:
+                path = os.path.join(root, name)
+                try:
+                    st = os.stat(path)
+                    if st.st_nlink <= 1:
+                        os.chmod(path, stat.S_IWRITE | stat.S_IREAD)
+                        os.remove(path)
+                        removed += 1
+                    elif st.st_mode & 0o222:
+                        os.chmod(path, BLOB_MODE)
+                except OSError:
+                    pass
+        return removed
+
+    def gc_stages(self, max_age_s: float = STAGE_MAX_AGE_S) -> int:
+        """
+        Removes stages left behind by crashed imports and the legacy tmp_import extractions, then
+        collects the blobs only they linked. Returns how many directories were removed.
+        """
+        cutoff = time.time() - max_age_s
+        removed = 0
+        for parent in (self.stage_dir, self.tmp_dir):
+            if not os.path.isdir(parent):
+                continue
+            for name in os.listdir(parent):
+                path = os.path.join(parent, name)
+                try:
+                    if parent == self.tmp_dir or os.path.getmtime(path) < cutoff:
+                        _rmtree(path)
+                        removed += 1
+                except OSError:
+                    pass
+        if removed:
+            self.gc_blobs()
+        return removed
+
+    def _discard_stage(self, stage_path: str):
+        """Removes a stage; if the pack never got published its blobs may now be orphaned."""
+        unpublished = os.path.exists(os.path.join(stage_path, "pack"))
+        try:
+            _rmtree(stage_path)
+        except OSError:
+            pass
+        if unpublished:
+            self.gc_blobs()
 
     def install(self, source_path: str, auto_switch: bool = True) -> Dict[str, Any]:
         source_path = os.path.abspath(source_path)
@@ -116,67 +387,112 @@ class PersonaInstaller:
         # Normalized base ID
         base_id = persona_id.split("@")[0]
         
-        target_dirname = f"{base_id}@{version}"
-        target_path = os.path.join(self.installed_dir, target_dirname)
-        
-        # Safe copy: do not overwrite if exists or at least log it.
-        # Requirements say "Never overwrite existing persona version directories"
-        if os.path.exists(target_path):
+        if os.path.exists(os.path.join(self.installed_dir, f"{base_id}@{version}")):
             return {"success": False, "errors": [f"Version {version} of {base_id} already exists."]}
         
-        shutil.copytree(source_path, target_path)
+        # Copy into a stage first so a half-copied pack is never visible under installed/
+        stage_path = self._new_stage()
+        try:
+            pack_stage = os.path.join(stage_path, "pack")
+            for root, _, names in os.walk(source_path):
+                for name in names:
+                    rel = os.path.relpath(os.path.join(root, name), source_path)
+                    with open(os.path.join(root, name), "rb") as src:
+                        self._ingest(src, os.path.join(pack_stage, rel))
+            err = self._publish(pack_stage, base_id, version)
+            if err:
+                return {"success": False, "errors": [err]}
+        finally:
+            self._discard_stage(stage_path)
             
-        index = self.load_index()
-        if base_id not in index:
-            index[base_id] = {"active_version": version, "versions": []}
-        
-        if version not in index[base_id]["versions"]:
-            index[base_id]["versions"].append(version)
-        
-        if auto_switch:
-            index[base_id]["active_version"] = version
-        
-        self.save_index(index)
-        return {"success": True, "persona_id": base_id, "version": version, "active_version": index[base_id]["active_version"]}
+        return self._register(base_id, version, auto_switch)
 
     def import_zip(self, zip_path: str) -> Dict[str, Any]:
+        """
+        Validates the pack straight from the archive, streams its members into a stage under
+        installed/.staging and renames the stage into place. Nothing is left behind on failure.
+        """
         if not os.path.exists(zip_path):
             return {"success": False, "errors": [f"ZIP file not found: {zip_path}"]}
         
-        ts = datetime.datetime.now().strftime("%Y%m%d_%H%M%S_%f")
-        extract_path = os.path.join(self.tmp_dir, ts)
-        os.makedirs(extract_path, exist_ok=True)
-        
+        stage_path = None
         try:
             with zipfile.ZipFile(zip_path, 'r') as zip_ref:
-                # Security check for path traversal
-                for member in zip_ref.namelist():
-                    filename = os.path.basename(member)
-                    if not filename: continue # directory
-                    
+                members = [m for m in zip_ref.infolist() if not m.is_dir()]
+                if len(members) > MAX_ZIP_ENTRIES:
+                    return {"success": False, "errors": [f"ZIP has {len(members)} entries (limit {MAX_ZIP_ENTRIES})."]}
+
+                total = 0
+                for m in members:
+                    name = m.filename.replace("\\", "/")
                     # Ensure no ".." or absolute paths
-                    if member.startswith("/") or ".." in member:
+                    if name.startswith("/") or ".." in name.split("/") or ":" in name:
                         return {"success": False, "errors": ["Zip member path is suspicious (traversal blocked)."]}
-                
-                zip_ref.extractall(extract_path)
-            
-            # Check if there is a root folder inside the zip
-            content = os.listdir(extract_path)
-            work_dir = extract_path
-            if len(content) == 1 and os.path.isdir(os.path.join(extract_path, content[0])):
-                work_dir = os.path.join(extract_path, content[0])
-            
-            # Install
-            return self.install(work_dir, auto_switch=False)
+                    if m.file_size > MAX_ZIP_MEMBER_BYTES:
+                        return {"success": False, "errors": [f"ZIP member {m.filename} exceeds {MAX_ZIP_MEMBER_BYTES} bytes."]}
+                    total += m.file_size
+                if total > MAX_ZIP_TOTAL_BYTES:
+                    return {"success": False, "errors": [f"ZIP expands to {total} bytes (limit {MAX_ZIP_TOTAL_BYTES})."]}
+
+                # A single top-level folder is treated as the pack root
+                tops = {m.filename.replace("\\", "/").split("/", 1)[0] for m in members}
+                prefix = ""
+                if len(tops) == 1 and all("/" in m.filename.replace("\\", "/") for m in members):
+                    prefix = tops.pop() + "/"
+                by_name = {m.filename.replace("\\", "/"): m for m in members}
+
+                read_lock = threading.Lock()
+                def read_json(filename: str) -> Any:
+                    info = by_name.get(prefix + filename.replace("\\", "/"))
+                    if info is None:
+                        raise FileNotFoundError(filename)
+                    if info.file_size > MAX_JSON_MEMBER_BYTES:
+                        raise ValueError(f"{filename} exceeds {MAX_JSON_MEMBER_BYTES} bytes")
+                    with read_lock:
+                        raw = zip_ref.read(info)
+                    return json.loads(raw.decode("utf-8"))
+
+                try:
+                    pack = read_json("persona.pack.json")
+                except FileNotFoundError:
+                    return {"success": False, "errors": ["Missing persona.pack.json"]}
+                except (ValueError, UnicodeDecodeError) as e:
+                    return {"success": False, "errors": [f"Invalid JSON: {str(e)}"]}
+
+                errors = self._validate_pack_data(pack, read_json)
+                if errors:
+                    return {"success": False, "errors": errors}
+
+                base_id = pack.get("id").split("@")[0]
+                version = str(pack.get("version"))
+                if os.path.exists(os.path.join(self.installed_dir, f"{base_id}@{version}")):
+                    return {"success": False, "errors": [f"Version {version} of {base_id} already exists."]}
+
+                stage_path = self._new_stage()
+                pack_stage = os.path.join(stage_path, "pack")
+                written = 0
+                for name, info in by_name.items():
+                    if not name.startswith(prefix):
+                        continue
+                    dest = os.path.join(pack_stage, *name[len(prefix):].split("/"))
+                    with zip_ref.open(info) as src:
+                        try:
+                            written += self._ingest(src, dest, limit=MAX_ZIP_TOTAL_BYTES - written)
+                        except ValueError:
+                            return {"success": False, "errors": [f"ZIP expands past {MAX_ZIP_TOTAL_BYTES} bytes."]}
+
+            err = self._publish(pack_stage, base_id, version)
+            if err:
+                return {"success": False, "errors": [err]}
+            return self._register(base_id, version, auto_switch=False)
             
         except zipfile.BadZipFile:
             return {"success": False, "errors": ["Invalid or corrupted ZIP file."]}
         except Exception as e:
             return {"success": False, "errors": [f"Unexpected import error: {str(e)}"]}
         finally:
-            # Cleanup tmp if needed? Requirements don't specify, but good practice.
-            # shutil.rmtree(extract_path, ignore_errors=True)
-            pass
+            if stage_path:
+                self._discard_stage(stage_path)
 
     def rollback(self, base_id: str, version: str) -> Dict[str, Any]:
         index = self.load_index()
@@ -1,19 +1,86 @@
 import os
 import json
-from typing import List, Dict, Any, Optional
+import time
+from typing import List, Dict, Any, Optional, Callable, Tuple
 import datetime
 from orca_runtime.persona_installer import PersonaInstaller
 
+def _mtime(path: str) -> Optional[Tuple[int, int]]:
+    try:
+        st = os.stat(path)
+        return st.st_mtime_ns, st.st_size
+    except OSError:
+        return None
+
+class PersonaCache:
+    """
+    Parsed persona data keyed by name. Installer and grant writes invalidate explicitly, so
+    between those a hit does no disk I/O; each entry is also revalidated against its files'
+    mtimes (a stat, no reads or parsing) at most every revalidate_s seconds, which bounds how
+    long an edit made outside the runtime stays invisible. revalidate_s=0 stats on every hit.
+    Cached values are shared: callers must treat them as read-only.
+    """
+    def __init__(self, revalidate_s: float = 5.0):
+        self.revalidate_s = revalidate_s
+        self.entries: Dict[str, Tuple[Any, Dict[str, Any], float]] = {}
+        self.counters = {"hits": 0, "misses": 0, "invalidations": 0}
+
+    def get(self, key: str, build: Callable[[], Tuple[Any, List[str]]]) -> Any:
+        entry = self.entries.get(key)
+        now = time.time()
+        if entry is not None:
+            value, deps, checked_at = entry
+            if now - checked_at < self.revalidate_s or all(_mtime(p) == m for p, m in deps.items()):
+                if now - checked_at >= self.revalidate_s:
+                    self.entries[key] = (value, deps, now)
+                self.counters["hits"] += 1
+                return value
+        self.counters["misses"] += 1
+        value, paths = build()
+        self.entries[key] = (value, {p: _mtime(p) for p in paths}, now)
+        return value
+
+    def invalidate(self, key: Optional[str] = None):
+        self.counters["invalidations"] += 1
+        if key is None:
+            self.entries.clear()
+        else:
+            self.entries.pop(key, None)
+
+    def stats(self) -> Dict[str, Any]:
+        return {**self.counters, "entries": len(self.entries)}
+
+def _read_json(path: str, default: Any) -> Any:
+    try:
+        with open(path, "r") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return default
+
 class PersonaRuntime:
-    def __init__(self, workspace_root: str):
+    def __init__(self, workspace_root: str, revalidate_s: float = 5.0):
         self.root = workspace_root
         self.personas_dir = os.path.join(workspace_root, "orca", "personas", "installed")
         self.registry_path = os.path.join(workspace_root, "orca", "ui", "module_registry.json")
         self.grants_path = os.path.join(workspace_root, "orca", "licenses", "grants.json")
+        self.catalog_path = os.path.join(workspace_root, "orca", "marketplace", "catalog.json")
         self.installer = PersonaInstaller(workspace_root)
+        self.cache = PersonaCache(revalidate_s)
+        # (persona dir, caps, registry version) -> (pack it was built from, filtered layout)
+        self.layout_memo: Dict[Tuple[str, Tuple[str, ...], int], Tuple[Dict[str, Any], Dict[str, Any]]] = {}
+        self.registry_version = 0
+        # Installs, imports and rollbacks change what every cached view resolves to
+        self.installer.set_on_change(self._on_installer_change)
+
+    def _on_installer_change(self, event: str):
+        self.cache.invalidate()
+        self.layout_memo.clear()
+
+    def _load_index(self) -> Dict[str, Any]:
+        return self.cache.get("index", lambda: (self.installer.load_index(), [self.installer.index_path, self.personas_dir]))
 
     def list_installed_personas(self) -> List[str]:
-        index = self.installer.load_index()
+        index = self._load_index()
         # Return the directories (id@version) for all active personas
         active_dirs = []
         for pid, meta in index.items():
@@ -28,66 +95,98 @@ class PersonaRuntime:
         
         return active_dirs
 
-    def load_persona(self, persona_id: str) -> Optional[Dict[str, Any]]:
+    def _resolve_dir(self, persona_id: str) -> Optional[str]:
         # Handle persona_id being either directory name (id@version) or base_id
-        actual_dir = persona_id
-        if "@" not in persona_id:
-            index = self.installer.load_index()
-            if persona_id in index:
-                actual_dir = f"{persona_id}@{index[persona_id]['active_version']}"
-            else:
-                return None
-
-        pack_path = os.path.join(self.personas_dir, actual_dir, "persona.pack.json")
-        if not os.path.exists(pack_path):
+        if "@" in persona_id:
+            return persona_id
+        index = self._load_index()
+        if persona_id in index:
+            return f"{persona_id}@{index[persona_id]['active_version']}"
+        return None
+
+    def load_persona(self, persona_id: str) -> Optional[Dict[str, Any]]:
+        actual_dir = self._resolve_dir(persona_id)
+        if actual_dir is None:
             return None
+
+        return self.cache.get(f"pack:{actual_dir}", lambda: self._read_persona(actual_dir))
+
+    def _read_persona(self, actual_dir: str) -> Tuple[Optional[Dict[str, Any]], List[str]]:
+        base_dir = os.path.join(self.personas_dir, actual_dir)
+        pack_path = os.path.join(base_dir, "persona.pack.json")
+        if not os.path.exists(pack_path):
+            return None, [pack_path]
         
         with open(pack_path, "r") as f:
             pack = json.load(f)
         
         # Load sub-components
-        base_dir = os.path.join(self.personas_dir, actual_dir)
+        deps = [pack_path]
         for key, filename in pack.get("components", {}).items():
             comp_path = os.path.join(base_dir, filename)
+            deps.append(comp_path)
             if os.path.exists(comp_path):
                 with open(comp_path, "r") as f:
                     pack[key] = json.load(f)
         
-        return pack
+        return pack, deps
 
     def get_user_grants(self) -> List[str]:
-        if not os.path.exists(self.grants_path):
-            return []
-        try:
-            with open(self.grants_path, "r") as f:
-                data = json.load(f)
-                raw_grants = data.get("grants", [])
-                # Return normalized list of SKUs for checking permissions
-                skus = []
-                for g in raw_grants:
-                    if isinstance(g, str):
-                        skus.append(g)
-                    elif isinstance(g, dict):
-                        skus.append(g.get("sku"))
-                return [s for s in skus if s]
-        except:
-            return []
+        raw_grants = self.get_full_grants()
+        # Return normalized list of SKUs for checking permissions
+        skus = []
+        for g in raw_grants:
+            if isinstance(g, str):
+                skus.append(g)
+            elif isinstance(g, dict):
+                skus.append(g.get("sku"))
+        return [s for s in skus if s]
 
     def get_full_grants(self) -> List[Dict[str, Any]]:
-        if not os.path.exists(self.grants_path):
-            return []
-        try:
-            with open(self.grants_path, "r") as f:
-                data = json.load(f)
-                return data.get("grants", [])
-        except:
-            return []
+        def build():
+            data = _read_json(self.grants_path, {})
+            grants = data.get("grants", []) if isinstance(data, dict) else []
+            return grants, [self.grants_path]
+        return list(self.cache.get("grants", build))
 
     def get_module_registry(self) -> Dict[str, Any]:
-        if not os.path.exists(self.registry_path):
-            return {}
-        with open(self.registry_path, "r") as f:
-            return json.load(f)
+        return self.cache.get("registry", lambda: (_read_json(self.registry_path, {}), [self.registry_path]))
+
+    def get_compiled_registry(self) -> Dict[str, Any]:
+        """
+        Module capability requirements as bitmasks: each capability named in the registry gets a
+        bit, each module the OR of its required bits. Rebuilt (with a new version) when the registry changes.
+        """
+        def build():
+            registry = self.get_module_registry()
+            cap_bits: Dict[str, int] = {}
+            module_masks: Dict[str, int] = {}
+            for module_id, entry in registry.items():
+                if not entry:
+                    continue # An empty or null entry disallows the module, like a missing one
+                mask = 0
+                for cap in entry.get("capabilities", []):
+                    if cap not in cap_bits:
+                        cap_bits[cap] = 1 << len(cap_bits)
+                    mask |= cap_bits[cap]
+                module_masks[module_id] = mask
+            self.registry_version += 1
+            return {"version": self.registry_version, "cap_bits": cap_bits, "module_masks": module_masks}, [self.registry_path]
+        return self.cache.get("registry_compiled", build)
+
+    def get_sku_index(self) -> Dict[str, str]:
+        """SKU -> first installed (active) persona carrying it."""
+        def build():
+            index: Dict[str, str] = {}
+            deps = [self.installer.index_path, self.personas_dir]
+            for pid in self.list_installed_personas():
+                pack = self.load_persona(pid)
+                deps.append(os.path.join(self.personas_dir, pid, "persona.pack.json"))
+                sku = (pack or {}).get("entitlement", {}).get("sku")
+                if sku and sku not in index:
+                    index[sku] = pid
+            return index, deps
+        return self.cache.get("sku_index", build)
 
     def can_load_persona(self, pack: Dict[str, Any], user_capabilities: List[str]) -> Dict[str, Any]:
         entitlement = pack.get("entitlement", {})
@@ -104,25 +203,43 @@ class PersonaRuntime:
         return {"allowed": False, "locked_reason": "LICENSE_REQUIRED", "sku": sku}
 
     def filter_layout_by_registry(self, layout: Dict[str, Any], user_capabilities: List[str]) -> Dict[str, Any]:
-        registry = self.get_module_registry()
-        user_caps_set = set(user_capabilities)
+        compiled = self.get_compiled_registry()
+        cap_bits = compiled["cap_bits"]
+        module_masks = compiled["module_masks"]
+        user_mask = 0
+        for cap in user_capabilities:
+            user_mask |= cap_bits.get(cap, 0)
         
         filtered_modules = []
         for module in layout.get("modules", []):
-            module_id = module.get("id")
-            reg_entry = registry.get(module_id)
-            
-            if not reg_entry:
+            mask = module_masks.get(module.get("id"))
+            if mask is None:
                 continue # Disallow if not in registry
-            
-            req_caps = reg_entry.get("capabilities", [])
-            if all(cap in user_caps_set for cap in req_caps):
+            if mask & ~user_mask == 0:
                 filtered_modules.append(module)
         
         new_layout = layout.copy()
         new_layout["modules"] = filtered_modules
         return new_layout
 
+    def get_filtered_layout(self, persona_id: str, user_capabilities: List[str]) -> Optional[Dict[str, Any]]:
+        """Memoized filter_layout_by_registry for an installed persona. The result is shared; treat it as read-only."""
+        actual_dir = self._resolve_dir(persona_id)
+        pack = self.load_persona(actual_dir) if actual_dir else None
+        if not pack:
+            return None
+        compiled = self.get_compiled_registry()
+        key = (actual_dir, tuple(sorted(set(user_capabilities))), compiled["version"])
+        hit = self.layout_memo.get(key)
+        # A reloaded pack is a new object, so identity doubles as the persona version check
+        if hit is not None and hit[0] is pack:
+            return hit[1]
+        if len(self.layout_memo) >= 256:
+            self.layout_memo.clear()
+        filtered = self.filter_layout_by_registry(pack.get("layout", {"modules": []}), user_capabilities)
+        self.layout_memo[key] = (pack, filtered)
+        return filtered
+
     def switch_persona(self, persona_id: str, user_capabilities: List[str]) -> Dict[str, Any]:
         pack = self.load_persona(persona_id)
         if not pack:
@@ -133,8 +250,7 @@ class PersonaRuntime:
         # If locked, we still return the structure but mark as PREVIEW
         # and we filter the layout based on capabilities only.
         
-        raw_layout = pack.get("layout", {"modules": []})
-        filtered_layout = self.filter_layout_by_registry(raw_layout, user_capabilities)
+        filtered_layout = self.get_filtered_layout(persona_id, user_capabilities)
         
         result = {
             "id": pack["id"],
@@ -152,27 +268,17 @@ class PersonaRuntime:
         return result
 
     def get_catalog(self) -> List[Dict[str, Any]]:
-        catalog_path = os.path.join(self.root, "orca", "marketplace", "catalog.json")
-        if not os.path.exists(catalog_path):
-            return []
-        
-        with open(catalog_path, "r") as f:
-            data = json.load(f)
-            skus = data.get("catalog", [])
+        data = self.cache.get("catalog", lambda: (_read_json(self.catalog_path, {}), [self.catalog_path]))
+        skus = data.get("catalog", [])
         
         grants = self.get_user_grants()
-        installed_personas = self.list_installed_personas()
+        sku_index = self.get_sku_index()
         
         results = []
         for item in skus:
             sku_id = item.get("sku")
             # Find matching installed persona for this SKU if any
-            target_persona = None
-            for pid in installed_personas:
-                pack = self.load_persona(pid)
-                if pack and pack.get("entitlement", {}).get("sku") == sku_id:
-                    target_persona = pid
-                    break
+            target_persona = sku_index.get(sku_id)
             
             is_unlocked = sku_id in grants or item.get("mode") == "free"
             
@@ -209,4 +315,5 @@ class PersonaRuntime:
         os.makedirs(os.path.dirname(self.grants_path), exist_ok=True)
         with open(self.grants_path, "w") as f:
             json.dump({"grants": full_grants}, f, indent=2)
+        self.cache.invalidate("grants")
         return True
@@ -1,3 +1,5 @@
 from .registry import ProviderRegistry
 from .base import Provider
 from .impl import Ollama, LMStudio, Orpheus
+from .pool import ClientPool, pools
+from .health import HealthMonitor, CircuitBreaker
@@ -0,0 +1,145 @@
+import asyncio
+import time
+from collections import deque
+from typing import Dict, Any, Optional
+from .registry import ProviderRegistry
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+class CircuitBreaker:
+    """Opens after N consecutive failures; after reset_timeout lets a single trial through."""
+    def __init__(self, failure_threshold: int = 3, reset_timeout: float = 15.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self.trips = 0
+
+    def allow(self) -> bool:
+        if self.state == CLOSED:
+            return True
+        if self.state == OPEN and time.time() - self.opened_at >= self.reset_timeout:
+            self.state = HALF_OPEN
+            return True
+        return False
+
+    def record(self, ok: bool):
+        if ok:
+            self.state = CLOSED
+            self.failures = 0
+            return
+        self.failures += 1
+        if self.state == HALF_OPEN or self.failures >= self.failure_threshold:
+            if self.state != OPEN:
+                self.trips += 1
+            self.state = OPEN
+            self.opened_at = time.time()
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "state": self.state,
+            "consecutive_failures": self.failures,
+            "trips": self.trips,
+            "retry_in_s": max(0.0, round(self.reset_timeout - (time.time() - self.opened_at), 1)) if self.state == OPEN else 0.0
+        }
+
+class HealthMonitor:
+    """
+    Probes every registered provider concurrently on an interval and keeps the latest
+    result, a rolling latency history and a circuit breaker per provider in memory.
+    """
+    def __init__(self, registry: ProviderRegistry, interval: float = 5.0, history: int = 60,
+                 failure_threshold: int = 3, reset_timeout: float = 15.0):
+        self.registry = registry
+        self.interval = interval
+        self.history_size = history
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.latest: Dict[str, Dict[str, Any]] = {}
+        self.history: Dict[str, deque] = {}
+        self.breakers: Dict[str, CircuitBreaker] = {}
+        self.task: Optional[asyncio.Task] = None
+
+    def breaker(self, pid: str) -> CircuitBreaker:
+        if pid not in self.breakers:
+            self.breakers[pid] = CircuitBreaker(self.failure_threshold, self.reset_timeout)
+        return self.breakers[pid]
+
+    def allow(self, pid: str) -> bool:
+        """False while the provider's breaker is open; callers should fail fast."""
+        return self.breaker(pid).allow()
+
+    def record_result(self, pid: str, ok: bool):
+        self.breaker(pid).record(ok)
+
+    def _store(self, pid: str, result: Dict[str, Any]):
+        result = dict(result)
+        result["checked_at"] = time.time()
+        self.latest[pid] = result
+        hist = self.history.setdefault(pid, deque(maxlen=self.history_size))
+        hist.append((result["checked_at"], result.get("latency_ms", 0) if result.get("ok") else None))
+        self.record_result(pid, bool(result.get("ok")))
+
+    async def probe(self, pid: str) -> Dict[str, Any]:
+        prov = self.registry.get(pid)
+        if not prov:
+            return {"ok": False, "detail": "unknown", "latency_ms": 0}
+        try:
+            result = await prov.health()
+        except Exception as e:
+            result = {"ok": False, "detail": str(e), "latency_ms": 0}
+        self._store(pid, result)
+        return result
+
+    async def probe_all(self):
+        await asyncio.gather(*(self.probe(pid) for pid in list(self.registry.providers)))
+
+    async def get(self, pid: str) -> Dict[str, Any]:
+        """Latest cached result; probes once if nothing has been recorded yet."""
+        if pid in self.latest:
+            return self.latest[pid]
+        if not self.registry.get(pid):
+            return {"ok": False, "detail": "unknown", "latency_ms": 0}
+        return await self.probe(pid)
+
+    async def _run(self):
+        while True:
+            try:
+                await self.probe_all()
+            except Exception as e:
+                print(f"Health monitor probe failed: {e}")
+            await asyncio.sleep(self.interval)
+
+    def start(self):
+        if self.task is None or self.task.done():
+            self.task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self.task:
+            self.task.cancel()
+            try:
+                await self.task
+            except asyncio.CancelledError:
+                pass
+            self.task = None
+
+    def snapshot(self) -> Dict[str, Any]:
+        out = {}
+        for pid in self.registry.providers:
+            samples = [lat for _, lat in self.history.get(pid, []) if lat is not None]
+            total = len(self.history.get(pid, []))
+            ordered = sorted(samples)
+            out[pid] = {
+                "latest": self.latest.get(pid),
+                "breaker": self.breaker(pid).to_dict(),
+                "latency_ms": {
+                    "avg": round(sum(samples) / len(samples), 1) if samples else None,
+                    "p95": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))], 1) if ordered else None,
+                    "last": [round(lat, 1) if lat is not None else None for _, lat in list(self.history.get(pid, []))[-10:]]
+                },
+                "availability": round(len(samples) / total, 3) if total else None
+            }
+        return out
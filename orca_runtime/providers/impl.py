@@ -1,7 +1,7 @@
-import httpx
 import time
 import os
 from .base import Provider
+from .pool import pools
 from typing import List, Dict, Any
 
 class Ollama(Provider):
@@ -12,10 +12,9 @@ class Ollama(Provider):
 
     async def list_models(self) -> List[str]:
         try:
-            async with httpx.AsyncClient(timeout=1.0) as client:
-                r = await client.get(f"{self.base_url}/tags")
-                if r.status_code == 200:
-                    return [m['name'] for m in r.json().get('models', [])]
+            r = await pools.client("ollama").get(f"{self.base_url}/tags", timeout=1.0)
+            if r.status_code == 200:
+                return [m['name'] for m in r.json().get('models', [])]
         except:
              pass
         return []
@@ -23,12 +22,11 @@ class Ollama(Provider):
     async def health(self) -> Dict[str, Any]:
         start = time.time()
         try:
-            async with httpx.AsyncClient(timeout=1.0) as client:
-                r = await client.get(f"{self.base_url}/tags")
-                ok = r.status_code == 200
-                latency = (time.time() - start) * 1000
-                if ok: return {"ok": True, "detail": "up", "latency_ms": latency}
-                return {"ok": False, "detail": f"http {r.status_code}", "latency_ms": 0}
+            r = await pools.client("ollama").get(f"{self.base_url}/tags", timeout=1.0)
+            ok = r.status_code == 200
+            latency = (time.time() - start) * 1000
+            if ok: return {"ok": True, "detail": "up", "latency_ms": latency}
+            return {"ok": False, "detail": f"http {r.status_code}", "latency_ms": 0}
         except Exception as e:
             return {"ok": False, "detail": str(e), "latency_ms": 0}
 
@@ -56,11 +54,10 @@ class LMStudio(Provider):
 
     async def list_models(self) -> List[str]:
         try:
-            async with httpx.AsyncClient(timeout=1.0) as client:
-                r = await client.get(f"{self.base_url}/models")
-                if r.status_code == 200:
-                    data = r.json()
-                    return [m['id'] for m in data.get('data', [])]
+            r = await pools.client("lm_studio").get(f"{self.base_url}/models", timeout=1.0)
+            if r.status_code == 200:
+                data = r.json()
+                return [m['id'] for m in data.get('data', [])]
         except:
             pass
         return []
@@ -68,12 +65,11 @@ class LMStudio(Provider):
     async def health(self) -> Dict[str, Any]:
         start = time.time()
         try:
-            async with httpx.AsyncClient(timeout=1.0) as client:
-                r = await client.get(f"{self.base_url}/models")
-                ok = r.status_code == 200
-                latency = (time.time() - start) * 1000
-                if ok: return {"ok": True, "detail": "up", "latency_ms": latency}
-                return {"ok": False, "detail": f"http error", "latency_ms": 0}
+            r = await pools.client("lm_studio").get(f"{self.base_url}/models", timeout=1.0)
+            ok = r.status_code == 200
+            latency = (time.time() - start) * 1000
+            if ok: return {"ok": True, "detail": "up", "latency_ms": latency}
+            return {"ok": False, "detail": f"http error", "latency_ms": 0}
         except Exception as e:
              return {"ok": False, "detail": "connection refused", "latency_ms": 0}
 
@@ -88,22 +84,20 @@ class Orpheus(Provider):
     async def list_models(self) -> List[str]:
         # Orpheus relies on LM Studio loaded models when using the LM Studio backend.
         try:
-            async with httpx.AsyncClient(timeout=1.0) as client:
-                r = await client.get(f"{self.lmstudio_url}/models")
-                if r.status_code == 200:
-                    data = r.json()
-                    return [m["id"] for m in data.get("data", [])]
+            r = await pools.client("lm_studio").get(f"{self.lmstudio_url}/models", timeout=1.0)
+            if r.status_code == 200:
+                data = r.json()
+                return [m["id"] for m in data.get("data", [])]
         except: pass
         return []
 
     async def health(self) -> Dict[str, Any]:
         start = time.time()
         try:
-            async with httpx.AsyncClient(timeout=1.0) as client:
-                r = await client.get(f"{self.base_url}/health")
-                ok = r.status_code == 200
-                latency = (time.time() - start) * 1000
-                if ok: return {"ok": True, "detail": "up", "latency_ms": latency}
-                return {"ok": False, "detail": "error", "latency_ms": 0}
+            r = await pools.client("orpheus").get(f"{self.base_url}/health", timeout=1.0)
+            ok = r.status_code == 200
+            latency = (time.time() - start) * 1000
+            if ok: return {"ok": True, "detail": "up", "latency_ms": latency}
+            return {"ok": False, "detail": "error", "latency_ms": 0}
         except Exception as e:
              return {"ok": False, "detail": "down", "latency_ms": 0}
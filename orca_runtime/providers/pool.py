@@ -0,0 +1,145 @@
+import httpx
+from typing import Dict, Any, Optional
+
+# Per-upstream pool defaults. Override any key via the "pools" section of orca_config.json.
+DEFAULT_POOL_SETTINGS: Dict[str, Dict[str, Any]] = {
+    "ollama": {"max_connections": 10, "max_keepalive": 5, "keepalive_expiry": 30.0, "connect_timeout": 2.0, "timeout": 60.0},
+    "lm_studio": {"max_connections": 10, "max_keepalive": 5, "keepalive_expiry": 30.0, "connect_timeout": 2.0, "timeout": 60.0},
+    "orpheus": {"max_connections": 4, "max_keepalive": 2, "keepalive_expiry": 30.0, "connect_timeout": 2.0, "timeout": 120.0},
+}
+
+class _MeteredStream(httpx.AsyncByteStream):
+    """Response body wrapper that releases the in-use slot once the body is closed."""
+    def __init__(self, inner: httpx.AsyncByteStream, transport: "_MeteredTransport"):
+        self.inner = inner
+        self.transport = transport
+        self.released = False
+
+    async def __aiter__(self):
+        async for chunk in self.inner:
+            yield chunk
+
+    async def aclose(self):
+        try:
+            await self.inner.aclose()
+        finally:
+            if not self.released:
+                self.released = True
+                self.transport.in_use -= 1
+
+class _MeteredTransport(httpx.AsyncBaseTransport):
+    """Wraps the real HTTP transport to count in-flight requests and pool waits."""
+    def __init__(self, inner: httpx.AsyncHTTPTransport, max_connections: int):
+        self.inner = inner
+        self.max_connections = max_connections
+        self.in_use = 0
+        self.requests = 0
+        self.waits = 0
+        self.errors = 0
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        if self.in_use >= self.max_connections:
+            self.waits += 1
+        self.in_use += 1
+        self.requests += 1
+        try:
+            response = await self.inner.handle_async_request(request)
+        except Exception:
+            self.in_use -= 1
+            self.errors += 1
+            raise
+        return httpx.Response(
+            status_code=response.status_code,
+            headers=response.headers,
+            stream=_MeteredStream(response.stream, self),
+            extensions=response.extensions,
+        )
+
+    def open_connections(self) -> Dict[str, int]:
+        # httpcore does not expose pool internals through httpx; best effort only.
+        pool = getattr(self.inner, "_pool", None)
+        conns = list(getattr(pool, "connections", []) or [])
+        idle = 0
+        for c in conns:
+            try:
+                if c.is_idle(): idle += 1
+            except Exception:
+                pass
+        return {"open": len(conns), "idle": idle}
+
+    async def aclose(self):
+        await self.inner.aclose()
+
+class ClientPool:
+    """
+    One long-lived httpx.AsyncClient per upstream (ollama, lm_studio, orpheus).
+    Clients are created lazily on first use or eagerly by start(), and closed by aclose().
+    """
+    def __init__(self, settings: Optional[Dict[str, Dict[str, Any]]] = None):
+        self.settings: Dict[str, Dict[str, Any]] = {k: dict(v) for k, v in DEFAULT_POOL_SETTINGS.items()}
+        self.clients: Dict[str, httpx.AsyncClient] = {}
+        self.transports: Dict[str, _MeteredTransport] = {}
+        if settings:
+            self.configure(settings)
+
+    def configure(self, settings: Dict[str, Dict[str, Any]]):
+        """Merge per-upstream overrides. Takes effect for clients created afterwards."""
+        for name, overrides in (settings or {}).items():
+            base = self.settings.setdefault(name, dict(DEFAULT_POOL_SETTINGS["ollama"]))
+            base.update(overrides or {})
+
+    def _build(self, name: str) -> httpx.AsyncClient:
+        s = self.settings.get(name) or self.settings.setdefault(name, dict(DEFAULT_POOL_SETTINGS["ollama"]))
+        limits = httpx.Limits(
+            max_connections=s["max_connections"],
+            max_keepalive_connections=s["max_keepalive"],
+            keepalive_expiry=s["keepalive_expiry"],
+        )
+        transport = _MeteredTransport(httpx.AsyncHTTPTransport(limits=limits), s["max_connections"])
+        timeout = httpx.Timeout(s["timeout"], connect=s["connect_timeout"])
+        self.transports[name] = transport
+        return httpx.AsyncClient(transport=transport, timeout=timeout)
+
+    def client(self, name: str) -> httpx.AsyncClient:
+        c = self.clients.get(name)
+        if c is None or c.is_closed:
+            c = self._build(name)
+            self.clients[name] = c
+        return c
+
+    async def start(self):
+        for name in self.settings:
+            self.client(name)
+
+    async def aclose(self):
+        clients = list(self.clients.values())
+        self.clients.clear()
+        for c in clients:
+            try:
+                await c.aclose()
+            except Exception:
+                pass
+
+    def stats(self) -> Dict[str, Any]:
+        out = {}
+        for name, s in self.settings.items():
+            t = self.transports.get(name)
+            c = self.clients.get(name)
+            if t is None or c is None or c.is_closed:
+                out[name] = {"open": False, "limits": s}
+                continue
+            conns = t.open_connections()
+            out[name] = {
+                "open": True,
+                "in_use": t.in_use,
+                "idle": conns["idle"],
+                "connections": conns["open"],
+                "waits": t.waits,
+                "requests": t.requests,
+                "errors": t.errors,
+                "limits": s,
+            }
+        return out
+
+# Shared instance used by providers and the runtime adapters.
+pools = ClientPool()
@@ -0,0 +1,153 @@
+import os
+import json
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Dict, Any, Optional
+
+def normalize_text(text: str) -> str:
+    # Collapse whitespace so "Hello  there\n" and "Hello there" share one entry
+    return " ".join((text or "").split())
+
+def cache_key(text: str, voice: str, model: Optional[str], speed: Optional[float], response_format: str = "wav") -> str:
+    ident = {
+        "text": normalize_text(text),
+        "voice": voice or "",
+        "model": model or "",
+        "speed": speed,
+        "format": response_format,
+    }
+    return hashlib.sha256(json.dumps(ident, sort_keys=True).encode("utf-8")).hexdigest()
+
+class TTSCache:
+    """
+    Content-addressed audio cache: size-bounded LRU on disk plus a small in-memory hot tier.
+    Recency survives restarts through file mtimes.
+    """
+    def __init__(self, cache_dir: str, max_bytes: int = 512 * 1024**2, hot_max_bytes: int = 32 * 1024**2, hot_item_max_bytes: int = 2 * 1024**2):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.hot_max_bytes = hot_max_bytes
+        self.hot_item_max_bytes = hot_item_max_bytes
+
+        self.lock = threading.Lock()
+        self.disk: "OrderedDict[str, int]" = OrderedDict() # key -> size, oldest first
+        self.hot: "OrderedDict[str, bytes]" = OrderedDict()
+        self.disk_bytes = 0
+        self.hot_bytes = 0
+        self.counters = {"hits_hot": 0, "hits_disk": 0, "misses": 0, "stores": 0, "evictions": 0}
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+        self._scan()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key[:2], f"{key}.wav")
+
+    def _scan(self):
+        entries = []
+        for root, _, files in os.walk(self.cache_dir):
+            for name in files:
+                if not name.endswith(".wav"): continue
+                try:
+                    st = os.stat(os.path.join(root, name))
+                except OSError:
+                    continue
+                entries.append((st.st_mtime, name[:-4], st.st_size))
+        for _, key, size in sorted(entries):
+            self.disk[key] = size
+            self.disk_bytes += size
+        self._evict_disk()
+
+    def _evict_disk(self):
+        while self.disk_bytes > self.max_bytes and self.disk:
+            key, size = self.disk.popitem(last=False)
+            self.disk_bytes -= size
+            self.counters["evictions"] += 1
+            self._drop_hot(key)
+            try:
+                os.remove(self._path(key))
+            except OSError:
+                pass
+
+    def _drop_hot(self, key: str):
+        data = self.hot.pop(key, None)
+        if data is not None:
+            self.hot_bytes -= len(data)
+
+    def _promote(self, key: str, data: bytes):
+        if len(data) > self.hot_item_max_bytes:
+            return
+        self._drop_hot(key)
+        self.hot[key] = data
+        self.hot_bytes += len(data)
+        while self.hot_bytes > self.hot_max_bytes and self.hot:
+            _, old = self.hot.popitem(last=False)
+            self.hot_bytes -= len(old)
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self.lock:
+            data = self.hot.get(key)
+            if data is not None:
+                self.hot.move_to_end(key)
+                if key in self.disk: self.disk.move_to_end(key)
+                self.counters["hits_hot"] += 1
+                return data
+            if key not in self.disk:
+                self.counters["misses"] += 1
+                return None
+
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+            os.utime(path) # persist recency
+        except OSError:
+            with self.lock:
+                size = self.disk.pop(key, None)
+                if size is not None: self.disk_bytes -= size
+                self.counters["misses"] += 1
+            return None
+
+        with self.lock:
+            if key in self.disk: self.disk.move_to_end(key)
+            self._promote(key, data)
+            self.counters["hits_disk"] += 1
+        return data
+
+    def put(self, key: str, data: bytes):
+        if not data or len(data) > self.max_bytes:
+            return
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+
+        with self.lock:
+            old = self.disk.pop(key, None)
+            if old is not None: self.disk_bytes -= old
+            self.disk[key] = len(data)
+            self.disk_bytes += len(data)
+            self.counters["stores"] += 1
+            self._promote(key, data)
+            self._evict_disk()
+
+    def contains(self, key: str) -> bool:
+        with self.lock:
+            return key in self.hot or key in self.disk
+
+    def stats(self) -> Dict[str, Any]:
+        with self.lock:
+            lookups = self.counters["hits_hot"] + self.counters["hits_disk"] + self.counters["misses"]
+            hits = self.counters["hits_hot"] + self.counters["hits_disk"]
+            return {
+                **self.counters,
+                "hit_ratio": round(hits / lookups, 3) if lookups else 0.0,
+                "entries": len(self.disk),
+                "bytes_disk": self.disk_bytes,
+                "bytes_hot": self.hot_bytes,
+                "entries_hot": len(self.hot),
+                "max_bytes": self.max_bytes,
+                "hot_max_bytes": self.hot_max_bytes,
+            }
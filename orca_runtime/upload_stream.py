@@ -0,0 +1,96 @@
+import asyncio
+from collections import deque
+from typing import Dict, Optional
+
+try:
+    import python_multipart as multipart
+    from python_multipart.multipart import parse_options_header
+except ModuleNotFoundError: # older python-multipart releases
+    import multipart
+    from multipart.multipart import parse_options_header
+
+class MultipartFileStream:
+    """
+    One file field of a multipart/form-data request, read as the body arrives instead of being
+    spooled to a temp file first. open() runs on the event loop up to the field's headers;
+    read() blocks, so call it from a worker thread: it pulls the next body chunk via the loop.
+    Reading stops wherever the consumer stops, so an oversized upload is abandoned mid-body.
+    """
+    def __init__(self, request, field: str = "file"):
+        content_type, params = parse_options_header(request.headers.get("content-type", ""))
+        if content_type != b"multipart/form-data" or not params.get(b"boundary"):
+            raise ValueError("Expected a multipart/form-data body")
+        self.field = field
+        self.filename: Optional[str] = None
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self._body = request.stream()
+        self._chunks: deque = deque()
+        self._in_file = False
+        self._finished = False # file part fully received
+        self._headers: Dict[bytes, bytes] = {}
+        self._header_field = b""
+        self._header_value = b""
+        self._parser = multipart.MultipartParser(params[b"boundary"], callbacks={
+            "on_part_begin": self._on_part_begin,
+            "on_header_field": self._on_header_field,
+            "on_header_value": self._on_header_value,
+            "on_header_end": self._on_header_end,
+            "on_headers_finished": self._on_headers_finished,
+            "on_part_data": self._on_part_data,
+            "on_part_end": self._on_part_end,
+        })
+
+    def _on_part_begin(self):
+        self._headers = {}
+
+    def _on_header_field(self, data: bytes, start: int, end: int):
+        self._header_field += data[start:end]
+
+    def _on_header_value(self, data: bytes, start: int, end: int):
+        self._header_value += data[start:end]
+
+    def _on_header_end(self):
+        self._headers[self._header_field.lower()] = self._header_value
+        self._header_field = self._header_value = b""
+
+    def _on_headers_finished(self):
+        _, options = parse_options_header(self._headers.get(b"content-disposition", b""))
+        if self.filename is None and options.get(b"name") == self.field.encode() and b"filename" in options:
+            self.filename = options[b"filename"].decode("utf-8", "replace")
+            self._in_file = True
+
+    def _on_part_data(self, data: bytes, start: int, end: int):
+        if self._in_file:
+            self._chunks.append(bytes(data[start:end]))
+
+    def _on_part_end(self):
+        if self._in_file:
+            self._in_file = False
+            self._finished = True
+
+    async def _pull(self):
+        try:
+            chunk = await self._body.__anext__()
+        except StopAsyncIteration:
+            raise ValueError("Incomplete multipart body")
+        self._parser.write(chunk)
+
+    async def open(self):
+        """Consumes the body up to the file field's headers; filename is set afterwards."""
+        self.loop = asyncio.get_running_loop()
+        while self.filename is None:
+            try:
+                await self._pull()
+            except ValueError:
+                raise ValueError(f"Missing file field '{self.field}'") from None
+
+    async def _next(self) -> bytes:
+        while not self._chunks and not self._finished:
+            await self._pull()
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+    def read(self, size: int = -1) -> bytes:
+        # size is advisory: each call returns whatever the next body chunk carried, b"" at the end
+        return asyncio.run_coroutine_threadsafe(self._next(), self.loop).result()
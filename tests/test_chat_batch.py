@@ -0,0 +1,86 @@
+import sys
+import os
+import json
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+pytest.importorskip("ifcopenshell")
+from fastapi.testclient import TestClient
+from orca_runtime import main
+
+@pytest.fixture
+def llm(monkeypatch):
+    """Replaces the upstream chat call; items finish in reverse order and "fail" raises."""
+    state = {"running": 0, "peak": 0, "calls": []}
+
+    async def fake_call_llm(messages, model=None):
+        content = messages[-1]["content"]
+        state["calls"].append(content)
+        state["running"] += 1
+        state["peak"] = max(state["peak"], state["running"])
+        try:
+            await asyncio.sleep(float(messages[-1].get("delay", 0)))
+            if content == "fail":
+                raise HTTPException(status_code=503, detail="upstream down")
+            return {"role": "assistant", "content": content.upper()}
+        finally:
+            state["running"] -= 1
+
+    monkeypatch.setattr(main, "_call_llm", fake_call_llm)
+    monkeypatch.setattr(main, "runtime_config", main.Config(chat_mode="offline", llm_provider="ollama"))
+    monkeypatch.setitem(main._services, "gpu_mgr", main.GPUOrchestrator(fallback_tier="HIGH"))
+    monkeypatch.setattr(main, "batch_semaphores", {})
+    return state
+
+def _items(*contents):
+    n = len(contents)
+    return [[{"role": "user", "content": c, "delay": 0.02 * (n - i)}] for i, c in enumerate(contents)]
+
+def test_batch_returns_results_in_request_order_with_item_errors(llm):
+    r = TestClient(main.app).post("/runtime/chat/batch", json={"items": _items("a", "fail", "c")})
+    assert r.status_code == 200
+    body = r.json()
+    assert [res["index"] for res in body["results"]] == [0, 1, 2]
+    assert body["results"][0]["message"]["content"] == "A"
+    assert body["results"][1] == {**body["results"][1], "ok": False, "status": 503, "error": "upstream down"}
+    assert body["results"][2]["message"]["content"] == "C"
+    assert body["count"] == 3 and body["errors"] == 1
+
+def test_batch_stream_emits_lines_as_items_complete(llm):
+    r = TestClient(main.app).post("/runtime/chat/batch/stream", json={"items": _items("a", "b", "fail")})
+    assert r.status_code == 200
+    lines = [json.loads(line) for line in r.text.splitlines()]
+    # Later items are faster, so they come out first
+    assert [line["index"] for line in lines[:-1]] == [2, 1, 0]
+    assert lines[0]["ok"] is False and lines[0]["status"] == 503
+    assert lines[-1]["done"] is True and lines[-1]["count"] == 3 and lines[-1]["errors"] == 1
+
+def test_batch_concurrency_follows_settings_changes(llm):
+    main.runtime_config.batch_concurrency = {"ollama": 1}
+    client = TestClient(main.app)
+    client.post("/runtime/chat/batch", json={"items": _items("a", "b", "c")})
+    assert llm["peak"] == 1
+
+    llm["peak"] = 0
+    main.runtime_config.batch_concurrency = {"ollama": 3}
+    client.post("/runtime/chat/batch", json={"items": _items("d", "e", "f")})
+    assert llm["peak"] == 3
+
+def test_interactive_call_does_not_coalesce_with_batch_flight(llm):
+    messages = [{"role": "user", "content": "same", "delay": 0.05}]
+
+    async def run():
+        batch = asyncio.ensure_future(main.call_llm(messages, None, main.Priority.BATCH))
+        await asyncio.sleep(0)
+        interactive = await main.call_llm(messages, None, main.Priority.INTERACTIVE)
+        return interactive, await batch
+
+    before = dict(main.llm_flights.counters)
+    interactive, batch = asyncio.run(run())
+    assert interactive == batch == {"role": "assistant", "content": "SAME"}
+    assert llm["calls"] == ["same", "same"]
+    assert main.llm_flights.counters["coalesced"] == before["coalesced"]
@@ -0,0 +1,81 @@
+import sys
+import os
+import json
+import asyncio
+
+import pytest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+pytest.importorskip("ifcopenshell")
+from fastapi import WebSocketDisconnect
+from orca_runtime import main
+
+def _fake_stream(closed, first_delay=0.0):
+    async def stream_llm(messages, model=None):
+        try:
+            await asyncio.sleep(first_delay)
+            for token in ("Hel", "lo", "!"):
+                yield token
+        finally:
+            closed.append(True)
+    return stream_llm
+
+@pytest.fixture
+def offline(monkeypatch):
+    monkeypatch.setattr(main.runtime_config, "chat_mode", "offline")
+
+def test_sse_streams_frames_and_releases_upstream(offline, monkeypatch):
+    closed = []
+    monkeypatch.setattr(main, "stream_llm", _fake_stream(closed))
+    from fastapi.testclient import TestClient
+    r = TestClient(main.app).post("/runtime/chat/stream", json={"messages": [{"role": "user", "content": "hi"}]})
+    frames = [json.loads(line[len("data: "):]) for line in r.text.split("\n\n") if line]
+    assert [f["content"] for f in frames if f["type"] == "token"] == ["Hel", "lo", "!"]
+    assert frames[-1]["type"] == "done" and frames[-1]["content"] == "Hello!"
+    assert closed == [True]
+
+def test_unstarted_sse_response_releases_upstream(offline, monkeypatch):
+    closed = []
+    monkeypatch.setattr(main, "stream_llm", _fake_stream(closed))
+
+    async def run():
+        response = await main.chat_stream(main.ChatInput(messages=[{"role": "user", "content": "hi"}]))
+        assert closed == []
+        await response.background() # what Starlette runs when the body is never iterated
+        return closed
+    assert asyncio.run(run()) == [True]
+
+def test_ws_disconnect_mid_stream_releases_upstream(offline, monkeypatch):
+    closed = []
+    monkeypatch.setattr(main, "stream_llm", _fake_stream(closed))
+
+    class ClientLeaves:
+        def __init__(self):
+            self.turns = [{"messages": [{"role": "user", "content": "hi"}]}]
+            self.sent = []
+        async def accept(self):
+            pass
+        async def receive_json(self):
+            if self.turns:
+                return self.turns.pop()
+            raise WebSocketDisconnect()
+        async def send_json(self, frame):
+            if self.sent:
+                raise WebSocketDisconnect() # gone after the first frame
+            self.sent.append(frame)
+
+    async def run():
+        await main.chat_ws(ClientLeaves())
+        return list(closed) # before the loop gets a chance to finalize anything
+    assert asyncio.run(run()) == [True]
+
+def test_ttft_measured_at_first_token(offline, monkeypatch):
+    monkeypatch.setattr(main, "stream_llm", _fake_stream([], first_delay=0.05))
+
+    async def run():
+        frames = await main.open_chat_stream([{"role": "user", "content": "hi"}], None)
+        await asyncio.sleep(0.3) # consumer is slow to start reading
+        return [f async for f in frames]
+    done = asyncio.run(run())[-1]
+    assert 40 <= done["ttft_ms"] < 250
@@ -0,0 +1,100 @@
+import sys
+import os
+import json
+import asyncio
+import threading
+
+import pytest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+pytest.importorskip("ifcopenshell")
+from orca_runtime.main import ConnectionManager
+
+class FakeWebSocket:
+    def __init__(self, gate: asyncio.Event = None):
+        self.gate = gate
+        self.sent = []
+        self.closed = None
+
+    async def accept(self):
+        pass
+
+    async def send_text(self, message):
+        if self.gate is not None:
+            await self.gate.wait()
+        self.sent.append(message)
+
+    async def close(self, code=1000):
+        self.closed = code
+
+def test_overflow_replaces_backlog_with_snapshot():
+    async def run():
+        threads = []
+        manager = ConnectionManager(max_queue=4, max_degrades=3)
+        manager.snapshot_fn = lambda: threads.append(threading.get_ident()) or {"state": "ok"}
+        gate = asyncio.Event()
+        slow, fast = FakeWebSocket(gate), FakeWebSocket()
+        await manager.connect(slow)
+        await manager.connect(fast)
+        await asyncio.sleep(0)
+
+        for i in range(6): # no yield: both queues overflow on the 5th message
+            manager.publish(json.dumps({"i": i}))
+        gate.set()
+        for _ in range(20):
+            await asyncio.sleep(0.01)
+        return manager, slow, fast, threads
+
+    manager, slow, fast, threads = asyncio.run(run())
+    snaps = [json.loads(m) for m in slow.sent if json.loads(m).get("type") == "director.snapshot"]
+    assert len(snaps) >= 1 and snaps[0]["snapshot"] == {"state": "ok"}
+    assert manager.counters["snapshots"] >= 1
+    assert manager.counters["dropped"] >= 1
+    assert manager.subscribers[slow].dropped >= 1
+    assert slow in manager.subscribers and slow.closed is None
+    # snapshot_fn runs in a worker thread, not on the event loop
+    assert threads and threading.get_ident() not in threads
+
+def test_repeated_overflow_disconnects_slow_client():
+    async def run():
+        manager = ConnectionManager(max_queue=2, max_degrades=2)
+        manager.snapshot_fn = lambda: {}
+        slow, fast = FakeWebSocket(asyncio.Event()), FakeWebSocket()
+        await manager.connect(slow)
+        await manager.connect(fast)
+        await asyncio.sleep(0)
+
+        for i in range(12): # fast client keeps up; slow one never drains and degrades repeatedly
+            manager.publish(str(i))
+            await asyncio.sleep(0.005)
+        await asyncio.sleep(0.05)
+        return manager, slow, fast
+
+    manager, slow, fast = asyncio.run(run())
+    assert slow not in manager.subscribers
+    assert slow.closed == 1013
+    assert manager.counters["slow_disconnects"] == 1
+    # the healthy client is unaffected by the slow one
+    assert fast in manager.subscribers
+    assert fast.sent == [str(i) for i in range(12)]
+
+def test_snapshot_frame_carries_state_and_events(tmp_path, monkeypatch):
+    # The dashboard resyncs from this frame (index.html: data.type === "director.snapshot")
+    from orca_runtime import main
+    from orca_runtime.director import Director
+    director = Director(str(tmp_path))
+    monkeypatch.setitem(main._services, "director", director)
+    try:
+        director.append_event("test.ping", "tests", {"n": 1})
+        frame = json.loads(asyncio.run(main.manager._snapshot_message()))
+    finally:
+        director.close()
+
+    assert frame["type"] == "director.snapshot"
+    state = frame["snapshot"]["state"]
+    assert state["status"] == "ready"
+    assert {"inbox", "quests", "runs"} <= set(state["counts"])
+    events = frame["snapshot"]["events"]
+    assert events[-1]["type"] == "test.ping"
+    assert {"timestamp", "type", "source", "payload", "severity"} <= set(events[-1])
@@ -0,0 +1,90 @@
+import sys
+import os
+import asyncio
+
+import pytest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+pytest.importorskip("ifcopenshell")
+from fastapi.testclient import TestClient
+from orca_runtime import main
+
+def test_events_query_rejects_bad_time_bounds():
+    client = TestClient(main.app)
+    assert client.get("/api/director/events/query", params={"since": "2026-01-01T00:00:00"}).status_code == 200
+    assert client.get("/api/director/events/query", params={"since": "last tuesday"}).status_code == 400
+    assert client.get("/api/director/events/query", params={"until": "2026-01-01T00:00:00Z"}).status_code == 400
+    assert client.get("/api/director/events/query", params={"until": "2026-01-01T00:00:00+02:00"}).status_code == 400
+
+BOUNDARY = "orcaboundary"
+
+def _multipart_chunks(filename: str, data: bytes, chunk: int = 1024):
+    yield (f"--{BOUNDARY}\r\nContent-Disposition: form-data; name=\"note\"\r\n\r\nhello\r\n"
+           f"--{BOUNDARY}\r\nContent-Disposition: form-data; name=\"file\"; filename=\"{filename}\"\r\n"
+           "Content-Type: application/octet-stream\r\n\r\n").encode()
+    for i in range(0, len(data), chunk):
+        yield data[i:i + chunk]
+    yield f"\r\n--{BOUNDARY}--\r\n".encode()
+
+@pytest.fixture
+def inbox_client(tmp_path, monkeypatch):
+    from orca_runtime.director import Director
+    director = Director(str(tmp_path), max_upload_bytes=64 * 1024)
+    monkeypatch.setitem(main._services, "director", director)
+    yield TestClient(main.app), director
+    director.close()
+
+def _post(client, body, **headers):
+    return client.post("/api/director/inbox/upload", content=body,
+                       headers={"Content-Type": f"multipart/form-data; boundary={BOUNDARY}", **headers})
+
+def test_inbox_upload_streams_file_field(inbox_client):
+    client, director = inbox_client
+    data = bytes(range(256)) * 100
+    # A generator body is sent chunked, without Content-Length
+    r = _post(client, _multipart_chunks("notes.txt", data))
+    assert r.status_code == 200
+    item = r.json()
+    assert item["filenames"] == ["notes.txt"]
+    assert director.get_inbox_original(item["id"], "notes.txt") == data
+    assert os.listdir(director.incoming_dir) == []
+
+def test_inbox_upload_over_limit_is_rejected_during_receipt(inbox_client):
+    # Drive the ASGI app directly: TestClient buffers the whole request body before the app sees it
+    _, director = inbox_client
+    chunks = _multipart_chunks("big.bin", b"x" * (1024 * 1024))
+    received, sent = [], []
+
+    async def receive():
+        chunk = next(chunks, None)
+        if chunk is None:
+            return {"type": "http.request", "body": b"", "more_body": False}
+        received.append(len(chunk))
+        return {"type": "http.request", "body": chunk, "more_body": True}
+
+    async def send(message):
+        sent.append(message)
+
+    scope = {"type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "POST", "scheme": "http",
+             "path": "/api/director/inbox/upload", "raw_path": b"/api/director/inbox/upload", "query_string": b"",
+             "root_path": "", "client": ("test", 1), "server": ("test", 80),
+             "headers": [(b"content-type", f"multipart/form-data; boundary={BOUNDARY}".encode())]}
+    asyncio.run(main.app(scope, receive, send))
+
+    assert sent[0]["status"] == 413
+    # Receipt stopped shortly after the limit instead of reading the whole body
+    assert sum(received) < 128 * 1024
+    assert os.listdir(director.incoming_dir) == []
+    assert director.list_inbox() == []
+
+def test_inbox_upload_rejects_declared_oversize_up_front(inbox_client):
+    client, director = inbox_client
+    body = b"".join(_multipart_chunks("big.bin", b"x" * (256 * 1024)))
+    assert _post(client, body).status_code == 413 # httpx sets Content-Length for a bytes body
+
+def test_inbox_upload_without_file_field_is_400(inbox_client):
+    client, _ = inbox_client
+    body = f"--{BOUNDARY}\r\nContent-Disposition: form-data; name=\"note\"\r\n\r\nhi\r\n--{BOUNDARY}--\r\n".encode()
+    assert _post(client, body).status_code == 400
+    assert client.post("/api/director/inbox/upload", content=b"raw", headers={"Content-Type": "text/plain"}).status_code == 400
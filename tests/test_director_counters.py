@@ -0,0 +1,29 @@
+import sys
+import os
+import json
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from orca_runtime.director import Director
+
+def test_counters_follow_mutations_and_reconcile(tmp_path):
+    director = Director(str(tmp_path))
+    item = director.ingest_to_inbox("notes.txt", b"hello")
+    quest = director.create_quest_from_inbox(item["id"])
+    director.set_quest_status(quest["id"], "active")
+    director.record_run_receipt({"run_id": "run_1", "status": "success"})
+    director.record_run_receipt({"run_id": "run_1", "status": "success"}) # overwrite, not a new run
+
+    state = director.get_state()
+    assert state["counts"] == {"inbox": 1, "quests": 1, "runs": 1}
+    summary = director.get_progress_snapshot()["quests_summary"]
+    assert summary == {"active": 1, "next": 0, "later": 0, "total": 1}
+    director.close()
+
+    # Drift (e.g. a bundle copied in by hand) is fixed on the next start
+    os.makedirs(os.path.join(director.inbox_dir, "manual"))
+    with open(director.counters_file) as f:
+        assert json.load(f)["inbox"] == 1
+    restarted = Director(str(tmp_path))
+    assert restarted.get_state()["counts"]["inbox"] == 2
+    restarted.close()
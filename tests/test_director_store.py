@@ -0,0 +1,67 @@
+import sys
+import os
+import json
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from orca_runtime.director_store import DirectorStore
+
+def _quest(qid, status="later"):
+    return {"id": qid, "title": qid, "status": status, "runs": []}
+
+def test_quest_lists_and_export_shape(tmp_path):
+    store = DirectorStore(str(tmp_path / "d.sqlite"))
+    for qid in ("a", "b", "c"):
+        store.add_quest(_quest(qid))
+    assert store.set_quest_status("a", "active")
+    assert store.set_quest_status("b", "active")
+    assert not store.set_quest_status("missing", "next")
+
+    data = store.export_quests()
+    assert [q["id"] for q in data["quests"]] == ["a", "b", "c"]
+    assert data["active"] == ["a", "b"] and data["later"] == ["c"] and data["next"] == []
+    assert store.get_quest("a")["status"] == "active"
+    assert store.quest_counts() == {"active": 2, "next": 0, "later": 1, "total": 3}
+
+    page = store.list_quests("active", limit=1)
+    assert [q["id"] for q in page["items"]] == ["a"]
+    assert page["total"] == 2 and page["next_offset"] == 1
+    assert store.list_quests("active", limit=1, offset=1)["next_offset"] is None
+
+def test_migrate_preserves_legacy_documents(tmp_path):
+    quests = {"quests": [_quest("q1", "next"), _quest("q2", "later")], "active": [], "next": ["q1"], "later": ["q2"]}
+    issues = {"issues": [{"id": "i1", "status": "open", "severity": "high"}, {"id": "i2", "status": "closed", "severity": "low"}]}
+    milestones = {"milestones": [{"id": "m2", "status": "planned", "order": 2}, {"id": "m1", "status": "done", "order": 1}]}
+    store = DirectorStore(str(tmp_path / "d.sqlite"))
+    assert not store.is_migrated()
+    store.migrate(json.loads(json.dumps(quests)), issues, milestones, source="test")
+    assert store.is_migrated()
+
+    assert store.export_quests() == quests
+    assert store.export_issues() == issues
+    assert [m["id"] for m in store.export_milestones()["milestones"]] == ["m1", "m2"]
+
+    assert store.update_issue("i1", status="closed")
+    assert store.list_issues(status="closed")["total"] == 2
+    assert store.list_issues(severity="high")["items"][0]["status"] == "closed"
+    assert not store.update_milestone("nope", status="done")
+
+def test_director_migrates_legacy_json_once(tmp_path):
+    from orca_runtime.director import Director
+    state_root = tmp_path / "runtime" / "director_state"
+    state_root.mkdir(parents=True)
+    legacy = {"quests": [_quest("q1")], "active": [], "next": [], "later": ["q1"]}
+    (state_root / "quests.json").write_text(json.dumps(legacy))
+
+    director = Director(str(tmp_path))
+    assert director.get_quests() == legacy
+    assert not (state_root / "quests.json").exists()
+    assert (state_root / "quests.json.migrated").exists()
+    assert len(director.export_planning()["milestones"]["milestones"]) == 7
+    director.set_quest_status("q1", "active")
+    director.close()
+
+    restarted = Director(str(tmp_path))
+    assert restarted.get_quests()["active"] == ["q1"]
+    assert restarted.get_state()["counts"]["quests"] == 1
+    restarted.close()
@@ -0,0 +1,41 @@
+import sys
+import os
+
+import pytest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from orca_runtime.event_log import EventLog
+from orca_runtime.event_index import EventIndex
+
+def _event(type, ts, severity="info", **payload):
+    return {"id": f"{type}-{ts}", "timestamp": ts, "type": type, "source": "director", "payload": payload, "severity": severity}
+
+def test_filters_pagination_and_counts(tmp_path):
+    log = EventLog(str(tmp_path / "events.jsonl"))
+    log.append(_event("capability.run_requested", "2026-01-01T10:00:00", run_id="run_a"))
+    log.append(_event("capability.run_failed", "2026-01-01T10:00:05", severity="error", run_id="run_a"))
+    log.append(_event("capability.run_failed", "2026-01-02T09:00:00", severity="error", run_id="run_b"))
+    log.append(_event("quest.created", "2026-01-02T09:30:00", quest_id="q1"))
+
+    index = EventIndex(str(tmp_path / "events.sqlite"))
+    assert index.catch_up(log) == 4
+    assert index.catch_up(log) == 0
+
+    failed = index.query(type_prefix="capability.run_failed", since="2026-01-02T00:00:00", until="2026-01-03T00:00:00")
+    assert [e["payload"]["run_id"] for e in failed["events"]] == ["run_b"]
+    assert [e["seq"] for e in index.query(payload={"run_id": "run_a"})["events"]] == [2, 1]
+
+    page = index.query(type_prefix="capability.", limit=2)
+    assert [e["seq"] for e in page["events"]] == [3, 2]
+    assert [e["seq"] for e in index.query(type_prefix="capability.", limit=2, before_seq=page["next_before_seq"])["events"]] == [1]
+
+    counts = index.count(severity="error", group_by="type")
+    assert counts == {"count": 2, "groups": {"capability.run_failed": 2}}
+
+def test_unparseable_time_bound_is_an_error(tmp_path):
+    index = EventIndex(str(tmp_path / "events.sqlite"))
+    with pytest.raises(ValueError):
+        index.query(since="yesterday")
+    with pytest.raises(ValueError):
+        index.count(until="2026-13-01")
@@ -0,0 +1,128 @@
+import sys
+import os
+import json
+import time
+import threading
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from orca_runtime.event_log import EventLog
+
+def _fill(log, n):
+    for i in range(n):
+        log.append({"id": f"e{i}", "type": "test", "payload": {"i": i}})
+
+def test_tail_and_cursor_pages(tmp_path):
+    log = EventLog(str(tmp_path / "events.jsonl"), index_every=8)
+    _fill(log, 50)
+
+    tail = log.read(5)
+    assert [e["seq"] for e in tail] == [46, 47, 48, 49, 50]
+    assert [e["seq"] for e in log.read(5, before=46)] == [41, 42, 43, 44, 45]
+    assert [e["seq"] for e in log.read(3, after=10)] == [11, 12, 13]
+    assert log.read(5, after=50) == []
+    assert log.last_event["seq"] == 50
+    assert log.stats()["index_entries"] == 7 # seq 1, 9, ..., 49
+
+def test_index_rebuilt_for_legacy_log(tmp_path):
+    path = str(tmp_path / "events.jsonl")
+    with open(path, "w") as f:
+        for i in range(20):
+            f.write(json.dumps({"id": f"old{i}", "type": "legacy"}) + "\n")
+        f.write('{"id": "torn"') # crash mid-write
+
+    log = EventLog(path, index_every=4)
+    assert log.count == 21
+    log.append({"id": "new", "type": "test"})
+    assert [e["id"] for e in log.read(3)] == ["old19", "new"] # torn line keeps its seq, is skipped
+    assert [e["seq"] for e in log.read(2, before=6)] == [4, 5]
+
+    reopened = EventLog(path, index_every=4)
+    assert reopened.marks == log.marks
+    assert reopened.read(1)[0]["seq"] == 22
+
+def test_segments_rotate_compress_and_read_across(tmp_path):
+    path = str(tmp_path / "events.jsonl")
+    log = EventLog(path, index_every=4, max_segment_bytes=600)
+    _fill(log, 40)
+    log.flush()
+    log.join_compression()
+
+    stats = log.stats()
+    assert stats["segments"] >= 2
+    assert all(e["compressed"] for e in log.segments)
+    assert os.path.getsize(path) < 700
+
+    assert [e["seq"] for e in log.read(40)] == list(range(1, 41))
+    assert [e["seq"] for e in log.read(3, after=5)] == [6, 7, 8]
+    assert [e["payload"]["i"] for e in log.read(2, before=12)] == [9, 10]
+
+    reopened = EventLog(path, index_every=4, max_segment_bytes=600)
+    assert reopened.count == 40
+    assert reopened.last_event["seq"] == 40
+    reopened.append({"id": "next", "type": "test"})
+    assert reopened.read(1)[0]["seq"] == 41
+    with open(reopened.manifest_path) as f:
+        manifest = json.load(f)
+    assert sum(s["count"] for s in manifest["segments"]) == reopened.base
+
+def test_appends_are_group_committed(tmp_path):
+    log = EventLog(str(tmp_path / "events.jsonl"), flush_interval_s=0.5)
+    seen = []
+    log.add_listener(seen.extend)
+    _fill(log, 100)
+    assert log.count == 100 # seqs are handed out before anything is written
+
+    log.flush()
+    assert log.stats()["batches"] == 1
+    assert [e["seq"] for e in seen] == list(range(1, 101))
+    log.close()
+    with open(log.path) as f:
+        assert len(f.readlines()) == 100
+
+def test_reads_wait_for_writer_instead_of_writing(tmp_path):
+    log = EventLog(str(tmp_path / "events.jsonl"))
+    writers = set()
+    log.add_listener(lambda batch: writers.add(threading.current_thread().name))
+    _fill(log, 10)
+    assert [e["seq"] for e in log.read(3)] == [8, 9, 10] # read-your-writes
+    assert log.wait_delivered(1.0)
+    assert writers == {"event-log-writer"}
+    log.close()
+
+def test_durability_none_buffers_until_flushed(tmp_path):
+    log = EventLog(str(tmp_path / "events.jsonl"), durability="none", idle_flush_s=60)
+    _fill(log, 5)
+    assert log.read(5) == [] # still in the userspace buffer
+    log.flush()
+    assert [e["seq"] for e in log.read(5)] == [1, 2, 3, 4, 5]
+    log.close()
+
+    idle = EventLog(str(tmp_path / "idle.jsonl"), durability="none", idle_flush_s=0.05)
+    _fill(idle, 3)
+    deadline = time.time() + 2
+    while idle.stats()["visible"] < 3 and time.time() < deadline:
+        time.sleep(0.01)
+    assert [e["seq"] for e in idle.read(3)] == [1, 2, 3]
+    idle.close()
+
+def test_read_retries_when_segment_sealed_mid_read(tmp_path):
+    log = EventLog(str(tmp_path / "events.jsonl"), index_every=4)
+    _fill(log, 20)
+    log.flush()
+    tail_lines = log._tail_lines
+
+    def sealing_tail(limit, size):
+        if log.base == 0:
+            # Writer seals the hot file between the reader's snapshot and its open()
+            log.max_segment_bytes = 1
+            log.append({"id": "e20", "type": "test", "payload": {"i": 20}})
+            log.flush()
+        return tail_lines(limit, size)
+
+    log._tail_lines = sealing_tail
+    events = log.read(5)
+    assert log.base == 20
+    assert [e["seq"] for e in events] == [17, 18, 19, 20, 21]
+    assert [e["payload"]["i"] + 1 for e in events] == [e["seq"] for e in events]
+    log.close()
@@ -0,0 +1,128 @@
+import sys
+import os
+import asyncio
+
+import pytest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from orca_runtime.gpu_orchestrator import GPUOrchestrator, GPUScheduler, GPUTier, ModelType, Priority
+
+async def _run(scheduler, jobs):
+    order = []
+
+    async def job(model_type, model_name, priority, label):
+        async with scheduler.slot(model_type, model_name, priority):
+            order.append(label)
+            await asyncio.sleep(0.01)
+
+    # First job takes the only LOW-tier slot; the rest queue behind it
+    first = asyncio.create_task(job(*jobs[0]))
+    await asyncio.sleep(0)
+    rest = [asyncio.create_task(job(*j)) for j in jobs[1:]]
+    await asyncio.gather(first, *rest)
+    return order
+
+def test_priority_then_affinity_on_low_tier():
+    scheduler = GPUScheduler(GPUTier.LOW)
+    jobs = [
+        (ModelType.LLM, "llama3", Priority.INTERACTIVE, "chat-1"),
+        (ModelType.LLM, "mistral", Priority.BATCH, "ifc-mistral"),
+        (ModelType.TTS, "orpheus", Priority.TTS, "tts-1"),
+        (ModelType.LLM, "qwen", Priority.BATCH, "ifc-qwen"),
+        (ModelType.LLM, "llama3", Priority.INTERACTIVE, "chat-2"),
+        (ModelType.LLM, "mistral", Priority.BATCH, "ifc-mistral-2"),
+    ]
+    order = asyncio.run(_run(scheduler, jobs))
+    assert order == ["chat-1", "chat-2", "tts-1", "ifc-mistral", "ifc-mistral-2", "ifc-qwen"]
+    stats = scheduler.stats()
+    assert stats["granted"] == 6
+    assert stats["running"]["LLM"] == 0
+    assert stats["queue_depth"]["LLM"] == 0
+
+def test_cancelled_waiter_leaves_queue():
+    scheduler = GPUScheduler(GPUTier.LOW)
+
+    async def run():
+        async with scheduler.slot(ModelType.LLM, "llama3"):
+            waiter = asyncio.create_task(scheduler.slot(ModelType.TTS, "orpheus").__aenter__())
+            await asyncio.sleep(0)
+            assert scheduler.stats()["queue_depth"]["TTS"] == 1
+            waiter.cancel()
+            await asyncio.gather(waiter, return_exceptions=True)
+        return scheduler.stats()
+
+    stats = asyncio.run(run())
+    assert stats["queue_depth"]["TTS"] == 0
+    assert stats["running"] == {"LLM": 0, "TTS": 0, "FSPU": 0}
+
+def test_unknown_vram_uses_configurable_fallback_tier(monkeypatch):
+    monkeypatch.setattr("orca_runtime.gpu_orchestrator.PYNVML_AVAILABLE", False)
+    assert GPUOrchestrator().tier == GPUTier.MID
+    assert GPUOrchestrator(fallback_tier="high").tier == GPUTier.HIGH
+    assert GPUOrchestrator(fallback_tier="bogus").tier == GPUTier.MID
+    # Known VRAM still maps to a tier as before
+    orch = GPUOrchestrator()
+    orch.total_memory_mb = 8192
+    orch._determine_tier()
+    assert orch.tier == GPUTier.LOW
+
+def test_mid_tier_runs_two_llm_jobs_alongside_tts():
+    scheduler = GPUScheduler(GPUTier.MID)
+    assert scheduler._eligible(ModelType.LLM.value)
+    scheduler.running[ModelType.LLM.value] = scheduler.running_total = 1
+    assert scheduler._eligible(ModelType.LLM.value)
+    scheduler.running[ModelType.LLM.value] = scheduler.running_total = 2
+    assert not scheduler._eligible(ModelType.LLM.value)
+    assert scheduler._eligible(ModelType.TTS.value)
+
+def test_stream_releases_slot_when_upstream_finishes(monkeypatch):
+    monkeypatch.setattr("orca_runtime.gpu_orchestrator.PYNVML_AVAILABLE", False)
+    orch = GPUOrchestrator(fallback_tier="LOW")
+
+    async def upstream():
+        for i in range(3):
+            yield i
+
+    async def failing():
+        yield 0
+        raise RuntimeError("upstream died")
+
+    async def run():
+        items = orch.stream(ModelType.LLM, "llama3", Priority.INTERACTIVE, upstream)
+        first = await items.__anext__()
+        await asyncio.sleep(0)
+        # The reader is slow, but the upstream is done and the only LOW slot is free again
+        free = orch.scheduler.running_total == 0
+        rest = [i async for i in items]
+
+        broken = orch.stream(ModelType.LLM, "llama3", Priority.INTERACTIVE, failing)
+        with pytest.raises(RuntimeError):
+            async for _ in broken:
+                pass
+        return first, rest, free, orch.scheduler.running_total
+
+    assert asyncio.run(run()) == (0, [1, 2], True, 0)
+
+def test_closing_stream_early_cancels_upstream(monkeypatch):
+    monkeypatch.setattr("orca_runtime.gpu_orchestrator.PYNVML_AVAILABLE", False)
+    orch = GPUOrchestrator(fallback_tier="LOW")
+    closed = []
+
+    async def endless():
+        try:
+            while True:
+                yield b"x"
+                await asyncio.sleep(0.01)
+        finally:
+            closed.append(True)
+
+    async def run():
+        items = orch.stream(ModelType.TTS, "orpheus", Priority.TTS, endless)
+        await items.__anext__()
+        held = orch.scheduler.running_total
+        await items.aclose()
+        return held, orch.scheduler.running_total
+
+    assert asyncio.run(run()) == (1, 0)
+    assert closed
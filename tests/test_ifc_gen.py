@@ -0,0 +1,81 @@
+import sys
+import os
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+import asyncio
+
+import pytest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+pytest.importorskip("ifcopenshell")
+from orca_runtime import ifc_gen
+
+SPEC = {"project_name": "Demo", "levels": [{"name": "Ground", "elevation": 0.0}]}
+
+@pytest.fixture(autouse=True)
+def fresh_state(monkeypatch):
+    monkeypatch.setattr(ifc_gen, "_cache", type(ifc_gen._cache)())
+    monkeypatch.setattr(ifc_gen, "cache_stats", {"hits": 0, "misses": 0, "inline_fallbacks": 0})
+    yield
+    ifc_gen.shutdown_pool()
+
+def _fake_generator(calls):
+    def generate(text, spec):
+        calls.append(spec["project_name"])
+        return f"IFC:{spec['project_name']}"
+    return generate
+
+def test_cache_hits_on_normalized_spec_and_evicts_lru(monkeypatch):
+    calls = []
+    monkeypatch.setattr(ifc_gen, "generate_ifc_content", _fake_generator(calls))
+    monkeypatch.setattr(ifc_gen, "_pool", ThreadPoolExecutor(1))
+    monkeypatch.setattr(ifc_gen, "CACHE_MAX_ENTRIES", 2)
+
+    async def run():
+        a = await ifc_gen.generate_ifc_cached("a house", SPEC)
+        # Key order, padding and timestamp fields do not change the key
+        b = await ifc_gen.generate_ifc_cached("a house", {"levels": SPEC["levels"], "project_name": " Demo ", "timestamp": 1})
+        c = await ifc_gen.generate_ifc_cached("a house", {**SPEC, "project_name": "Other"})
+        d = await ifc_gen.generate_ifc_cached("a shed", SPEC)
+        # Oldest entry was evicted by the last two misses
+        e = await ifc_gen.generate_ifc_cached("a house", SPEC)
+        return a, b, c, d, e
+
+    a, b, c, d, e = asyncio.run(run())
+    assert a == ("IFC:Demo", False)
+    assert b == ("IFC:Demo", True)
+    assert c == ("IFC:Other", False)
+    assert d == ("IFC:Demo", False)
+    assert e == ("IFC:Demo", False)
+    assert calls == ["Demo", "Other", "Demo", "Demo"]
+    assert ifc_gen.get_cache_stats()["hits"] == 1
+    assert ifc_gen.get_cache_stats()["misses"] == 4
+    assert ifc_gen.get_cache_stats()["entries"] == 2
+
+class BrokenPool:
+    def submit(self, *args, **kwargs):
+        raise BrokenProcessPool("worker died")
+
+    def shutdown(self, wait=True, cancel_futures=False):
+        pass
+
+def test_broken_pool_falls_back_to_inline_generation(monkeypatch):
+    calls = []
+    monkeypatch.setattr(ifc_gen, "generate_ifc_content", _fake_generator(calls))
+    monkeypatch.setattr(ifc_gen, "_pool", BrokenPool())
+
+    ifc_str, hit = asyncio.run(ifc_gen.generate_ifc_cached("a house", SPEC))
+    assert (ifc_str, hit) == ("IFC:Demo", False)
+    assert calls == ["Demo"]
+    assert ifc_gen._pool is None # rebuilt on the next miss
+    assert ifc_gen.cache_stats["inline_fallbacks"] == 1
+    # The inline result is cached like a pool result
+    assert asyncio.run(ifc_gen.generate_ifc_cached("a house", SPEC)) == ("IFC:Demo", True)
+
+def test_pool_generates_ifc():
+    ifc_gen.start_pool(1)
+    ifc_str, hit = asyncio.run(ifc_gen.generate_ifc_cached("a house", SPEC))
+    assert not hit
+    assert ifc_str.startswith("ISO-10303-21")
+    assert "ORCA_Manifest" in ifc_str
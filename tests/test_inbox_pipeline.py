@@ -0,0 +1,141 @@
+import sys
+import os
+import io
+import json
+
+import pytest
+from PIL import Image
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from orca_runtime.director import Director, InboxBusy
+
+def _png() -> bytes:
+    buf = io.BytesIO()
+    Image.new("RGB", (1200, 600), "white").save(buf, "PNG")
+    return buf.getvalue()
+
+def test_ingest_returns_before_derivation(tmp_path):
+    director = Director(str(tmp_path), derive_workers=1)
+    meta = director.ingest_to_inbox("sketch.png", _png())
+    assert meta["status"] == "pending" and meta["artifacts"] == {}
+
+    assert director.wait_for_derivations(60)
+    bundle = os.path.join(director.inbox_dir, meta["id"])
+    with open(os.path.join(bundle, "meta.json")) as f:
+        done = json.load(f)
+    assert done["status"] == "ready"
+    assert set(done["artifacts"]) == {"preview", "ocr"}
+    with Image.open(os.path.join(bundle, "derived", "preview.jpg")) as img:
+        assert max(img.size) == 800
+    assert any(e["type"] == "inbox.derived_written" and e["payload"]["inbox_id"] == meta["id"]
+               for e in director.list_events(20))
+
+    assert director.ingest_to_inbox("notes.txt", b"hi")["status"] == "ready"
+    director.close()
+
+def test_full_queue_rejects_without_writing(tmp_path):
+    director = Director(str(tmp_path), derive_queue_max=1, derive_wait_s=0.05)
+    director.derive_slots.acquire() # queue occupied
+    with pytest.raises(InboxBusy):
+        director.ingest_to_inbox("a.png", _png())
+    assert os.listdir(director.inbox_dir) == []
+    director.derive_slots.release()
+    director.close()
+
+def test_pending_bundles_resume_on_start(tmp_path):
+    director = Director(str(tmp_path))
+    bundle = os.path.join(director.inbox_dir, "stale")
+    os.makedirs(os.path.join(bundle, "original"))
+    os.makedirs(os.path.join(bundle, "derived"))
+    with open(os.path.join(bundle, "original", "a.png"), "wb") as f:
+        f.write(_png())
+    with open(os.path.join(bundle, "meta.json"), "w") as f:
+        json.dump({"id": "stale", "type": "image", "filenames": ["a.png"], "artifacts": {}, "status": "pending"}, f)
+    director.close()
+
+    restarted = Director(str(tmp_path))
+    assert restarted.wait_for_derivations(60)
+    with open(os.path.join(bundle, "meta.json")) as f:
+        assert json.load(f)["status"] == "ready"
+    restarted.close()
+
+def test_ocr_engine_tiles_tall_images_without_splitting_lines():
+    from orca_runtime.director import OcrEngine
+
+    # Text lines as (top, bottom, text) in page coordinates; two of them straddle a strip edge
+    page_lines = [(100, 130, "first"), (980, 1010, "straddles edge 1"), (1900, 1930, "in overlap 2"), (2400, 2430, "last")]
+
+    class FakeEngine(OcrEngine):
+        name = "fake"
+        def _recognize(self, img):
+            return f"{img.height}\n"
+        def _recognize_lines(self, img):
+            top = img.getpixel((0, 0)) # rows are painted with their page y
+            lines = []
+            for y0, y1, text in page_lines:
+                if y0 >= top and y1 <= top + img.height:
+                    lines.append(((y0 + y1) / 2 - top, text))
+                elif y0 < top + img.height and y1 > top:
+                    lines.append((max(y0, top) - top, "garbled")) # cut by the band edge
+            return lines
+
+    page = Image.new("I", (300, 2500))
+    page.putdata([y for y in range(2500) for _ in range(300)])
+    engine = FakeEngine(tile_px=1000, tile_workers=2, overlap_px=64)
+    result = engine.recognize(page)
+    assert result["tiles"] == 3 and result["engine"] == "fake"
+    assert result["text"] == "first\nstraddles edge 1\nin overlap 2\nlast\n"
+    assert engine.recognize(Image.new("L", (300, 900)))["text"] == "900\n"
+
+def test_ocr_engine_is_abstract():
+    from orca_runtime.director import OcrEngine
+    with pytest.raises(TypeError):
+        OcrEngine()
+
+def test_duplicate_upload_aliases_existing_bundle(tmp_path):
+    director = Director(str(tmp_path), derive_workers=1)
+    data = _png()
+    first = director.ingest_to_inbox("a.png", data)
+    dup_pending = director.ingest_to_inbox("a-again.png", data) # canonical may still be deriving
+    assert director.wait_for_derivations(60)
+    dup_ready = director.ingest_to_inbox("a-third.png", data)
+
+    for dup in (dup_pending, dup_ready):
+        assert dup["alias_of"] == first["id"]
+        meta = director._read_meta(dup["id"])
+        assert meta["status"] == "ready" and set(meta["artifacts"]) == {"preview", "ocr"}
+        original = os.path.join(director.inbox_dir, dup["id"], "original", dup["filenames"][0])
+        assert os.stat(original).st_ino == os.stat(os.path.join(director.inbox_dir, first["id"], "original", "a.png")).st_ino
+    assert director.get_state()["counts"]["inbox"] == 3
+    director.close()
+
+    # The index survives restarts and is rebuilt from manifests if it is lost
+    os.remove(os.path.join(director.state_root, "director.sqlite"))
+    restarted = Director(str(tmp_path))
+    assert restarted.ingest_to_inbox("b.png", data)["alias_of"] in {first["id"], dup_pending["id"], dup_ready["id"]}
+    restarted.close()
+
+def test_stream_ingest_hashes_in_chunks_and_enforces_limit(tmp_path):
+    import hashlib
+    from orca_runtime.director import InboxTooLarge, UPLOAD_CHUNK_BYTES
+
+    class Source(io.BytesIO):
+        reads = []
+        def read(self, n=-1):
+            self.reads.append(n)
+            return super().read(n)
+
+    payload = os.urandom(UPLOAD_CHUNK_BYTES * 2 + 10)
+    director = Director(str(tmp_path), max_upload_bytes=len(payload))
+    meta = director.ingest_stream_to_inbox("scan.pdf", Source(payload))
+    assert Source.reads and all(0 < n <= UPLOAD_CHUNK_BYTES for n in Source.reads)
+    with open(os.path.join(director.inbox_dir, meta["id"], "manifest.json")) as f:
+        entry = json.load(f)["files"][0]
+    assert entry["hash_sha256"] == hashlib.sha256(payload).hexdigest() and entry["size_bytes"] == len(payload)
+
+    with pytest.raises(InboxTooLarge):
+        director.ingest_stream_to_inbox("big.pdf", io.BytesIO(payload + b"x"))
+    assert os.listdir(director.incoming_dir) == []
+    assert director.get_state()["counts"]["inbox"] == 1
+    director.close()
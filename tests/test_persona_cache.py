@@ -0,0 +1,91 @@
+import sys
+import os
+import json
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from orca_runtime import persona_runtime
+from orca_runtime.persona_runtime import PersonaRuntime
+
+def _write(path, data):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(data, f)
+
+def _workspace(root):
+    installed = os.path.join(root, "orca", "personas", "installed")
+    _write(os.path.join(installed, "index.json"), {"persona.a": {"active_version": "0.1", "versions": ["0.1"]}})
+    _write(os.path.join(installed, "persona.a@0.1", "persona.pack.json"), {
+        "id": "persona.a", "name": "A", "version": "0.1",
+        "entitlement": {"mode": "paid", "sku": "sku.a"},
+        "components": {"layout": "layout.json"}
+    })
+    _write(os.path.join(installed, "persona.a@0.1", "layout.json"), {"modules": [{"id": "chat"}]})
+    _write(os.path.join(root, "orca", "ui", "module_registry.json"), {"chat": {"capabilities": []}})
+    _write(os.path.join(root, "orca", "marketplace", "catalog.json"), {"catalog": [{"sku": "sku.a", "mode": "paid"}]})
+
+def test_pack_is_cached_until_file_changes(tmp_path):
+    _workspace(str(tmp_path))
+    runtime = PersonaRuntime(str(tmp_path), revalidate_s=0)
+
+    first = runtime.load_persona("persona.a")
+    assert runtime.load_persona("persona.a@0.1") is first
+    assert runtime.cache.stats()["hits"] >= 1
+
+    layout_path = os.path.join(str(tmp_path), "orca", "personas", "installed", "persona.a@0.1", "layout.json")
+    _write(layout_path, {"modules": [{"id": "chat"}, {"id": "quests"}]})
+    assert len(runtime.load_persona("persona.a")["layout"]["modules"]) == 2
+
+def test_catalog_uses_sku_index_and_grant_invalidation(tmp_path):
+    _workspace(str(tmp_path))
+    runtime = PersonaRuntime(str(tmp_path))
+
+    entry = runtime.get_catalog()[0]
+    assert entry["persona_id"] == "persona.a@0.1"
+    assert entry["unlocked"] is False
+
+    runtime.add_grant("sku.a")
+    assert runtime.get_catalog()[0]["unlocked"] is True
+
+def test_filtered_layout_memoized_per_caps_and_registry(tmp_path):
+    _workspace(str(tmp_path))
+    registry_path = os.path.join(str(tmp_path), "orca", "ui", "module_registry.json")
+    _write(registry_path, {"chat": {"capabilities": ["llm.streaming"]}})
+    runtime = PersonaRuntime(str(tmp_path), revalidate_s=0) # registry is edited by hand below
+
+    retail = runtime.get_filtered_layout("persona.a", ["assets.ingest"])
+    assert retail["modules"] == []
+    assert runtime.get_filtered_layout("persona.a@0.1", ["assets.ingest"]) is retail
+    pro = runtime.switch_persona("persona.a", ["assets.ingest", "llm.streaming"])["layout"]
+    assert [m["id"] for m in pro["modules"]] == ["chat"]
+
+    _write(registry_path, {"chat": {"capabilities": []}, "extra": {"capabilities": ["x"]}})
+    assert [m["id"] for m in runtime.get_filtered_layout("persona.a", ["assets.ingest"])["modules"]] == ["chat"]
+
+def test_empty_or_null_registry_entry_disallows_module(tmp_path):
+    _workspace(str(tmp_path))
+    _write(os.path.join(str(tmp_path), "orca", "personas", "installed", "persona.a@0.1", "layout.json"),
+           {"modules": [{"id": "chat"}, {"id": "empty"}, {"id": "null"}, {"id": "unlisted"}]})
+    _write(os.path.join(str(tmp_path), "orca", "ui", "module_registry.json"),
+           {"chat": {"capabilities": []}, "empty": {}, "null": None})
+    runtime = PersonaRuntime(str(tmp_path))
+
+    layout = runtime.get_filtered_layout("persona.a", ["llm.streaming"])
+    assert [m["id"] for m in layout["modules"]] == ["chat"]
+
+def test_steady_state_hits_do_not_touch_disk(tmp_path, monkeypatch):
+    _workspace(str(tmp_path))
+    runtime = PersonaRuntime(str(tmp_path))
+    runtime.get_catalog()
+    runtime.load_persona("persona.a")
+
+    stats = []
+    real_mtime = persona_runtime._mtime
+    monkeypatch.setattr(persona_runtime, "_mtime", lambda p: stats.append(p) or real_mtime(p))
+    for _ in range(5):
+        runtime.get_catalog()
+        runtime.load_persona("persona.a")
+    assert stats == []
+
+    runtime.add_grant("sku.a") # explicit invalidation still applies immediately
+    assert runtime.get_catalog()[0]["unlocked"] is True
@@ -0,0 +1,92 @@
+import sys
+import os
+import json
+import shutil
+import zipfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT)
+
+from orca_runtime import persona_installer
+from orca_runtime.persona_installer import PersonaInstaller
+
+def _installer(tmp_path):
+    shutil.copytree(os.path.join(ROOT, "orca", "engine", "schemas"), os.path.join(str(tmp_path), "orca", "engine", "schemas"))
+    return PersonaInstaller(str(tmp_path))
+
+def test_validator_is_compiled_once(tmp_path):
+    installer = _installer(tmp_path)
+    first = installer._get_validator("orca.ui.theme@0.1.schema.json")
+    assert installer._get_validator("orca.ui.theme@0.1.schema.json") is first
+    assert installer._validate_json({}, "missing.schema.json") == "Schema missing.schema.json not found."
+
+def test_validate_many_reports_per_pack(tmp_path):
+    installer = _installer(tmp_path)
+    batch = os.path.join(str(tmp_path), "batch")
+    shutil.copytree(os.path.join(ROOT, "orca", "personas", "installed", "persona.home@0.1"), os.path.join(batch, "good"))
+    shutil.copytree(os.path.join(ROOT, "orca", "personas", "installed", "persona.home@0.1"), os.path.join(batch, "bad"))
+    with open(os.path.join(batch, "bad", "persona.pack.json"), "r") as f:
+        pack = json.load(f)
+    pack["components"]["layout"] = "nope.json"
+    with open(os.path.join(batch, "bad", "persona.pack.json"), "w") as f:
+        json.dump(pack, f)
+
+    results = installer.validate_many(batch, workers=2)
+    assert results["good"] == []
+    assert any("nope.json" in e for e in results["bad"])
+    assert installer.validate_many(batch, workers=1) == results
+
+def _zip_pack(zip_path, pack_id, version, folder=""):
+    src = os.path.join(ROOT, "orca", "personas", "installed", "persona.home@0.1")
+    with zipfile.ZipFile(zip_path, "w") as z:
+        for name in os.listdir(src):
+            if name == "persona.pack.json":
+                with open(os.path.join(src, name), "r") as f:
+                    pack = json.load(f)
+                pack["id"], pack["version"] = pack_id, version
+                z.writestr(folder + name, json.dumps(pack))
+            else:
+                z.write(os.path.join(src, name), folder + name)
+
+def test_import_zip_stages_and_renames(tmp_path):
+    installer = _installer(tmp_path)
+    zip_path = os.path.join(str(tmp_path), "pack.zip")
+    _zip_pack(zip_path, "persona.zip", "0.2", folder="pack/")
+
+    res = installer.import_zip(zip_path)
+    assert res["success"], res
+    assert os.path.isfile(os.path.join(installer.installed_dir, "persona.zip@0.2", "ui.layout.json"))
+    assert os.listdir(installer.stage_dir) == []
+    assert installer.import_zip(zip_path)["success"] is False # never overwrites
+    assert os.listdir(installer.stage_dir) == []
+
+def test_import_zip_rejects_traversal_and_limits(tmp_path, monkeypatch):
+    installer = _installer(tmp_path)
+    zip_path = os.path.join(str(tmp_path), "evil.zip")
+    with zipfile.ZipFile(zip_path, "w") as z:
+        z.writestr("../persona.pack.json", "{}")
+    assert "traversal" in installer.import_zip(zip_path)["errors"][0]
+
+    _zip_pack(zip_path, "persona.big", "0.1")
+    monkeypatch.setattr(persona_installer, "MAX_ZIP_ENTRIES", 2)
+    assert installer.import_zip(zip_path)["success"] is False
+    assert not os.path.exists(os.path.join(installer.installed_dir, "persona.big@0.1"))
+
+def test_versions_share_blobs(tmp_path, monkeypatch):
+    installer = _installer(tmp_path)
+    walks = []
+    real_gc_blobs = installer.gc_blobs
+    monkeypatch.setattr(installer, "gc_blobs", lambda: walks.append(1) or real_gc_blobs())
+    for version in ("0.2", "0.3"):
+        zip_path = os.path.join(str(tmp_path), f"pack-{version}.zip")
+        _zip_pack(zip_path, "persona.dedup", version)
+        assert installer.import_zip(zip_path)["success"]
+
+    a = os.stat(os.path.join(installer.installed_dir, "persona.dedup@0.2", "theme.json"))
+    b = os.stat(os.path.join(installer.installed_dir, "persona.dedup@0.3", "theme.json"))
+    assert a.st_ino == b.st_ino
+    assert a.st_mode & 0o222 == 0 # shared inode is read-only
+    assert walks == [] # successful installs never walk the blob store
+    # persona.pack.json differs by version; the three other files are shared
+    assert installer.storage_stats()["blobs"] == 5
+    assert installer.rollback("persona.dedup", "0.2")["active_version"] == "0.2"
@@ -0,0 +1,53 @@
+import sys
+import os
+import asyncio
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from orca_runtime.providers.base import Provider
+from orca_runtime.providers.health import HealthMonitor, CircuitBreaker, OPEN, HALF_OPEN, CLOSED
+from orca_runtime.providers.registry import ProviderRegistry
+
+class FlakyProvider(Provider):
+    def __init__(self):
+        super().__init__("flaky", "Flaky", ["llm"])
+        self.up = False
+
+    async def list_models(self):
+        return []
+
+    async def health(self):
+        return {"ok": self.up, "detail": "up" if self.up else "down", "latency_ms": 5.0 if self.up else 0}
+
+def test_breaker_opens_and_half_opens():
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=0.0)
+    breaker.record(False)
+    assert breaker.state == CLOSED
+    breaker.record(False)
+    assert breaker.state == OPEN
+    assert breaker.allow() # reset_timeout elapsed -> single trial
+    assert breaker.state == HALF_OPEN
+    breaker.record(True)
+    assert breaker.state == CLOSED
+
+def test_monitor_trips_and_recovers():
+    registry = ProviderRegistry()
+    registry.providers = {}
+    flaky = FlakyProvider()
+    registry.register(flaky)
+    monitor = HealthMonitor(registry, failure_threshold=2, reset_timeout=60.0)
+
+    async def run():
+        await monitor.probe_all()
+        await monitor.probe_all()
+        assert not monitor.allow("flaky")
+        flaky.up = True
+        await monitor.probe_all()
+        assert monitor.allow("flaky")
+        return await monitor.get("flaky")
+
+    latest = asyncio.run(run())
+    assert latest["ok"] is True
+    snap = monitor.snapshot()["flaky"]
+    assert snap["breaker"]["trips"] == 1
+    assert snap["latency_ms"]["avg"] == 5.0
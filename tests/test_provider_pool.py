@@ -0,0 +1,31 @@
+import sys
+import os
+import asyncio
+import httpx
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from orca_runtime.providers.pool import ClientPool, _MeteredTransport
+
+def test_pool_reuses_client_per_upstream():
+    pool = ClientPool({"ollama": {"max_connections": 3}})
+    assert pool.client("ollama") is pool.client("ollama")
+    assert pool.client("ollama") is not pool.client("orpheus")
+    assert pool.stats()["ollama"]["limits"]["max_connections"] == 3
+    asyncio.run(pool.aclose())
+    assert pool.stats()["ollama"]["open"] is False
+
+def test_metered_transport_counts_in_use_and_waits():
+    transport = _MeteredTransport(httpx.MockTransport(lambda req: httpx.Response(200, text="ok")), max_connections=1)
+
+    async def run():
+        async with httpx.AsyncClient(transport=transport) as client:
+            async with client.stream("GET", "http://upstream/a"):
+                assert transport.in_use == 1
+                r = await client.get("http://upstream/b")
+                assert r.text == "ok"
+            assert transport.in_use == 0
+
+    asyncio.run(run())
+    assert transport.requests == 2
+    assert transport.waits == 1
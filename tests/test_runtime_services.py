@@ -0,0 +1,32 @@
+import sys
+import os
+import subprocess
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT)
+
+pytest.importorskip("ifcopenshell")
+
+def test_import_builds_no_services(tmp_path):
+    # Spawned IFC/derive workers re-import main as __mp_main__; that must not build a Director,
+    # touch the workspace or start GPU/health machinery.
+    state = tmp_path / "runtime" / "director_state"
+    inbox = state / "inbox_incoming" / "upload.part"
+    inbox.parent.mkdir(parents=True)
+    inbox.write_bytes(b"in progress")
+    code = "import orca_runtime.main as m; print(sorted(m._services))"
+    out = subprocess.run([sys.executable, "-c", code], cwd=tmp_path, capture_output=True, text=True,
+                         env={**os.environ, "PYTHONPATH": ROOT}, timeout=60)
+    assert out.returncode == 0, out.stderr
+    assert out.stdout.strip().splitlines()[-1] == "[]"
+    assert inbox.read_bytes() == b"in progress"
+    assert not (state / "events.jsonl").exists()
+    assert not (tmp_path / "runtime" / "tts_cache").exists()
+
+def test_services_are_built_once():
+    from orca_runtime import main
+    first = main.get_health_monitor()
+    assert main.get_health_monitor() is first
+    assert main._services["health_monitor"] is first
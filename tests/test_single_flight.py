@@ -0,0 +1,64 @@
+import sys
+import os
+import asyncio
+
+import pytest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+pytest.importorskip("ifcopenshell")
+from orca_runtime.main import SingleFlight
+
+def test_concurrent_identical_calls_hit_upstream_once():
+    flights = SingleFlight()
+    calls = []
+
+    async def upstream():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return {"text": "hi"}
+
+    async def run():
+        key = SingleFlight.key("chat", "ollama", [{"role": "user", "content": "hi"}])
+        results = await asyncio.gather(*(flights.do(key, upstream) for _ in range(5)))
+        other = await flights.do(SingleFlight.key("chat", "ollama", "other"), upstream)
+        return results, other
+
+    results, other = asyncio.run(run())
+    assert all(r is results[0] for r in results)
+    assert other == {"text": "hi"}
+    assert len(calls) == 2
+    assert flights.stats() == {"calls": 6, "upstream": 2, "coalesced": 4, "in_flight": 0}
+
+def test_exception_reaches_every_waiter():
+    flights = SingleFlight()
+    calls = []
+
+    async def upstream():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        raise RuntimeError("upstream down")
+
+    async def run():
+        return await asyncio.gather(*(flights.do("k", upstream) for _ in range(3)), return_exceptions=True)
+
+    results = asyncio.run(run())
+    assert len(calls) == 1
+    assert all(isinstance(r, RuntimeError) and str(r) == "upstream down" for r in results)
+    assert flights.stats()["in_flight"] == 0
+
+def test_cancelled_caller_does_not_cancel_shared_call():
+    flights = SingleFlight()
+
+    async def upstream():
+        await asyncio.sleep(0.05)
+        return "ok"
+
+    async def run():
+        first = asyncio.ensure_future(flights.do("k", upstream))
+        second = asyncio.ensure_future(flights.do("k", upstream))
+        await asyncio.sleep(0.01)
+        first.cancel() # client went away
+        return await second
+
+    assert asyncio.run(run()) == "ok"
@@ -0,0 +1,28 @@
+import sys
+import os
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from orca_runtime.tts_cache import TTSCache, cache_key
+
+def test_cache_key_normalizes_whitespace():
+    assert cache_key("Hello  there\n", "tara", None, None) == cache_key("Hello there", "tara", None, None)
+    assert cache_key("Hello there", "tara", None, None) != cache_key("Hello there", "leo", None, None)
+    assert cache_key("Hello there", "tara", None, 1.0) != cache_key("Hello there", "tara", None, 1.2)
+
+def test_lru_eviction_and_reload(tmp_path):
+    cache = TTSCache(str(tmp_path), max_bytes=250, hot_max_bytes=100)
+    cache.put("a" * 64, b"x" * 100)
+    cache.put("b" * 64, b"y" * 100)
+    assert cache.get("a" * 64) == b"x" * 100 # "a" is now most recent
+    cache.put("c" * 64, b"z" * 100)
+
+    assert cache.get("b" * 64) is None
+    stats = cache.stats()
+    assert stats["evictions"] == 1
+    assert stats["bytes_disk"] == 200
+    assert stats["bytes_hot"] <= 100
+
+    reloaded = TTSCache(str(tmp_path), max_bytes=250)
+    assert reloaded.get("c" * 64) == b"z" * 100
+    assert reloaded.stats()["hits_disk"] == 1
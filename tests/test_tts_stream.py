@@ -0,0 +1,116 @@
+import sys
+import os
+import struct
+import asyncio
+
+import httpx
+import pytest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+pytest.importorskip("ifcopenshell")
+from fastapi.testclient import TestClient
+from orca_runtime import main
+from orca_runtime.tts_cache import TTSCache
+
+def _wav(samples: bytes) -> bytes:
+    fmt = struct.pack("<IHHIIHH", 16, 1, 1, 24000, 48000, 2, 16)
+    info = b"LIST" + struct.pack("<I", 5) + b"INFOx" + b"\x00" # odd-sized chunk plus pad byte
+    body = b"WAVE" + b"fmt " + fmt + info + b"data" + struct.pack("<I", len(samples)) + samples
+    return b"RIFF" + struct.pack("<I", len(body)) + body
+
+def _sizes(wav: bytes, offset: int):
+    return struct.unpack("<I", wav[4:8])[0], struct.unpack("<I", wav[offset - 4:offset])[0]
+
+def test_data_offset_walks_chunks_and_waits_for_split_header():
+    samples = b"\x01\x02" * 8
+    full = _wav(samples)
+    offset = main._wav_data_offset(full)
+    assert offset == len(full) - len(samples)
+    # A header split across upstream chunks needs more bytes, whatever the cut point
+    assert all(main._wav_data_offset(full[:cut]) is None for cut in range(offset))
+    # Headerless PCM starts at byte 0
+    assert main._wav_data_offset(b"\x01" * 20) == 0
+
+def test_streaming_head_marks_sizes_unknown():
+    full = _wav(b"\x01\x02" * 8)
+    offset = main._wav_data_offset(full)
+    head = main._streaming_wav_head(full, offset)
+    assert _sizes(head, offset) == (0xFFFFFFFF, 0xFFFFFFFF)
+    assert head[offset:] == full[offset:]
+
+    pcm = main._streaming_wav_head(b"\x01\x02" * 4, 0)
+    assert main._wav_data_offset(pcm) == 44
+    assert _sizes(pcm, 44) == (0xFFFFFFFF, 0xFFFFFFFF)
+    assert pcm[44:] == b"\x01\x02" * 4
+
+def test_finalize_restores_riff_and_data_sizes():
+    full = _wav(b"\x01\x02" * 8)
+    offset = main._wav_data_offset(full)
+    streamed = main._streaming_wav_head(full, offset) + b"\x03\x04" * 10
+    final = main._finalize_wav(streamed)
+    assert len(final) == len(streamed)
+    assert _sizes(final, offset) == (len(final) - 8, len(final) - offset)
+    # Headerless data is passed through untouched
+    assert main._finalize_wav(b"\x01" * 20) == b"\x01" * 20
+
+@pytest.fixture
+def orpheus(monkeypatch, tmp_path):
+    """Routes Orpheus through a mock transport and isolates the TTS cache and GPU slots."""
+    replies = {}
+    client = httpx.AsyncClient(transport=httpx.MockTransport(lambda request: httpx.Response(200, content=replies["body"])))
+    monkeypatch.setattr(main.pools, "client", lambda name: client)
+    monkeypatch.setattr(main.runtime_config, "tts_mode", "offline")
+    monkeypatch.setitem(main._services, "tts_cache", TTSCache(str(tmp_path / "tts_cache")))
+    gpu = main.GPUOrchestrator()
+    async def prepare(model_type, model_name):
+        return {}
+    monkeypatch.setattr(gpu, "prepare_for_model", prepare)
+    monkeypatch.setitem(main._services, "gpu_mgr", gpu)
+    return replies, gpu
+
+def test_stream_with_empty_audio_returns_502(orpheus):
+    replies, gpu = orpheus
+    replies["body"] = _wav(b"")
+    r = TestClient(main.app).post("/runtime/tts", json={"text": "hello", "voice": "tara", "stream": True})
+    assert r.status_code == 502
+    assert gpu.scheduler.running_total == 0
+
+def test_unread_stream_releases_gpu_slot(orpheus):
+    replies, gpu = orpheus
+    stalled = []
+
+    async def upstream():
+        # Orpheus sends the first audio and then keeps generating
+        yield _wav(b"\x01\x02" * 100)
+        stalled.append(True)
+        await asyncio.Event().wait()
+
+    async def run():
+        replies["body"] = upstream()
+        response = await main._open_tts_stream("hello", "tara", None, None)
+        await asyncio.sleep(0.01)
+        held = gpu.scheduler.running_total
+        # Client went away before the body was iterated; Starlette still runs the background task
+        await response.background()
+        return held, gpu.scheduler.running_total
+
+    assert asyncio.run(run()) == (1, 0)
+    assert stalled
+
+def test_slow_reader_does_not_hold_gpu_slot(orpheus):
+    replies, gpu = orpheus
+    replies["body"] = _wav(b"\x01\x02" * 100)
+
+    async def run():
+        audio = main.stream_orpheus_tts("hello", "tara")
+        first = await audio.__anext__()
+        await asyncio.sleep(0.01)
+        # Upstream finished: the slot is free although the reader has not consumed the rest
+        released = gpu.scheduler.running_total == 0
+        rest = [chunk async for chunk in audio]
+        return released, first + b"".join(rest)
+
+    released, body = asyncio.run(run())
+    assert released
+    assert body.endswith(b"\x01\x02" * 100)
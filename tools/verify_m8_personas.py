@@ -48,6 +48,7 @@ def run_test():
     grants_path = os.path.join(workspace_root, "orca", "licenses", "grants.json")
     with open(grants_path, "w") as f:
         json.dump({"grants": ["sku.orca.pro.01"]}, f)
+    runtime.cache.invalidate("grants") # written behind the runtime's back, not via add_grant
     
     work_persona_unlocked = runtime.switch_persona("persona.work@0.1", ent_caps)
     print(f"Work Persona (Unlocked): {work_persona_unlocked['name']} - Status: {work_persona_unlocked['status']}")